@@ -0,0 +1,86 @@
+"""Report writer benchmark: workbook size and write time on a synthetic universe.
+
+Usage:
+  python benchmarks/bench_report_writer.py [N_TICKERS=500] [--write-only] [--repeat 3]
+
+Metrics and reversal packs are generated with a fixed seed, scored against the
+bundled checklist, and written with `create_report_workbook`. Scoring happens
+before the clock starts, so the numbers cover rendering + save only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from checklist_loader import load_thresholds_from_excel  # noqa: E402
+from report_writer import create_report_workbook  # noqa: E402
+from scorecard import build_scorecards  # noqa: E402
+
+BUCKETS = ["Default (All)", "Software/Tech", "Industrials", "REITs", "Energy/Materials"]
+FUND_CHECKS = ["Margins", "Cashflow", "Balance Sheet", "ROIC", "Valuation"]
+TECH_CHECKS = ["Trend (200d)", "Momentum (RSI)", "Drawdown", "Structure", "Rel Strength"]
+
+
+def synthetic_universe(n: int, seed: int = 1):
+    rnd = random.Random(seed)
+    metrics, reversal = {}, {}
+    for i in range(n):
+        t = f"T{i:04d}"
+        metrics[t] = {
+            "Price": rnd.uniform(5, 500), "Market Cap": rnd.uniform(1e9, 5e11), "Sector Bucket": rnd.choice(BUCKETS),
+            "Sector Relative Return (1Y)": rnd.uniform(-20, 20),
+            "P/E (TTM, positive EPS)": rnd.uniform(5, 40), "EV/EBIT": rnd.uniform(3, 30),
+            "FCF Yield (TTM FCF / Market Cap)": rnd.uniform(-2, 12),
+            "Gross Margin %": rnd.uniform(10, 80), "Operating Margin %": rnd.uniform(-5, 40),
+            "ROIC % (standardized)": rnd.choice([None, rnd.uniform(0, 30)]),
+            "Net Debt / EBITDA": rnd.uniform(-1, 5), "Interest Coverage (EBIT / Interest)": rnd.uniform(1, 30),
+            "Revenue per Share CAGR (5Y)": rnd.uniform(-5, 25), "FCF per Share CAGR (5Y)": rnd.uniform(-5, 25),
+            "Max Drawdown (3–5Y)": rnd.uniform(-70, -5),
+        }
+        fs, ts = rnd.uniform(0, 100), rnd.uniform(0, 100)
+        reversal[t] = {
+            "fund_score_pct": fs, "tech_score_pct": ts, "total_score_pct": 0.6 * fs + 0.4 * ts,
+            "fund_symbols": {k: "🟢" for k in FUND_CHECKS}, "tech_symbols": {k: "🟡" for k in TECH_CHECKS},
+            "fund_details": {k: (rnd.randint(0, 2), "synthetic") for k in FUND_CHECKS},
+            "tech_details": {k: (rnd.randint(0, 2), "synthetic") for k in TECH_CHECKS},
+        }
+    return metrics, reversal
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("n", nargs="?", type=int, default=500)
+    ap.add_argument("--write-only", action="store_true")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    thresholds = load_thresholds_from_excel(
+        os.path.join(ROOT, "Checklist", "Fundamental_Checklist_v3_value_matrix_fixed.xlsx"))
+    metrics, reversal = synthetic_universe(args.n)
+    tickers = list(metrics)
+    cards = build_scorecards(tickers, metrics, reversal, thresholds, 60.0)
+
+    times = []
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "bench.xlsx")
+        for _ in range(max(1, args.repeat)):
+            t0 = time.perf_counter()
+            create_report_workbook(tickers, thresholds, metrics, reversal, path, 60.0, scorecards=cards,
+                                   write_only=args.write_only, shard_by=0)
+            times.append(time.perf_counter() - t0)
+        size = os.path.getsize(path)
+    mode = "write-only" if args.write_only else "regular"
+    print(f"{args.n} tickers ({mode}): best {min(times):.2f}s, median {sorted(times)[len(times) // 2]:.2f}s, "
+          f"size {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -73,6 +73,10 @@ class DiskCache:
         except Exception:
             return False
 
+    def is_fresh(self, key: str, ext: str = ".pkl") -> bool:
+        """True when `key` is cached and within TTL (a stat, nothing is read)."""
+        return self.enabled and self._fresh(self._path(key, ext))
+
     def get_json(self, key: str) -> Optional[Any]:
         if not self.enabled:
             return None
@@ -125,6 +129,10 @@ _YF_HTTP_CONCURRENCY = _safe_int(os.environ.get("YF_HTTP_CONCURRENCY", "6"), def
 _YF_SEM = threading.BoundedSemaphore(max(1, _YF_HTTP_CONCURRENCY))
 
 
+def yf_http_concurrency() -> int:
+    return max(1, _YF_HTTP_CONCURRENCY)
+
+
 def yf_call(fn: Callable[[], Any]) -> Any:
     """Run a Yahoo/yfinance network call under a concurrency semaphore."""
     with _YF_SEM:
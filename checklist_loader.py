@@ -1,8 +1,12 @@
+import hashlib
 import os
 import re
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 from openpyxl import load_workbook
 
+from cache_utils import DiskCache
+
 _NUM = r"[+-]?\d*\.?\d+"  # signed float
 
 def _norm_metric(s: str) -> str:
@@ -38,77 +42,130 @@ def _token_set(s: str) -> set:
     s = re.sub(r"\s+", " ", s).strip()
     return set([t for t in s.split(" ") if t])
 
-def _metric_matches(adj_metric: str, threshold_metric: str) -> bool:
-    """Match a Sector Adjustments row metric to a category-sheet metric name.
-
-    Rules are intentionally conservative to prevent collisions like:
-      "Market Cap" accidentally matching "SBC % of Market Cap (TTM)".
-    """
-    a_raw = adj_metric or ""
-    t_raw = threshold_metric or ""
-
-    a = _norm_metric(a_raw)
-    t = _norm_metric(t_raw)
-    if not a or not t:
+# Names that may match by prefix/containment (rule 4 of _keys_match).
+_SAFE_PREFIXES = (
+    "fcf yield",
+    "ev/fcf",
+    "margin trend",
+    "roic",
+    "share count cagr",
+    "net buyback yield",
+    "shareholder yield",
+    "short interest",
+    "days to cover",
+    "avg daily",
+    "max drawdown",
+    "realized volatility",
+    "worst weekly return",
+    "p/e",
+    "p/s",
+    "ev/ebit",
+    "ev/ebitda",
+)
+
+
+@dataclass(frozen=True)
+class _MetricKey:
+    """Normalized forms of one metric name, computed once (all the regex work of matching)."""
+    norm: str                      # lower-cased, whitespace-collapsed
+    stripped: str                  # same without parenthetical fragments
+    guards: Tuple[bool, bool, bool]  # mentions SBC / % / market cap
+    safe: bool                     # stripped form starts with a safe prefix
+    tokens: frozenset
+
+
+def _metric_key(name: str) -> _MetricKey:
+    stripped = _norm_metric(_strip_parens(name or ""))
+    return _MetricKey(norm=_norm_metric(name or ""), stripped=stripped,
+                      guards=("sbc" in stripped, "%" in stripped, "market cap" in stripped),
+                      safe=any(stripped.startswith(sp) for sp in _SAFE_PREFIXES),
+                      tokens=frozenset(_token_set(name or "")))
+
+
+def _keys_match(a: _MetricKey, t: _MetricKey) -> bool:
+    if not a.norm or not t.norm:
         return False
 
     # 1) Exact match
-    if a == t:
+    if a.norm == t.norm:
         return True
 
     # 2) Exact after stripping parentheses on either side
-    a2 = _norm_metric(_strip_parens(a_raw))
-    t2 = _norm_metric(_strip_parens(t_raw))
-    if a2 and a2 == t2:
+    if a.stripped and a.stripped == t.stripped:
         return True
 
-    # 3) Strong safeguards for common collisions
-    # If one mentions SBC and the other doesn't -> no match
-    if ("sbc" in a2) != ("sbc" in t2):
-        return False
-    # If one has a percent sign and the other doesn't -> no match
-    if ("%" in a2) != ("%" in t2):
-        return False
-    # If one has 'market cap' but not the other -> no match
-    if ("market cap" in a2) != ("market cap" in t2):
+    # 3) Strong safeguards for common collisions: both or neither mention SBC, a percent sign, market cap
+    if a.guards != t.guards:
         return False
 
     # 4) Allow safe prefix / containment only for a small whitelist
-    safe_prefixes = (
-        "fcf yield",
-        "ev/fcf",
-        "margin trend",
-        "roic",
-        "share count cagr",
-        "net buyback yield",
-        "shareholder yield",
-        "short interest",
-        "days to cover",
-        "avg daily",
-        "max drawdown",
-        "realized volatility",
-        "worst weekly return",
-        "p/e",
-        "p/s",
-        "ev/ebit",
-        "ev/ebitda",
-    )
-    if any(a2.startswith(sp) for sp in safe_prefixes) or any(t2.startswith(sp) for sp in safe_prefixes):
-        if a2 and (a2 in t2 or t2 in a2):
+    if a.safe or t.safe:
+        if a.stripped and (a.stripped in t.stripped or t.stripped in a.stripped):
             return True
 
     # 5) Token overlap similarity (conservative)
-    ta = _token_set(a_raw)
-    tt = _token_set(t_raw)
-    if not ta or not tt:
+    if not a.tokens or not t.tokens:
         return False
-
-    overlap = len(ta & tt) / max(len(ta), len(tt))
+    overlap = len(a.tokens & t.tokens) / max(len(a.tokens), len(t.tokens))
     # require very high overlap and similar length
-    if overlap >= 0.85 and abs(len(a2) - len(t2)) <= 12:
-        return True
+    return overlap >= 0.85 and abs(len(a.stripped) - len(t.stripped)) <= 12
 
-    return False
+
+def _metric_matches(adj_metric: str, threshold_metric: str) -> bool:
+    """Match a Sector Adjustments row metric to a category-sheet metric name.
+
+    Rules are intentionally conservative to prevent collisions like:
+      "Market Cap" accidentally matching "SBC % of Market Cap (TTM)".
+    """
+    return _keys_match(_metric_key(adj_metric), _metric_key(threshold_metric))
+
+
+class MetricIndex:
+    """Category-sheet metrics indexed for _keys_match lookups.
+
+    Each candidate rule only looks where it can hit: exact / stripped-exact dictionaries, the
+    safe-prefix bucket of the same guard group (rule 4) and a token inverted index (rule 5, which
+    needs a shared token). `matches()` returns exactly what testing every metric would.
+    """
+
+    def __init__(self, metrics: List[Tuple[str, str]]):
+        self._items: List[Tuple[str, str]] = []
+        self._keys: List[_MetricKey] = []
+        self._by_norm: Dict[str, List[int]] = {}
+        self._by_stripped: Dict[str, List[int]] = {}
+        self._by_guards: Dict[Tuple[bool, bool, bool], List[int]] = {}
+        self._safe_by_guards: Dict[Tuple[bool, bool, bool], List[int]] = {}
+        self._by_token: Dict[str, List[int]] = {}
+        for item in metrics:
+            key = _metric_key(item[1])
+            if not key.norm:
+                continue
+            i = len(self._items)
+            self._items.append(item)
+            self._keys.append(key)
+            self._by_norm.setdefault(key.norm, []).append(i)
+            self._by_stripped.setdefault(key.stripped, []).append(i)
+            self._by_guards.setdefault(key.guards, []).append(i)
+            if key.safe:
+                self._safe_by_guards.setdefault(key.guards, []).append(i)
+            for tok in key.tokens:
+                self._by_token.setdefault(tok, []).append(i)
+
+    def matches(self, metric: str) -> List[Tuple[str, str]]:
+        """(category, metric) pairs that `metric` matches, in index order."""
+        a = _metric_key(metric)
+        if not a.norm:
+            return []
+        hits = set(self._by_norm.get(a.norm, ()))
+        if a.stripped:
+            hits.update(self._by_stripped.get(a.stripped, ()))
+            pool = self._by_guards.get(a.guards, ()) if a.safe else self._safe_by_guards.get(a.guards, ())
+            hits.update(i for i in pool
+                        if a.stripped in self._keys[i].stripped or self._keys[i].stripped in a.stripped)
+        if a.tokens:
+            cands = {i for tok in a.tokens for i in self._by_token.get(tok, ())}
+            hits.update(i for i in cands if i not in hits and _keys_match(a, self._keys[i]))
+        return [self._items[i] for i in sorted(hits)]
 
 
 def parse_range_cell(s: Any) -> Optional[Tuple[Optional[float], Optional[float]]]:
@@ -180,10 +237,99 @@ def parse_range_cell(s: Any) -> Optional[Tuple[Optional[float], Optional[float]]
     return None
 
 
+@dataclass(frozen=True)
+class Interval:
+    """One parsed threshold band.
+
+    Mirrors the semantics of the original text rules:
+      (None, hi) -> value < hi
+      (lo, None) -> value > lo
+      (lo, hi)   -> lo <= value <= hi
+    """
+    lo: Optional[float]
+    hi: Optional[float]
+
+    def contains(self, value: float) -> bool:
+        lo, hi = self.lo, self.hi
+        if lo is None and hi is not None:
+            return value < hi
+        if lo is not None and hi is None:
+            return value > lo
+        if lo is not None and hi is not None:
+            return lo <= value <= hi
+        return False
+
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """Compiled GREEN/YELLOW/RED intervals for one (category, metric, sector bucket)."""
+    green: Optional[Interval]
+    yellow: Optional[Interval]
+    red: Optional[Interval]
+
+
+def _compile_interval(txt: Any) -> Optional[Interval]:
+    if txt is None:
+        return None
+    rng = parse_range_cell(str(txt))
+    if rng is None:
+        return None
+    return Interval(rng[0], rng[1])
+
+
+def compile_threshold_set(th: Dict[str, Any]) -> ThresholdRule:
+    """Parse the green/yellow/red text of a threshold set into a ThresholdRule."""
+    return ThresholdRule(
+        green=_compile_interval(th.get("green_txt")),
+        yellow=_compile_interval(th.get("yellow_txt")),
+        red=_compile_interval(th.get("red_txt")),
+    )
+
+
+def compile_thresholds(thresholds: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    """Attach a compiled "rule" to every threshold set (in place)."""
+    for by_metric in thresholds.values():
+        for by_sector in by_metric.values():
+            for th in by_sector.values():
+                th["rule"] = compile_threshold_set(th)
+
+
+# Bump when parsing/compiling changes so cached checklists are rebuilt.
+_CACHE_VERSION = 1
+
+
+def _checklist_cache() -> DiskCache:
+    enabled = (os.environ.get("CHECKLIST_CACHE", "1") or "1").strip().lower() not in ("0", "false", "no")
+    # Entries are keyed by file content, so they never go stale; the TTL only bounds disk clutter.
+    return DiskCache("checklist", ttl_hours=24.0 * 365, enabled=enabled)
+
+
+def checklist_digest(path: str) -> str:
+    """SHA-256 of the checklist workbook bytes (the compiled-thresholds cache key)."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
 def load_thresholds_from_excel(path: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Parsed + compiled thresholds of a checklist workbook.
+
+    The result is cached on disk (.cache/checklist) under the workbook's SHA-256, so unchanged
+    checklists load without openpyxl and any edit to the xlsx triggers a rebuild.
+    Set CHECKLIST_CACHE=0 to always parse.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"Checklist file not found: {path}")
 
+    key = f"thresholds:v{_CACHE_VERSION}:{checklist_digest(path)}"
+    cache = _checklist_cache()
+    thresholds = cache.get_pickle(key)
+    if thresholds is None:
+        thresholds = _parse_thresholds_workbook(path)
+        cache.set_pickle(key, thresholds)
+    return thresholds
+
+
+def _parse_thresholds_workbook(path: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
     wb = load_workbook(path, data_only=True)
 
     categories = ["Valuation", "Profitability", "Balance Sheet", "Growth", "Risk"]
@@ -234,6 +380,8 @@ def load_thresholds_from_excel(path: str) -> Dict[str, Dict[str, Dict[str, Any]]
         ]
 
         notes_col = col_map.get("Notes (why/when)", ws.max_column)
+        # Matching depends only on the metric names, so resolve each adjustment row once.
+        index = MetricIndex([(cat, tm) for cat in thresholds for tm in thresholds[cat]])
 
         for r in range(2, ws.max_row + 1):
             metric = ws.cell(r, col_map.get("Metric", 1)).value
@@ -242,6 +390,7 @@ def load_thresholds_from_excel(path: str) -> Dict[str, Dict[str, Dict[str, Any]]
             metric = metric.strip()
             if _is_heading_row(metric):
                 continue
+            targets = index.matches(metric)
 
             for sec in sector_cols:
                 if sec not in col_map:
@@ -257,17 +406,17 @@ def load_thresholds_from_excel(path: str) -> Dict[str, Dict[str, Dict[str, Any]]
                 green_txt, yellow_txt, red_txt = parts[0], parts[1], parts[2]
                 sec_notes = ws.cell(r, notes_col).value
 
-                for cat in thresholds:
-                    for tm in list(thresholds[cat].keys()):
-                        if _metric_matches(metric, tm):
-                            thresholds[cat][tm][sec] = {
-                                "green_txt": green_txt,
-                                "yellow_txt": yellow_txt,
-                                "red_txt": red_txt,
-                                "marking": thresholds[cat][tm]["Default (All)"].get("marking"),
-                                "notes": sec_notes,
-                            }
-
+                for cat, tm in targets:
+                    thresholds[cat][tm][sec] = {
+                        "green_txt": green_txt,
+                        "yellow_txt": yellow_txt,
+                        "red_txt": red_txt,
+                        "marking": thresholds[cat][tm]["Default (All)"].get("marking"),
+                        "notes": sec_notes,
+                    }
+
+    # Parse the threshold text once here instead of on every rating call.
+    compile_thresholds(thresholds)
     return thresholds
 
 
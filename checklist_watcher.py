@@ -0,0 +1,181 @@
+"""Checklist hot reload for long-running processes.
+
+ChecklistWatcher polls the checklist workbook on a daemon thread. A change of
+mtime/size is confirmed by content hash (so a bare save or touch is ignored),
+the thresholds are recompiled on the watcher thread and swapped in with a
+single reference assignment: readers of `watcher.thresholds` always get either
+the previous or the new compiled set, never a half-built one. A workbook that
+fails to load (e.g. caught mid-save by Excel) keeps the previous thresholds
+and is retried on the next poll.
+
+LiveScores holds the scalar metrics / reversal packs of already-computed
+tickers and rebuilds their ScoreCards against a new threshold set in memory,
+so a checklist edit is applied without refetching. Metrics that only the new
+checklist references stay unrated until the next fetch.
+
+Env vars (optional):
+  CHECKLIST_POLL_SECONDS=2     # how often the watcher checks the checklist file
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from cache_utils import _safe_float
+from checklist_loader import checklist_digest, load_thresholds_from_excel
+from scorecard import ScoreCard, build_scorecards
+
+Thresholds = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def poll_seconds_setting() -> float:
+    return max(0.1, _safe_float(os.environ.get("CHECKLIST_POLL_SECONDS", "2"), default=2.0))
+
+
+def _stat(path: str) -> Optional[Tuple[float, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime, st.st_size
+
+
+class ChecklistWatcher:
+    """Keeps `thresholds` in sync with the checklist file; listeners run on the watcher thread after a swap."""
+
+    def __init__(self, path: str, thresholds: Optional[Thresholds] = None, poll_seconds: Optional[float] = None):
+        self.path = path
+        self.poll_seconds = poll_seconds if poll_seconds is not None else poll_seconds_setting()
+        self._stat = _stat(path)
+        self._digest = checklist_digest(path)
+        self._thresholds = thresholds if thresholds is not None else load_thresholds_from_excel(path)
+        self.version = 1
+        self._listeners: List[Callable[[Thresholds], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def thresholds(self) -> Thresholds:
+        return self._thresholds
+
+    def subscribe(self, fn: Callable[[Thresholds], None]) -> None:
+        self._listeners.append(fn)
+
+    def start(self) -> "ChecklistWatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="checklist-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def check(self) -> bool:
+        """Reload now if the file content changed; True when new thresholds were swapped in."""
+        st = _stat(self.path)
+        if st is None or st == self._stat:
+            return False
+        try:
+            digest = checklist_digest(self.path)
+            if digest == self._digest:
+                self._stat = st
+                return False
+            thresholds = load_thresholds_from_excel(self.path)
+        except Exception:
+            print(f"Checklist reload failed, keeping previous thresholds:\n{traceback.format_exc()}")
+            return False
+        if _stat(self.path) != st:
+            return False  # still being written; pick it up on the next poll
+        self._stat, self._digest = st, digest
+        self._thresholds = thresholds
+        self.version += 1
+        print(f"Checklist reloaded (v{self.version}): {os.path.basename(self.path)}")
+        for fn in list(self._listeners):
+            try:
+                fn(thresholds)
+            except Exception:
+                traceback.print_exc()
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
+
+
+class LiveScores:
+    """In-memory results of computed tickers, rescored whenever the thresholds change."""
+
+    def __init__(self, thresholds: Thresholds, target_threshold: float, eligibility_mode: Optional[str] = None):
+        self.target_threshold = target_threshold
+        self.eligibility_mode = eligibility_mode
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._reversal: Dict[str, Dict[str, Any]] = {}
+        self._thresholds = thresholds
+        self._scorecards: Dict[str, ScoreCard] = {}
+
+    @property
+    def thresholds(self) -> Thresholds:
+        return self._thresholds
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return self._metrics
+
+    @property
+    def reversal(self) -> Dict[str, Dict[str, Any]]:
+        return self._reversal
+
+    @property
+    def scorecards(self) -> Dict[str, ScoreCard]:
+        """Snapshot of the current cards; replaced wholesale by rescore()."""
+        return self._scorecards
+
+    def add(self, ticker: str, metrics: Dict[str, Any], reversal: Optional[Dict[str, Any]],
+            card: Optional[ScoreCard] = None, thresholds: Optional[Thresholds] = None) -> ScoreCard:
+        """Store one ticker's results; `card` is kept only if it was scored with the current thresholds."""
+        with self._lock:
+            self._metrics[ticker], self._reversal[ticker] = metrics, reversal or {}
+            if card is None or (thresholds is not None and thresholds is not self._thresholds):
+                card = self._score([ticker], self._thresholds)[ticker]
+            self._scorecards = {**self._scorecards, ticker: card}
+            return card
+
+    def load(self, metrics_by_ticker: Dict[str, Dict[str, Any]],
+             reversal_by_ticker: Dict[str, Dict[str, Any]]) -> Dict[str, ScoreCard]:
+        """Bulk-add stored results (e.g. a persisted run) and score them."""
+        with self._lock:
+            self._metrics.update(metrics_by_ticker)
+            self._reversal.update({t: reversal_by_ticker.get(t) or {} for t in metrics_by_ticker})
+            self._scorecards = {**self._scorecards, **self._score(list(metrics_by_ticker), self._thresholds)}
+            return self._scorecards
+
+    def rescore(self, thresholds: Thresholds) -> Dict[str, ScoreCard]:
+        """Rebuild every card against `thresholds` and swap thresholds + cards in together."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        cards = self._score(list(metrics), thresholds, metrics)
+        with self._lock:
+            # Tickers added or replaced while the bulk rescore ran are scored again under the lock.
+            late = [t for t in self._metrics if self._metrics[t] is not metrics.get(t)]
+            if late:
+                cards.update(self._score(late, thresholds))
+            self._thresholds, self._scorecards = thresholds, cards
+            return cards
+
+    def _score(self, tickers: Sequence[str], thresholds: Thresholds,
+               metrics: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, ScoreCard]:
+        return build_scorecards(tickers, metrics if metrics is not None else self._metrics, self._reversal,
+                                thresholds, self.target_threshold, self.eligibility_mode)
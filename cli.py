@@ -0,0 +1,188 @@
+"""Headless command line for scheduled / server runs (no tkinter).
+
+  python cli.py AAPL MSFT "berkshire hathaway" --mode Moderate --watch
+  python cli.py --universe SP500 --universe nasdaq100 --no-fmp --workers 8 --compute-processes 4
+  python cli.py --file tickers.txt --out-dir /data/reports
+  python cli.py --rescore --mode Loose [--store PATH] [--follow]
+  python cli.py --resume [JOURNAL]      # finish an interrupted run
+  python cli.py --universe NYSE --shard 2/8 --shard-dir /mnt/runs/x   # one shard of a distributed run
+  python cli.py --merge /mnt/runs/x [--wait 3600]                     # merge the shards into one report
+  python cli.py --universe NYSE --shards 8 --shard-dir /tmp/x         # all shards as local processes
+
+Only argparse is imported up front; the screening stack (pandas, yfinance,
+openpyxl) loads after the arguments are parsed, and tkinter never does. The
+report path is printed on the last line of stdout. Exit status: 0 report
+written, 1 no candidates, 2 usage error / no tickers resolved.
+"""
+
+import argparse
+import os
+import sys
+
+RULE_MODES = ("Strict", "Moderate", "Loose")
+UNIVERSES = ("SP500", "nasdaq100", "NYSE", "LSE")  # files under "Ticker universe/"
+
+
+def _parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="cli.py", description="Run the stock screen without the desktop UI.")
+    ap.add_argument("tickers", nargs="*", help="ticker symbols or company names")
+    ap.add_argument("-u", "--universe", action="append", default=[], choices=UNIVERSES,
+                    help="add a bundled ticker universe (repeatable)")
+    ap.add_argument("-f", "--file", help="file with tickers/names separated by commas, spaces or newlines")
+    ap.add_argument("-m", "--mode", type=str.capitalize, choices=RULE_MODES,
+                    help="recommendation rule set (default: Strict; with --merge: the shards' mode)")
+    fmp = ap.add_mutually_exclusive_group()
+    fmp.add_argument("--fmp", dest="use_fmp", action="store_true", default=None,
+                     help="use the FMP fallback (default: on when FMP_API_KEY is set)")
+    fmp.add_argument("--no-fmp", dest="use_fmp", action="store_false")
+    ap.add_argument("-w", "--watch", action="store_true", help="include WATCH candidates")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="fetch threads (default: FETCH_WORKERS, else sized from cache warmth and cores)")
+    ap.add_argument("--pipeline", action="store_true", help="stream resolve/fetch/compute/report stages (PIPELINE=1)")
+    ap.add_argument("--compute-processes", type=int, default=None,
+                    help="compute/scoring worker processes (default: COMPUTE_PROCESSES or 0)")
+    ap.add_argument("-o", "--out-dir", help="report directory (default: ./reports)")
+    ap.add_argument("-q", "--quiet", action="store_true", help="no progress lines")
+    ap.add_argument("--rescore", action="store_true", help="rescore the last stored run instead of fetching")
+    ap.add_argument("--store", help="stored run to rescore (default: latest)")
+    ap.add_argument("--follow", action="store_true", help="with --rescore: rewrite the report on checklist edits")
+    ap.add_argument("--resume", nargs="?", const="", metavar="JOURNAL",
+                    help="finish an interrupted run (default: latest journal); its tickers and options are reused")
+    shard = ap.add_argument_group("sharded runs (see run_shards.py)")
+    shard.add_argument("--shard", metavar="I/N", help="screen only shard I of N (0-based) into --shard-dir")
+    shard.add_argument("--shards", type=int, metavar="N", help="run all N shards as local processes, then merge")
+    shard.add_argument("--shard-dir", metavar="DIR", help="shared directory for the shards' partial results")
+    shard.add_argument("--merge", metavar="DIR", help="merge the partial results in DIR into one report")
+    shard.add_argument("--wait", type=float, default=0.0, metavar="SECONDS",
+                       help="with --merge: wait this long for unfinished shards")
+    shard.add_argument("--allow-partial", action="store_true", help="with --merge: report on the shards present")
+    return ap
+
+
+def _worker_args(args) -> list:
+    """The inputs/options of this invocation, for the per-shard worker processes."""
+    out = list(args.tickers)
+    for u in args.universe:
+        out += ["--universe", u]
+    if args.file:
+        out += ["--file", args.file]
+    out += ["--mode", args.mode or "Strict"]
+    if args.workers is not None:
+        out += ["--workers", str(args.workers)]
+    if args.use_fmp is not None:
+        out.append("--fmp" if args.use_fmp else "--no-fmp")
+    if args.watch:
+        out.append("--watch")
+    if args.pipeline:
+        out.append("--pipeline")
+    if args.compute_processes is not None:
+        out += ["--compute-processes", str(args.compute_processes)]
+    if args.quiet:
+        out.append("--quiet")
+    return out
+
+
+def main(argv=None) -> int:
+    ap = _parser()
+    args = ap.parse_args(argv)
+    if args.follow and not args.rescore:
+        ap.error("--follow requires --rescore")
+    if args.rescore and (args.tickers or args.universe or args.file):
+        ap.error("--rescore rescores the stored run; pick it with --store and the rule mode with --mode")
+    if args.resume is not None and (args.tickers or args.universe or args.file or args.rescore):
+        ap.error("--resume takes the tickers and options of the interrupted run")
+    if args.workers is not None and args.workers < 1:
+        ap.error("--workers must be >= 1")
+    if (args.shard or args.shards) and not args.shard_dir:
+        ap.error("--shard/--shards need --shard-dir")
+    if args.shards is not None and (args.shards < 1 or args.shard):
+        ap.error("--shards takes N >= 1 and excludes --shard")
+    if (args.shard or args.shards or args.merge) and (args.rescore or args.resume is not None):
+        ap.error("sharded runs cannot be combined with --rescore/--resume")
+    if args.shard:
+        try:
+            shard = tuple(int(x) for x in args.shard.split("/"))
+            if len(shard) != 2 or not 0 <= shard[0] < shard[1]:
+                raise ValueError
+        except ValueError:
+            ap.error("--shard takes I/N with 0 <= I < N")
+
+    try:
+        from env_loader import load_env
+
+        load_env()
+    except Exception:
+        pass
+    if args.pipeline:
+        os.environ["PIPELINE"] = "1"
+    import screener
+
+    if args.merge:
+        import run_shards
+
+        out_file = run_shards.merge_shards(args.merge, rule_mode=args.mode, include_watch=args.watch or None,
+                                           wait_seconds=args.wait, allow_partial=args.allow_partial,
+                                           out_dir=args.out_dir)
+        if out_file:
+            print(out_file)
+        return 0 if out_file else 1
+    if args.shards:
+        import run_shards
+
+        out_file = run_shards.run_local_shards(_worker_args(args), args.shards, args.shard_dir,
+                                               rule_mode=args.mode, out_dir=args.out_dir)
+        if out_file:
+            print(out_file)
+        return 0 if out_file else 1
+
+    mode = args.mode or "Strict"
+    if args.rescore:
+        if args.follow:
+            screener.follow_checklist(mode, include_watch=args.watch, store_path=args.store)
+            return 0
+        out_file = screener.rescore(mode, include_watch=args.watch, store_path=args.store)
+        return 0 if out_file else 1
+
+    progress = screener.ConsoleProgress(quiet=args.quiet)
+    if args.resume is not None:
+        result = screener.resume_run(args.resume or None, fetch_workers=args.workers,
+                                     compute_processes=args.compute_processes, progress=progress,
+                                     out_dir=args.out_dir)
+        return _finish(result)
+
+    raw = " ".join(args.tickers)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            raw += "\n" + f.read()
+    use_fmp = args.use_fmp if args.use_fmp is not None else bool(os.environ.get("FMP_API_KEY", "").strip())
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    if args.shard:
+        import run_shards
+
+        index, shards = run_shards.parse_shard(args.shard)
+        result = run_shards.run_shard(raw, args.universe, index, shards, args.shard_dir, mode, use_fmp, args.watch,
+                                      fetch_workers=args.workers, compute_processes=args.compute_processes,
+                                      progress=progress)
+        print(run_shards.shard_results_path(args.shard_dir, index, shards))
+        return 0
+    result = screener.screen_inputs(raw, args.universe, mode, use_fmp, args.watch, fetch_workers=args.workers,
+                                    compute_processes=args.compute_processes, progress=progress,
+                                    out_dir=args.out_dir)
+    return _finish(result)
+
+
+def _finish(result) -> int:
+    if not result.tickers:
+        return 2
+    if not result.report:
+        return 1
+    print(result.report)
+    return 0
+
+
+if __name__ == "__main__":
+    from multiprocessing import freeze_support
+
+    freeze_support()  # no-op unless frozen
+    sys.exit(main())
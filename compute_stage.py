@@ -0,0 +1,136 @@
+"""Post-fetch compute stage: metrics -> reversal -> ScoreCard.
+
+Fetching is network-bound and stays on threads. Everything after the fetch is
+pure CPU work on packed arrays (`metrics.pack_ticker_data`), so it can run in
+a ProcessPoolExecutor and scale with cores instead of being serialized by the
+GIL. Worker processes receive the thresholds once through the pool initializer.
+
+In process mode the price histories are not pickled per task: as fetches
+complete, the parent moves each small batch of histories into a
+SharedPricePanel and submits the batch right away, so compute overlaps the
+remaining downloads. Workers attach to a batch's panel on first use, read
+zero-copy views by ticker and keep only the most recent attachments open.
+
+Env vars (optional):
+  COMPUTE_PROCESSES=0     # >0: run the compute stage in that many processes
+  ELIGIBILITY_MODE=shortlist  # eligibility gate before the reversal: shortlist | buy | off
+"""
+
+from __future__ import annotations
+
+import os
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import util
+from typing import Any, Dict, Optional, Tuple
+
+from cache_utils import _safe_int
+from metric_registry import MetricPlan
+from metrics import compute_metrics_from_pack, metrics_plan
+from price_panel import AttachedPricePanel, PanelHandle, SharedPricePanel, bench_key, ticker_key
+from reversal import trend_reversal_scores_from_data
+from scorecard import (GATED_REVERSAL, ScoreCard, check_eligibility, finish_scorecard, reversal_total,
+                       score_fundamentals)
+
+# Set in each worker process by init_compute_worker().
+_WORKER_THRESHOLDS: Optional[Dict[str, Any]] = None
+_WORKER_TARGET: float = 60.0
+_WORKER_ELIGIBILITY: Optional[str] = None
+_WORKER_PLAN: Optional[MetricPlan] = None
+# Panels this worker has attached to, most recent last (older batches are usually finished).
+_WORKER_PANELS: "OrderedDict[str, AttachedPricePanel]" = OrderedDict()
+_KEEP_ATTACHED = 2
+
+ComputeResult = Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[ScoreCard], Optional[str]]
+
+
+def compute_processes_setting() -> int:
+    return max(0, _safe_int(os.environ.get("COMPUTE_PROCESSES", "0"), default=0))
+
+
+def analyze_pack(sym: str, pack: Dict[str, Any], thresholds: Dict[str, Any], target_threshold: float,
+                 eligibility_mode: Optional[str] = None, plan: Optional[MetricPlan] = None) -> ComputeResult:
+    """Compute metrics, reversal pack and ScoreCard for one packed ticker.
+
+    Only the metrics the thresholds score (plus the reversal inputs) are evaluated; callers pass the
+    run's `plan` (metrics_plan(thresholds)) so it is not rebuilt per ticker. With an
+    `eligibility_mode`, the coverage gates run right after rating and a FAIL skips the reversal (the
+    result carries GATED_REVERSAL so stored runs know it is missing); buy
+    mode checks again once the reversal exists, for its minimum reversal score.
+    """
+    try:
+        m = compute_metrics_from_pack(sym, pack, plan or metrics_plan(thresholds))
+        fund = score_fundamentals(sym, m, thresholds)
+        elig = check_eligibility(fund, eligibility_mode) if eligibility_mode else None
+        if elig is not None and elig.status == "FAIL":
+            return (sym, m, dict(GATED_REVERSAL), finish_scorecard(fund, None, target_threshold, elig), None)
+        prices = pack.get("prices")
+        h_2y = prices.last_years(2) if prices is not None else None
+        h_1y = prices.last_years(1) if prices is not None else None
+        rev = trend_reversal_scores_from_data(statements=pack.get("statements"), h_1y=h_1y, h_2y=h_2y, metrics=m)
+        if eligibility_mode == "buy":
+            elig = check_eligibility(fund, eligibility_mode, reversal_total(rev))
+        return (sym, m, rev, finish_scorecard(fund, rev, target_threshold, elig), None)
+    except Exception:
+        return (sym, None, None, None, traceback.format_exc())
+
+
+def share_prices(packs: Dict[str, Dict[str, Any]]) -> SharedPricePanel:
+    """Move the price histories out of a batch of packs into one shared-memory panel (parent side).
+
+    Benchmark histories are shared by many tickers and are stored once per panel. The caller closes
+    and unlinks the panel once every task submitted with its handle has finished.
+    """
+    histories = {}
+    for sym, pack in packs.items():
+        prices = pack.pop("prices", None)
+        bench = pack.pop("bench", None)
+        if prices is not None:
+            histories[ticker_key(sym)] = prices
+        b = pack.get("bench_ticker")
+        if b and bench is not None and bench_key(b) not in histories:
+            histories[bench_key(b)] = bench
+    return SharedPricePanel.build(histories)
+
+
+def _close_worker_panels() -> None:
+    while _WORKER_PANELS:
+        _WORKER_PANELS.popitem()[1].close()
+
+
+def init_compute_worker(thresholds: Dict[str, Any], target_threshold: float,
+                        eligibility_mode: Optional[str] = None) -> None:
+    global _WORKER_THRESHOLDS, _WORKER_TARGET, _WORKER_ELIGIBILITY, _WORKER_PLAN
+    _WORKER_THRESHOLDS = thresholds
+    _WORKER_PLAN = metrics_plan(thresholds)
+    _WORKER_TARGET = float(target_threshold)
+    _WORKER_ELIGIBILITY = eligibility_mode
+    # Runs when the worker process exits (multiprocessing finalizers, unlike atexit, run in pool workers).
+    util.Finalize(None, _close_worker_panels, exitpriority=10)
+
+
+def _worker_panel(handle: PanelHandle) -> AttachedPricePanel:
+    panel = _WORKER_PANELS.pop(handle.name, None) or AttachedPricePanel.attach(handle)
+    _WORKER_PANELS[handle.name] = panel
+    while len(_WORKER_PANELS) > _KEEP_ATTACHED:
+        _WORKER_PANELS.popitem(last=False)[1].close()
+    return panel
+
+
+def _analyze_pack_in_worker(sym: str, pack: Dict[str, Any], handle: Optional[PanelHandle] = None) -> ComputeResult:
+    if handle is not None and "prices" not in pack:
+        panel = _worker_panel(handle)
+        pack = dict(pack, prices=panel.get(ticker_key(sym)), bench=panel.get(bench_key(pack.get("bench_ticker") or "")))
+    return analyze_pack(sym, pack, _WORKER_THRESHOLDS or {}, _WORKER_TARGET, _WORKER_ELIGIBILITY, _WORKER_PLAN)
+
+
+def make_compute_pool(processes: int, thresholds: Dict[str, Any], target_threshold: float,
+                      eligibility_mode: Optional[str] = None) -> Executor:
+    return ProcessPoolExecutor(max_workers=processes, initializer=init_compute_worker,
+                               initargs=(thresholds, target_threshold, eligibility_mode))
+
+
+def submit_compute(pool: Executor, sym: str, pack: Dict[str, Any], handle: Optional[PanelHandle] = None):
+    """Submit one pack; with `handle`, its prices were moved into that panel by share_prices()."""
+    return pool.submit(_analyze_pack_in_worker, sym, pack, handle)
@@ -0,0 +1,155 @@
+"""Long-running screening service with a local HTTP/JSON API.
+
+A cold run reloads the checklist, re-reads the disk caches and opens new
+Yahoo sessions. The daemon keeps all of that resident: compiled thresholds
+(hot-reloaded by ChecklistWatcher), per-ticker results (ResultMemo), resolved
+symbols and the yfinance HTTP session. A repeated screen only fetches tickers
+that are new or older than DAEMON_RESULT_TTL_MINUTES; the rest are rescored
+from memory against the current checklist.
+
+  python daemon.py [--host 127.0.0.1] [--port 8765]
+
+  GET  /health   -> {"status": "ok", "checklist_version": 2, "memo_tickers": 503}
+  POST /screen   {"tickers": ["AAPL", "microsoft"], "universes": ["SP500"], "mode": "Strict",
+                  "use_fmp": false, "include_watch": false, "report": true}
+                 -> {"report": path|null, "candidates": [...], "scores": [{summary row}, ...], "seconds": 1.7}
+
+Screens run one at a time (each one already fans out over fetch threads /
+compute processes); concurrent requests queue. The server binds to localhost
+by default and has no authentication.
+
+Env vars (optional):
+  DAEMON_HOST=127.0.0.1
+  DAEMON_PORT=8765
+  DAEMON_RESULT_TTL_MINUTES=30   # reuse fetched results this long without refetching
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import freeze_support
+from time import perf_counter
+from typing import Any, Dict
+
+try:
+    from env_loader import load_env
+
+    load_env()
+except Exception:
+    pass
+
+from cache_utils import _safe_float, _safe_int
+from checklist_watcher import ChecklistWatcher
+from input_resolver import resolve_to_ticker
+from report_exports import summary_frame
+from screener import RULE_THRESHOLDS, ConsoleProgress, ResultMemo, find_checklist_file, screen_inputs
+
+
+def result_ttl_setting() -> float:
+    return max(0.0, _safe_float(os.environ.get("DAEMON_RESULT_TTL_MINUTES", "30"), default=30.0)) * 60.0
+
+
+class ScreenService:
+    """Warm state shared by all requests."""
+
+    def __init__(self):
+        self.watcher = ChecklistWatcher(find_checklist_file()).start()
+        self.memo = ResultMemo(result_ttl_setting())
+        self._resolve = functools.lru_cache(maxsize=None)(resolve_to_ticker)
+        self._lock = threading.Lock()
+
+    def health(self) -> Dict[str, Any]:
+        return {"status": "ok", "checklist_version": self.watcher.version, "memo_tickers": len(self.memo)}
+
+    def screen(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        mode = str(req.get("mode") or "Strict").capitalize()
+        if mode not in RULE_THRESHOLDS:
+            raise ValueError(f"mode must be one of {sorted(RULE_THRESHOLDS)}")
+        raw = req.get("tickers") or []
+        raw = " ".join(raw) if isinstance(raw, list) else str(raw)
+        use_fmp = req.get("use_fmp")
+        use_fmp = bool(os.environ.get("FMP_API_KEY", "").strip()) if use_fmp is None else bool(use_fmp)
+
+        t0 = perf_counter()
+        with self._lock:
+            result = screen_inputs(raw, req.get("universes") or [], mode, use_fmp, bool(req.get("include_watch")),
+                                   resolve=self._resolve, progress=ConsoleProgress(quiet=True),
+                                   thresholds=self.watcher.thresholds, memo=self.memo,
+                                   write_report=bool(req.get("report", True)))
+        if not result.tickers:
+            raise ValueError("no tickers resolved")
+        scored = [t for t in result.tickers if t in result.scorecards]
+        scores = json.loads(summary_frame(scored, result.scorecards).to_json(orient="records")) if scored else []
+        return {"report": result.report, "candidates": result.candidates, "scores": scores,
+                "seconds": round(perf_counter() - t0, 3)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "StockReportDaemon/1"
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._reply(200, self.server.service.health())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/screen":
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+            req = json.loads(self.rfile.read(n) or b"{}")
+            if not isinstance(req, dict):
+                raise ValueError("request body must be a JSON object")
+        except ValueError as e:
+            self._reply(400, {"error": f"bad request: {e}"})
+            return
+        try:
+            self._reply(200, self.server.service.screen(req))
+        except ValueError as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+def make_server(host: str, port: int, service: ScreenService = None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.service = service or ScreenService()
+    return server
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Serve the stock screen over a local JSON API.")
+    ap.add_argument("--host", default=os.environ.get("DAEMON_HOST") or "127.0.0.1")
+    ap.add_argument("--port", type=int, default=_safe_int(os.environ.get("DAEMON_PORT", "8765"), default=8765))
+    args = ap.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Screening daemon on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.watcher.stop()
+
+
+if __name__ == "__main__":
+    freeze_support()
+    main()
@@ -17,6 +17,7 @@ You can tune thresholds in DEFAULT_RULES below without changing other code.
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -76,6 +77,14 @@ DEFAULT_RULES = {
 
 
 
+def eligibility_mode_setting() -> Optional[str]:
+    """ELIGIBILITY_MODE env var: "shortlist" (default), "buy", or "off" to disable the gate."""
+    v = (os.environ.get("ELIGIBILITY_MODE") or "shortlist").strip().lower()
+    if v in ("0", "off", "false", "no", "none"):
+        return None
+    return v if v in DEFAULT_RULES else "shortlist"
+
+
 # Keep in sync with scoring.CATEGORY_WEIGHTS (duplicated here to avoid import cycles).
 CATEGORY_WEIGHTS = {
     "Valuation": 0.20,
@@ -191,16 +200,17 @@ def evaluate_eligibility(
         if s is not None and s < float(thr):
             reasons.append(f"{cat} adjusted score {s:.0f}% < {float(thr):.0f}%")
 
-    # DAVF handling
-    d = (davf_label or "NA").upper().strip()
-    if mode == "buy":
-        allowed = set(rules.get("davf_allowed") or set())
-        if allowed and d not in allowed:
-            reasons.append(f"DAVF not acceptable for buy (DAVF={d})")
-    else:
-        watch = set(rules.get("davf_watch") or set())
-        if d in watch:
-            reasons.append(f"DAVF weak/uncertain (DAVF={d})")
+    # DAVF handling (only when the caller has a DAVF label; the screen itself does not compute one)
+    if davf_label is not None:
+        d = davf_label.upper().strip() or "NA"
+        if mode == "buy":
+            allowed = set(rules.get("davf_allowed") or set())
+            if allowed and d not in allowed:
+                reasons.append(f"DAVF not acceptable for buy (DAVF={d})")
+        else:
+            watch = set(rules.get("davf_watch") or set())
+            if d in watch:
+                reasons.append(f"DAVF weak/uncertain (DAVF={d})")
 
     # Buy-mode minimum score gates
     if mode == "buy":
@@ -0,0 +1,185 @@
+"""Historical snapshot store (SQLite).
+
+Every screening run appends one row per scored ticker so score/metric
+evolution can be queried without reopening old workbooks:
+
+  runs(run_id, run_ts, rule_mode, n_tickers)
+  snapshots(ticker, run_id, sector_bucket, avg_fund_score, avg_coverage,
+            fund_score_pct, tech_score_pct, total_score_pct, status)
+  value_names(name_id, kind, name)
+      kind = 'metric' (numeric metrics), 'category' (adjusted category scores),
+             'reversal' (reversal sub-scores)
+  ticker_values(ticker, name_id, run_id, value)
+
+`ticker_values` is the long/columnar table. Both it and `snapshots` are
+clustered on ticker first (WITHOUT ROWID primary keys), and run ids grow with
+run_ts, so a year of daily runs for one ticker is a single index range scan.
+Names are interned in `value_names` to keep the table small.
+
+Env vars (optional):
+  HISTORY_DB=.cache/history.sqlite3   # path of the store; "0"/"off" disables recording
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_ts TEXT NOT NULL,
+    rule_mode TEXT,
+    n_tickers INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_runs_ts ON runs(run_ts);
+CREATE TABLE IF NOT EXISTS snapshots (
+    ticker TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    sector_bucket TEXT,
+    avg_fund_score REAL,
+    avg_coverage REAL,
+    fund_score_pct REAL,
+    tech_score_pct REAL,
+    total_score_pct REAL,
+    status TEXT,
+    PRIMARY KEY (ticker, run_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS value_names (
+    name_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+CREATE TABLE IF NOT EXISTS ticker_values (
+    ticker TEXT NOT NULL,
+    name_id INTEGER NOT NULL REFERENCES value_names(name_id),
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    value REAL,
+    PRIMARY KEY (ticker, name_id, run_id)
+) WITHOUT ROWID;
+"""
+
+
+def history_db_path() -> Optional[str]:
+    v = (os.environ.get("HISTORY_DB") or "").strip()
+    if v.lower() in ("0", "off", "false", "no"):
+        return None
+    return v or os.path.join(os.getcwd(), ".cache", "history.sqlite3")
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or history_db_path() or os.path.join(os.getcwd(), ".cache", "history.sqlite3")
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _num(v: Any) -> Optional[float]:
+    if isinstance(v, bool) or v is None:
+        return None
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if (math.isnan(f) or math.isinf(f)) else f
+
+
+def _reversal_subscores(rev: Dict[str, Any]) -> Iterable[Tuple[str, Optional[float]]]:
+    for group in ("fund_details", "tech_details"):
+        for name, detail in (rev.get(group) or {}).items():
+            score = detail[0] if isinstance(detail, (list, tuple)) and detail else detail
+            yield name, _num(score)
+
+
+def _ticker_values(metrics: Dict[str, Any], card) -> Iterable[Tuple[str, str, Optional[float]]]:
+    for name, v in (metrics or {}).items():
+        if name.startswith("__"):
+            continue
+        f = _num(v)
+        if f is not None:
+            yield "metric", name, f
+    if card is not None:
+        for name, v in card.cat_scores.items():
+            yield "category", name, _num(v)
+        for name, v in _reversal_subscores(card.reversal):
+            yield "reversal", name, v
+
+
+def _name_ids(conn: sqlite3.Connection) -> Dict[Tuple[str, str], int]:
+    return {(k, n): i for i, k, n in conn.execute("SELECT name_id, kind, name FROM value_names")}
+
+
+def record_run(scorecards: Dict[str, Any], metrics_map: Dict[str, Dict[str, Any]], *,
+               rule_mode: Optional[str] = None, run_ts: Optional[str] = None,
+               path: Optional[str] = None) -> Optional[int]:
+    """Append one snapshot per scored ticker; returns the new run_id (None when recording is disabled)."""
+    if path is None and history_db_path() is None:
+        return None
+    run_ts = run_ts or datetime.now().isoformat(timespec="seconds")
+    tickers = sorted(scorecards)
+    with closing(connect(path)) as conn, conn:
+        cur = conn.execute("INSERT INTO runs (run_ts, rule_mode, n_tickers) VALUES (?, ?, ?)",
+                           (run_ts, rule_mode, len(tickers)))
+        run_id = int(cur.lastrowid)
+        name_ids = _name_ids(conn)
+        snaps, values = [], []
+        for t in tickers:
+            card = scorecards[t]
+            rev = card.reversal
+            snaps.append((t, run_id, card.sector_bucket, _num(card.avg_fund_score), _num(card.avg_coverage),
+                          _num(rev.get("fund_score_pct")), _num(rev.get("tech_score_pct")),
+                          _num(rev.get("total_score_pct")), card.status))
+            for kind, name, v in _ticker_values(metrics_map.get(t) or {}, card):
+                nid = name_ids.get((kind, name))
+                if nid is None:
+                    nid = int(conn.execute("INSERT INTO value_names (kind, name) VALUES (?, ?)",
+                                           (kind, name)).lastrowid)
+                    name_ids[(kind, name)] = nid
+                values.append((t, nid, run_id, v))
+        conn.executemany("INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", snaps)
+        conn.executemany("INSERT INTO ticker_values VALUES (?, ?, ?, ?)", values)
+    return run_id
+
+
+def score_history(ticker: str, *, since: Optional[str] = None, path: Optional[str] = None) -> pd.DataFrame:
+    """One row per run for `ticker`: scores, coverage, reversal totals and status."""
+    sql = ("SELECT r.run_ts, r.rule_mode, s.* FROM snapshots s JOIN runs r ON r.run_id = s.run_id "
+           "WHERE s.ticker = ?")
+    params: list = [ticker]
+    if since:
+        sql += " AND r.run_ts >= ?"
+        params.append(since)
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(sql + " ORDER BY s.run_id", conn, params=params)
+
+
+def value_history(ticker: str, name: Optional[str] = None, *, kind: str = "metric", since: Optional[str] = None,
+                  path: Optional[str] = None) -> pd.DataFrame:
+    """Time series of one value (or all values of `kind`) for `ticker`, wide by name and indexed by run_ts."""
+    sql = ("SELECT r.run_ts, n.name, v.value FROM ticker_values v "
+           "JOIN value_names n ON n.name_id = v.name_id JOIN runs r ON r.run_id = v.run_id "
+           "WHERE v.ticker = ? AND n.kind = ?")
+    params: list = [ticker, kind]
+    if name:
+        sql += " AND n.name = ?"
+        params.append(name)
+    if since:
+        sql += " AND r.run_ts >= ?"
+        params.append(since)
+    with closing(connect(path)) as conn:
+        df = pd.read_sql_query(sql + " ORDER BY v.run_id", conn, params=params)
+    if df.empty:
+        return df
+    return df.pivot_table(index="run_ts", columns="name", values="value", aggfunc="last")
@@ -0,0 +1,197 @@
+"""Metric registry: declared inputs/dependencies and lazy evaluation.
+
+Every metric is produced by a registered node that declares
+  - the pack datasets it reads ("info", "fmp", "statements", "prices", "bench"),
+  - the other values it depends on (public metric names or "_private" intermediates).
+
+`plan_metrics()` walks the dependency graph from the metrics a run actually
+needs (checklist metrics that are scored + the reversal inputs), and
+`evaluate_metrics()` computes only those nodes, each at most once. The plan's
+dataset set tells the fetch stage what it can skip (e.g. the benchmark
+history when no relative-return metric is needed).
+
+Value-matrix extras (value_matrix_extras.py) are registered as opt-in nodes:
+they are computed and scored only when enabled.
+
+Env vars (optional):
+  EXTRA_METRICS=              # comma-separated extra node names, or "all" (e.g. normalized_fcf,sbc_burden)
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from scoring import WHITELIST
+
+DATASETS = ("info", "fmp", "statements", "prices", "bench")
+
+# Always part of a metrics dict: identity/sizing used by scoring, the writer and the reversal stage.
+BASE_METRICS = ("Price", "Market Cap", "Sector Bucket")
+
+
+@dataclass(frozen=True)
+class MetricNode:
+    name: str
+    provides: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    deps: Tuple[str, ...]
+    fn: Callable[["MetricContext"], Dict[str, Any]]
+    extra: bool = False
+
+
+_NODES: Dict[str, MetricNode] = {}
+_PROVIDERS: Dict[str, str] = {}  # value name -> node name
+
+
+def metric(name: str, provides: Iterable[str], *, inputs: Iterable[str] = (), deps: Iterable[str] = (),
+           extra: bool = False):
+    """Decorator registering `fn(ctx) -> {value name: value}` as a metric node."""
+    provides, inputs, deps = tuple(provides), tuple(inputs), tuple(deps)
+    unknown = set(inputs) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"Metric node {name!r} reads unknown datasets: {sorted(unknown)}")
+
+    def _register(fn):
+        old = _NODES.pop(name, None)  # re-registration (module reload) replaces the node
+        if old is not None:
+            for key in old.provides:
+                _PROVIDERS.pop(key, None)
+        for key in provides:
+            if key in _PROVIDERS:
+                raise ValueError(f"{key!r} already provided by node {_PROVIDERS[key]!r}")
+            _PROVIDERS[key] = name
+        _NODES[name] = MetricNode(name, provides, inputs, deps, fn, extra)
+        return fn
+
+    return _register
+
+
+def registered_nodes() -> Dict[str, MetricNode]:
+    return dict(_NODES)
+
+
+def provider_of(key: str) -> Optional[MetricNode]:
+    n = _PROVIDERS.get(key)
+    return _NODES[n] if n is not None else None
+
+
+def enabled_extras() -> Set[str]:
+    raw = (os.environ.get("EXTRA_METRICS") or "").strip()
+    if not raw:
+        return set()
+    import value_matrix_extras  # noqa: F401  (registers the extra nodes when only scoring is imported)
+    extras = {n for n, node in _NODES.items() if node.extra}
+    if raw.lower() == "all":
+        return extras
+    return {s.strip() for s in raw.split(",") if s.strip() in extras}
+
+
+def scored_metric_names() -> Set[str]:
+    """Metrics that take part in category scores: the WHITELIST plus the public outputs of enabled extras."""
+    names = set(WHITELIST)
+    for n in enabled_extras():
+        names.update(k for k in _NODES[n].provides if not k.startswith("_"))
+    return names
+
+
+def required_metrics(thresholds: Dict[str, Dict[str, Any]], extra_inputs: Iterable[str] = ()) -> Set[str]:
+    """Metrics a run needs: scored checklist metrics, `extra_inputs` (e.g. reversal inputs) and BASE_METRICS."""
+    scored = scored_metric_names()
+    need = set(BASE_METRICS) | set(extra_inputs)
+    for cat in (thresholds or {}).values():
+        if isinstance(cat, dict):
+            need.update(m for m in cat if m in scored)
+    return {m for m in need if m in _PROVIDERS}
+
+
+@dataclass(frozen=True)
+class MetricPlan:
+    nodes: Tuple[str, ...]        # dependency order
+    outputs: FrozenSet[str]       # requested public metric names
+    datasets: FrozenSet[str]      # pack datasets the nodes read
+
+
+def plan_metrics(required: Optional[Iterable[str]] = None) -> MetricPlan:
+    """Resolve `required` metric names (default: every non-extra node) into an ordered node list."""
+    if required is None:
+        required = [k for node in _NODES.values() if not node.extra for k in node.provides if not k.startswith("_")]
+    outputs = frozenset(required)
+
+    order: List[str] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def _visit(node_name: str) -> None:
+        s = state.get(node_name)
+        if s == 2:
+            return
+        if s == 1:
+            raise ValueError(f"Dependency cycle through metric node {node_name!r}")
+        state[node_name] = 1
+        for dep in _NODES[node_name].deps:
+            if dep not in _PROVIDERS:
+                raise KeyError(f"Metric node {node_name!r} depends on unknown value {dep!r}")
+            _visit(_PROVIDERS[dep])
+        state[node_name] = 2
+        order.append(node_name)
+
+    for key in outputs:
+        if key not in _PROVIDERS:
+            raise KeyError(f"No metric node provides {key!r}")
+    for name, node in _NODES.items():  # registration order keeps plans deterministic
+        if any(k in outputs for k in node.provides):
+            _visit(name)
+
+    datasets = frozenset(ds for n in order for ds in _NODES[n].inputs)
+    return MetricPlan(tuple(order), outputs, datasets)
+
+
+class MetricContext:
+    """Per-ticker evaluation state. Values are computed on first access and memoized."""
+
+    def __init__(self, pack: Dict[str, Any], preset: Optional[Dict[str, Any]] = None):
+        self.pack = pack
+        self.values: Dict[str, Any] = dict(preset or {})
+        self.notes: Dict[str, str] = {}
+        self._done: Set[str] = set()
+
+    def data(self, dataset: str) -> Any:
+        return self.pack.get(dataset)
+
+    def run(self, node_name: str) -> None:
+        if node_name in self._done:
+            return
+        self._done.add(node_name)
+        node = _NODES[node_name]
+        if all(k in self.values for k in node.provides):
+            return
+        for k, v in (node.fn(self) or {}).items():
+            self.values.setdefault(k, v)
+
+    def get(self, key: str) -> Any:
+        if key not in self.values:
+            n = _PROVIDERS.get(key)
+            if n is None:
+                raise KeyError(f"No metric node provides {key!r}")
+            self.run(n)
+        return self.values.get(key)
+
+    def note(self, key: str, text: str) -> None:
+        self.notes[key] = text
+
+
+def evaluate_metrics(plan: MetricPlan, pack: Dict[str, Any],
+                     preset: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Run the plan's nodes on one pack; returns (public values in registration order, notes)."""
+    ctx = MetricContext(pack, preset)
+    for n in plan.nodes:
+        ctx.run(n)
+    planned = set(plan.nodes)
+    out: Dict[str, Any] = {}
+    for name, node in _NODES.items():
+        if name in planned:
+            for k in node.provides:
+                if not k.startswith("_"):
+                    out[k] = ctx.values.get(k)
+    return out, ctx.notes
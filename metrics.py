@@ -1,13 +1,18 @@
 import math
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from cache_utils import DiskCache, yf_call, yf_cache_settings
 from config import FORCE_FMP_FALLBACK
-from value_matrix_extras import compute_value_matrix_extras
+import value_matrix_extras  # noqa: F401  (registers the opt-in extra metric nodes)
 from sector_map import map_sector, get_sector_benchmark  # <--- UPDATED IMPORT
 from fmp_provider import FMPClient
+from statements import StatementSet
+from prices import PriceHistory
+from metric_registry import MetricContext, MetricPlan, evaluate_metrics, metric, plan_metrics, required_metrics
+from reversal import REVERSAL_METRICS
 
 _MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
 
@@ -58,44 +63,17 @@ def _history_retry(symbol: str, tkr: yf.Ticker, period: str) -> pd.DataFrame:
     return _download_history(symbol, period)
 
 
-def annual_series(df: pd.DataFrame, row_names: List[str], n: int = 5) -> List[Optional[float]]:
-    if df is None or df.empty: return []
-    for r in row_names:
-        if r in df.index:
-            vals = pd.to_numeric(df.loc[r].iloc[:n][::-1], errors="coerce")
-            return [float(v) if not pd.isna(v) else None for v in vals]
-    return []
-
-
 def cagr(values: List[Optional[float]]) -> Optional[float]:
     vals = [v for v in values if v is not None and v > 0]
     if len(vals) < 2: return None
     return ((vals[-1] / vals[0]) ** (1 / (len(vals) - 1)) - 1) * 100.0
 
 
-def last_n_quarters_sum(df: pd.DataFrame, row_names: List[str]) -> Optional[float]:
-    if df is None or df.empty: return None
-    cols = list(df.columns)[:4]
-    for rn in row_names:
-        if rn in df.index:
-            try:
-                return float(pd.to_numeric(df.loc[rn, cols], errors="coerce").sum())
-            except:
-                pass
-    return None
-
-
-def approx_roic_percent(annual_income: pd.DataFrame, annual_bs: pd.DataFrame) -> Optional[float]:
-    if annual_income.empty or annual_bs.empty: return None
-    ebit = None
-    for k in ["EBIT", "Ebit", "Operating Income", "OperatingIncome"]:
-        if k in annual_income.index: ebit = _to_float(annual_income.loc[k].iloc[0]); break
-    total_assets = None
-    for k in ["Total Assets", "TotalAssets"]:
-        if k in annual_bs.index: total_assets = _to_float(annual_bs.loc[k].iloc[0]); break
-    curr_liab = None
-    for k in ["Current Liabilities", "CurrentLiabilities", "Total Current Liabilities"]:
-        if k in annual_bs.index: curr_liab = _to_float(annual_bs.loc[k].iloc[0]); break
+def approx_roic_percent(stmts: StatementSet) -> Optional[float]:
+    if not stmts.has("annual_income") or not stmts.has("annual_bs"): return None
+    ebit = stmts.latest("annual_income", ("ebit", "operating_income"))
+    total_assets = stmts.latest("annual_bs", "total_assets")
+    curr_liab = stmts.latest("annual_bs", "current_liabilities")
 
     if ebit is None or total_assets is None or curr_liab is None: return None
     invested = float(total_assets) - float(curr_liab)
@@ -103,8 +81,13 @@ def approx_roic_percent(annual_income: pd.DataFrame, annual_bs: pd.DataFrame) ->
     return (float(ebit) * 0.79 / invested) * 100.0
 
 
-def compute_metrics_v2(ticker: str, use_fmp_fallback: bool = True, *, fmp_mode: str = "full",
-                       use_yf_cache: Optional[bool] = None) -> Dict[str, Any]:
+def fetch_ticker_data(ticker: str, use_fmp_fallback: bool = True, *, fmp_mode: str = "full",
+                      use_yf_cache: Optional[bool] = None, datasets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Network/cache stage: raw yfinance (and optional FMP) data for one ticker.
+
+    `datasets` (e.g. MetricPlan.datasets) limits optional downloads; the benchmark history is only
+    fetched when "bench" is in it. None fetches everything.
+    """
     tkr = yf.Ticker(ticker)
     _cache_enabled, _cache_ttl = yf_cache_settings()
     if use_yf_cache is not None: _cache_enabled = bool(use_yf_cache)
@@ -129,24 +112,6 @@ def compute_metrics_v2(ticker: str, use_fmp_fallback: bool = True, *, fmp_mode:
         if fmp.enabled: fmp_data = fmp.fetch_bundle(ticker, mode=fmp_mode) or {}
 
     h10 = ensure_df(_cached_df(f"hist:{ticker}:10y:1d", lambda: _history_retry(ticker, tkr, period="10y")))
-    try:
-        h3y = h10.loc[h10.index >= (h10.index.max() - pd.DateOffset(years=3))].copy()
-    except:
-        h3y = pd.DataFrame()
-    try:
-        h2y = h10.loc[h10.index >= (h10.index.max() - pd.DateOffset(years=2))].copy()
-    except:
-        h2y = pd.DataFrame()
-    try:
-        h1y = h10.loc[h10.index >= (h10.index.max() - pd.DateOffset(years=1))].copy()
-    except:
-        h1y = pd.DataFrame()
-
-    price = safe_get(info, "currentPrice") or _fmp_get_num(fmp_data, "quote", "price")
-    if price is None and not h10.empty: price = float(h10["Close"].iloc[-1])
-
-    mcap = safe_get(info, "marketCap") or _fmp_get_num(fmp_data, "quote", "marketCap")
-    ev = safe_get(info, "enterpriseValue") or _fmp_get_num(fmp_data, "key_metrics_ttm", "enterpriseValue")
 
     annual_income = ensure_df(_cached_df(f"stmt:{ticker}:income_stmt", lambda: yf_call(lambda: tkr.income_stmt)))
     annual_bs = ensure_df(_cached_df(f"stmt:{ticker}:balance_sheet", lambda: yf_call(lambda: tkr.balance_sheet)))
@@ -154,117 +119,254 @@ def compute_metrics_v2(ticker: str, use_fmp_fallback: bool = True, *, fmp_mode:
     q_income = ensure_df(_cached_df(f"stmt:{ticker}:q_income", lambda: yf_call(lambda: tkr.quarterly_income_stmt)))
     q_cf = ensure_df(_cached_df(f"stmt:{ticker}:q_cf", lambda: yf_call(lambda: tkr.quarterly_cashflow)))
 
-    ttm_rev = last_n_quarters_sum(q_income, ["Total Revenue", "TotalRevenue"])
-    ttm_ebit = last_n_quarters_sum(q_income, ["Operating Income", "OperatingIncome", "EBIT"])
-    ttm_ni = last_n_quarters_sum(q_income, ["Net Income", "NetIncome"])
-    ttm_gp = last_n_quarters_sum(q_income, ["Gross Profit", "GrossProfit"])
-    ttm_fcf = None
-    ocf = last_n_quarters_sum(q_cf, ["Operating Cash Flow", "Total Cash From Operating Activities"])
-    cap = last_n_quarters_sum(q_cf, ["Capital Expenditure", "CapitalExpenditure"])
-    if ocf is not None and cap is not None: ttm_fcf = ocf + cap
+    # Sector benchmark history (for the relative-return metric)
+    sector_bucket = map_sector(info.get("sector"), info.get("industry"))
+    bench_ticker = get_sector_benchmark(sector_bucket)
+    h_bench = pd.DataFrame()
+    if not h10.empty and (datasets is None or "bench" in datasets):
+        def _get_bench_hist():
+            b_tkr = yf.Ticker(bench_ticker)
+            return _history_retry(bench_ticker, b_tkr, period="1y")
+
+        # Reuse existing cache logic for benchmark history
+        h_bench = ensure_df(_cached_df(f"hist:{bench_ticker}:1y", _get_bench_hist))
+
+    return {
+        "info": info, "fmp": fmp_data, "h10": h10, "h_bench": h_bench, "bench_ticker": bench_ticker,
+        "annual_income": annual_income, "annual_bs": annual_bs, "annual_cf": annual_cf,
+        "q_income": q_income, "q_cf": q_cf,
+    }
+
+
+def yf_cache_hit(ticker: str) -> bool:
+    """True when `ticker`'s info and price history are fresh in the yf disk cache (stat only, no reads).
+
+    Statements are not checked: _cached_df() does not cache missing ones, so a ticker without e.g.
+    quarterly cash flows would never count as warm although almost all of its data comes from disk.
+    """
+    enabled, ttl = yf_cache_settings()
+    cache = DiskCache("yf", ttl_hours=ttl, enabled=enabled)
+    return cache.is_fresh(f"info:{ticker}", ".json") and cache.is_fresh(f"hist:{ticker}:10y:1d")
+
+
+def pack_ticker_data(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert fetched frames into compact arrays (StatementSet / PriceHistory) for the compute stage."""
+    return {
+        "info": raw.get("info") or {},
+        "fmp": raw.get("fmp") or {},
+        # Resolve statement rows to canonical line items once; everything downstream reads from it.
+        "statements": StatementSet.from_frames(annual_income=raw.get("annual_income"),
+                                               annual_bs=raw.get("annual_bs"), annual_cf=raw.get("annual_cf"),
+                                               q_income=raw.get("q_income"), q_cf=raw.get("q_cf")),
+        "prices": PriceHistory.from_frame(raw.get("h10")),
+        "bench": PriceHistory.from_frame(raw.get("h_bench")),
+        "bench_ticker": raw.get("bench_ticker"),
+    }
+
+
+# ----------------------------------------------------
+# Metric nodes (see metric_registry). Registration order is the output order.
+# ----------------------------------------------------
+def _stmts(ctx: MetricContext) -> StatementSet:
+    return ctx.data("statements") or StatementSet()
+
+
+def _prices(ctx: MetricContext, key: str = "prices") -> PriceHistory:
+    return ctx.data(key) or PriceHistory.empty()
+
+
+@metric("price", ["Price"], inputs=["info", "fmp", "prices"])
+def _m_price(ctx):
+    price = safe_get(ctx.data("info") or {}, "currentPrice") or _fmp_get_num(ctx.data("fmp") or {}, "quote", "price")
+    prices = _prices(ctx)
+    if price is None and not prices.is_empty: price = float(prices.close[-1])
+    return {"Price": price}
+
+
+@metric("market_cap", ["Market Cap"], inputs=["info", "fmp"])
+def _m_market_cap(ctx):
+    return {"Market Cap": safe_get(ctx.data("info") or {}, "marketCap")
+                          or _fmp_get_num(ctx.data("fmp") or {}, "quote", "marketCap")}
+
+
+@metric("sector_bucket", ["Sector Bucket"], inputs=["info"])
+def _m_sector_bucket(ctx):
+    info = ctx.data("info") or {}
+    return {"Sector Bucket": map_sector(info.get("sector"), info.get("industry"))}
+
+
+@metric("relative_return", ["Sector Relative Return (1Y)"], inputs=["prices", "bench"])
+def _m_relative_return(ctx):
+    # Sector-relative return (1Y) vs. the bucket's benchmark ETF
+    bench = _prices(ctx, "bench")
+    rel_return_1y = None
+    h1y = _prices(ctx).last_years(1)
+    if not h1y.is_empty and not bench.is_empty:
+        try:
+            # 1. Stock Return (1Y)
+            s_start = float(h1y.close[0])
+            s_end = float(h1y.close[-1])
+            s_ret = (s_end - s_start) / s_start * 100.0
+
+            # 2. Benchmark Return (1Y), aligned to the stock's start date
+            b_slice = bench.since(h1y.first_timestamp())
+
+            if not b_slice.is_empty:
+                b_start = float(b_slice.close[0])
+                b_end = float(b_slice.close[-1])
+                b_ret = (b_end - b_start) / b_start * 100.0
+
+                # 3. Spread
+                rel_return_1y = s_ret - b_ret
+        except Exception:
+            pass
+    return {"Sector Relative Return (1Y)": rel_return_1y}
+
+
+@metric("enterprise_value", ["_ev"], inputs=["info", "fmp"])
+def _m_enterprise_value(ctx):
+    return {"_ev": safe_get(ctx.data("info") or {}, "enterpriseValue")
+                   or _fmp_get_num(ctx.data("fmp") or {}, "key_metrics_ttm", "enterpriseValue")}
+
+
+@metric("ttm_income", ["_ttm_rev", "_ttm_ebit", "_ttm_ni", "_ttm_gp"], inputs=["statements"])
+def _m_ttm_income(ctx):
+    stmts = _stmts(ctx)
+    return {"_ttm_rev": stmts.ttm("q_income", "total_revenue", all_nan=0.0),
+            "_ttm_ebit": stmts.ttm("q_income", ("operating_income", "ebit"), all_nan=0.0),
+            "_ttm_ni": stmts.ttm("q_income", "net_income", all_nan=0.0),
+            "_ttm_gp": stmts.ttm("q_income", "gross_profit", all_nan=0.0)}
+
+
+@metric("ttm_fcf", ["_ttm_fcf"], inputs=["statements"])
+def _m_ttm_fcf(ctx):
+    stmts = _stmts(ctx)
+    ocf = stmts.ttm("q_cf", "operating_cash_flow", all_nan=0.0)
+    cap = stmts.ttm("q_cf", "capital_expenditure", all_nan=0.0)
+    return {"_ttm_fcf": ocf + cap if (ocf is not None and cap is not None) else None}
+
 
-    pe = safe_get(info, "trailingPE")
+@metric("pe", ["P/E (TTM, positive EPS)"], inputs=["info"], deps=["Market Cap", "_ttm_ni"])
+def _m_pe(ctx):
+    pe = safe_get(ctx.data("info") or {}, "trailingPE")
+    mcap, ttm_ni = ctx.get("Market Cap"), ctx.get("_ttm_ni")
     if pe is None and mcap and ttm_ni and ttm_ni > 0: pe = mcap / ttm_ni
+    return {"P/E (TTM, positive EPS)": pe}
 
-    ev_ebit = (ev / ttm_ebit) if (ev and ttm_ebit and ttm_ebit > 0) else None
-    fcf_yield = (ttm_fcf / mcap * 100) if (ttm_fcf and mcap) else None
-    gross_m = (ttm_gp / ttm_rev * 100) if (ttm_gp and ttm_rev) else None
-    op_m = (ttm_ebit / ttm_rev * 100) if (ttm_ebit and ttm_rev) else None
-    roic = approx_roic_percent(annual_income, annual_bs)
 
+@metric("ev_ebit", ["EV/EBIT"], deps=["_ev", "_ttm_ebit"])
+def _m_ev_ebit(ctx):
+    ev, ttm_ebit = ctx.get("_ev"), ctx.get("_ttm_ebit")
+    return {"EV/EBIT": (ev / ttm_ebit) if (ev and ttm_ebit and ttm_ebit > 0) else None}
+
+
+@metric("fcf_yield", ["FCF Yield (TTM FCF / Market Cap)"], deps=["_ttm_fcf", "Market Cap"])
+def _m_fcf_yield(ctx):
+    ttm_fcf, mcap = ctx.get("_ttm_fcf"), ctx.get("Market Cap")
+    return {"FCF Yield (TTM FCF / Market Cap)": (ttm_fcf / mcap * 100) if (ttm_fcf and mcap) else None}
+
+
+@metric("margins", ["Gross Margin %", "Operating Margin %"], deps=["_ttm_gp", "_ttm_ebit", "_ttm_rev"])
+def _m_margins(ctx):
+    ttm_gp, ttm_ebit, ttm_rev = ctx.get("_ttm_gp"), ctx.get("_ttm_ebit"), ctx.get("_ttm_rev")
+    return {"Gross Margin %": (ttm_gp / ttm_rev * 100) if (ttm_gp and ttm_rev) else None,
+            "Operating Margin %": (ttm_ebit / ttm_rev * 100) if (ttm_ebit and ttm_rev) else None}
+
+
+@metric("roic", ["ROIC % (standardized)"], inputs=["statements"])
+def _m_roic(ctx):
+    return {"ROIC % (standardized)": approx_roic_percent(_stmts(ctx))}
+
+
+@metric("net_debt_ebitda", ["Net Debt / EBITDA"], inputs=["info", "statements"], deps=["_ttm_ebit"])
+def _m_net_debt_ebitda(ctx):
+    stmts = _stmts(ctx)
     net_debt = None
-    if not annual_bs.empty:
-        cash = None;
-        debt = None
-        for k in ["Cash And Cash Equivalents", "CashAndCashEquivalents"]:
-            if k in annual_bs.index: cash = _to_float(annual_bs.loc[k].iloc[0]); break
-        for k in ["Total Debt", "TotalDebt", "Long Term Debt"]:
-            if k in annual_bs.index: debt = _to_float(annual_bs.loc[k].iloc[0]); break
+    if stmts.has("annual_bs"):
+        cash = stmts.latest("annual_bs", "cash")
+        debt = stmts.latest("annual_bs", ("total_debt", "long_term_debt"))
         if cash is not None and debt is not None: net_debt = debt - cash
 
     nd_ebitda = None
-    ebitda = safe_get(info, "ebitda") or (ttm_ebit * 1.15 if ttm_ebit else None)
+    ttm_ebit = ctx.get("_ttm_ebit")
+    ebitda = safe_get(ctx.data("info") or {}, "ebitda") or (ttm_ebit * 1.15 if ttm_ebit else None)
     if net_debt is not None and ebitda and ebitda > 0: nd_ebitda = net_debt / ebitda
+    return {"Net Debt / EBITDA": nd_ebitda}
+
 
+@metric("interest_coverage", ["Interest Coverage (EBIT / Interest)"], inputs=["statements"], deps=["_ttm_ebit"])
+def _m_interest_coverage(ctx):
     int_cov = None
-    int_exp = None
-    for k in ["Interest Expense", "InterestExpense"]:
-        if k in annual_income.index: int_exp = _to_float(annual_income.loc[k].iloc[0]); break
+    int_exp = _stmts(ctx).latest("annual_income", "interest_expense")
+    ttm_ebit = ctx.get("_ttm_ebit")
     if int_exp and ttm_ebit: int_cov = ttm_ebit / abs(int_exp)
+    return {"Interest Coverage (EBIT / Interest)": int_cov}
 
-    shares = safe_get(info, "sharesOutstanding")
+
+@metric("per_share_cagr", ["Revenue per Share CAGR (5Y)", "FCF per Share CAGR (5Y)"], inputs=["info", "statements"])
+def _m_per_share_cagr(ctx):
+    stmts = _stmts(ctx)
+    shares = safe_get(ctx.data("info") or {}, "sharesOutstanding")
     revps_cagr = None
     fcfps_cagr = None
     if shares:
-        revs = annual_series(annual_income, ["Total Revenue", "TotalRevenue"], 5)
+        revs = stmts.annual("annual_income", "total_revenue", 5)
         if len(revs) > 1: revps_cagr = cagr([r / shares if r else None for r in revs])
 
-        ocfs = annual_series(annual_cf, ["Operating Cash Flow", "Total Cash From Operating Activities"], 5)
-        caps = annual_series(annual_cf, ["Capital Expenditure", "CapitalExpenditure"], 5)
+        ocfs = stmts.annual("annual_cf", "operating_cash_flow", 5)
+        caps = stmts.annual("annual_cf", "capital_expenditure", 5)
         if len(ocfs) == len(caps) and len(ocfs) > 1:
             fcfs = [(o + c) for o, c in zip(ocfs, caps) if o is not None and c is not None]
             fcfps_cagr = cagr([f / shares for f in fcfs])
+    return {"Revenue per Share CAGR (5Y)": revps_cagr, "FCF per Share CAGR (5Y)": fcfps_cagr}
+
 
+@metric("max_drawdown", ["Max Drawdown (3–5Y)"], inputs=["prices"])
+def _m_max_drawdown(ctx):
     max_dd = None
-    if not h3y.empty:
-        c = h3y["Close"]
-        max_dd = ((c / c.cummax() - 1).min()) * 100
+    h3y = _prices(ctx).last_years(3)
+    if not h3y.is_empty:
+        c = h3y.close
+        dd = c / np.fmax.accumulate(c) - 1
+        valid = ~np.isnan(dd)
+        if valid.any(): max_dd = float(dd[valid].min()) * 100
+    return {"Max Drawdown (3–5Y)": max_dd}
 
-    # ----------------------------------------------------
-    # NEW: Fetch Benchmark & Calculate Relative Return
-    # ----------------------------------------------------
-    sector_bucket = map_sector(info.get("sector"), info.get("industry"))
-    bench_ticker = get_sector_benchmark(sector_bucket)
-    rel_return_1y = None
 
-    if not h1y.empty:
-        # Define fetcher for benchmark
-        def _get_bench_hist():
-            b_tkr = yf.Ticker(bench_ticker)
-            return _history_retry(bench_ticker, b_tkr, period="1y")
+def metrics_plan(thresholds: Optional[Dict[str, Any]] = None) -> MetricPlan:
+    """Plan for a run: every core metric when `thresholds` is None, else only what scoring + reversal need."""
+    if thresholds is None:
+        return plan_metrics()
+    return plan_metrics(required_metrics(thresholds, REVERSAL_METRICS))
 
-        # Reuse existing cache logic for benchmark history
-        h_bench = ensure_df(_cached_df(f"hist:{bench_ticker}:1y", _get_bench_hist))
 
-        if not h_bench.empty:
-            try:
-                # 1. Stock Return (1Y)
-                # Filter h1y to roughly match benchmark's available range if needed,
-                # but usually 1y fetch is aligned enough.
-                s_start = float(h1y["Close"].iloc[0])
-                s_end = float(h1y["Close"].iloc[-1])
-                s_ret = (s_end - s_start) / s_start * 100.0
-
-                # 2. Benchmark Return (1Y)
-                # Align benchmark start date to stock's start date
-                start_dt = h1y.index[0]
-                b_slice = h_bench.loc[h_bench.index >= start_dt]
-
-                if not b_slice.empty:
-                    b_start = float(b_slice["Close"].iloc[0])
-                    b_end = float(b_slice["Close"].iloc[-1])
-                    b_ret = (b_end - b_start) / b_start * 100.0
-
-                    # 3. Spread
-                    rel_return_1y = s_ret - b_ret
-            except Exception:
-                pass
-
-    metrics = {
-        "Ticker": ticker, "Price": price, "Market Cap": mcap,
-        "Sector Bucket": sector_bucket,
-        "Sector Relative Return (1Y)": rel_return_1y,  # <--- NEW FIELD
-        "P/E (TTM, positive EPS)": pe, "EV/EBIT": ev_ebit, "FCF Yield (TTM FCF / Market Cap)": fcf_yield,
-        "Gross Margin %": gross_m, "Operating Margin %": op_m, "ROIC % (standardized)": roic,
-        "Net Debt / EBITDA": nd_ebitda, "Interest Coverage (EBIT / Interest)": int_cov,
-        "Revenue per Share CAGR (5Y)": revps_cagr, "FCF per Share CAGR (5Y)": fcfps_cagr,
-        "Max Drawdown (3–5Y)": max_dd,
-        "__yf_bundle__": {
-            "info": info,
-            "h10": h10, "h2y": h2y, "h1y": h1y,
-            "q_income": q_income, "q_cf": q_cf, "annual_bs": annual_bs,
-            "annual_income": annual_income, "annual_cf": annual_cf
-        },
-        "__notes__": {}
+def compute_metrics_from_pack(ticker: str, pack: Dict[str, Any], plan: Optional[MetricPlan] = None) -> Dict[str, Any]:
+    """Pure metric math on a packed bundle (no network, no DataFrames). Evaluates only the plan's metrics."""
+    values, notes = evaluate_metrics(plan or metrics_plan(), pack)
+    return {"Ticker": ticker, **values, "__notes__": notes}
+
+
+def compute_metrics_v2(ticker: str, use_fmp_fallback: bool = True, *, fmp_mode: str = "full",
+                       use_yf_cache: Optional[bool] = None) -> Dict[str, Any]:
+    raw = fetch_ticker_data(ticker, use_fmp_fallback, fmp_mode=fmp_mode, use_yf_cache=use_yf_cache)
+    pack = pack_ticker_data(raw)
+    metrics = compute_metrics_from_pack(ticker, pack)
+
+    h10 = raw["h10"]
+    try:
+        h2y = h10.loc[h10.index >= (h10.index.max() - pd.DateOffset(years=2))].copy()
+    except:
+        h2y = pd.DataFrame()
+    try:
+        h1y = h10.loc[h10.index >= (h10.index.max() - pd.DateOffset(years=1))].copy()
+    except:
+        h1y = pd.DataFrame()
+
+    metrics["__yf_bundle__"] = {
+        "info": raw["info"],
+        "h10": h10, "h2y": h2y, "h1y": h1y,
+        "q_income": raw["q_income"], "q_cf": raw["q_cf"], "annual_bs": raw["annual_bs"],
+        "annual_income": raw["annual_income"], "annual_cf": raw["annual_cf"],
+        "statements": pack["statements"], "prices": pack["prices"],
     }
-    return metrics
\ No newline at end of file
+    return metrics
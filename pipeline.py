@@ -0,0 +1,129 @@
+"""Bounded-queue stage pipeline.
+
+Each Stage runs `workers` threads that take items from the queue before it,
+apply `fn` and put the result (unless None) on the queue after it. Queues hold
+at most `maxsize` items, so a fast stage blocks instead of buffering the whole
+universe in memory, and all stages overlap: wall-clock time approaches that of
+the slowest stage rather than the sum of all of them.
+
+The sink runs on the calling thread (so it may touch Tk widgets or a
+single-threaded writer). The first exception raised by a stage function or
+the sink stops every stage and is re-raised from run_stages().
+
+Env vars (optional):
+  PIPELINE_QUEUE=32        # max items waiting between two stages
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional
+
+from cache_utils import _safe_int
+
+_DONE = object()
+_POLL = 0.1
+
+
+def queue_size_setting() -> int:
+    return max(1, _safe_int(os.environ.get("PIPELINE_QUEUE", "32"), default=32))
+
+
+class Stage:
+    """One pipeline step: `fn(item) -> result or None` on `workers` threads."""
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1):
+        self.name, self.fn, self.workers = name, fn, max(1, int(workers))
+
+
+class _Run:
+    def __init__(self):
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def fail(self, e: BaseException) -> None:
+        with self._lock:
+            if self.error is None:
+                self.error = e
+        self.stop.set()
+
+    def put(self, q: "queue.Queue", item: Any) -> bool:
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self, q: "queue.Queue") -> Any:
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                pass
+        return _DONE
+
+
+def _feed(run: _Run, source: Iterable[Any], out: "queue.Queue") -> None:
+    try:
+        for item in source:
+            if not run.put(out, item):
+                return
+    except BaseException as e:
+        run.fail(e)
+    finally:
+        run.put(out, _DONE)
+
+
+def _work(run: _Run, stage: Stage, inq: "queue.Queue", out: "queue.Queue", remaining: List[int],
+          lock: threading.Lock) -> None:
+    try:
+        while True:
+            item = run.get(inq)
+            if item is _DONE:
+                run.put(inq, _DONE)  # let the sibling workers see it too
+                return
+            result = stage.fn(item)
+            if result is not None and not run.put(out, result):
+                return
+    except BaseException as e:
+        run.fail(e)
+    finally:
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            run.put(out, _DONE)
+
+
+def run_stages(source: Iterable[Any], stages: List[Stage], sink: Callable[[Any], None],
+               maxsize: Optional[int] = None) -> None:
+    """Push `source` through `stages` and hand every final result to `sink` (on this thread)."""
+    maxsize = maxsize or queue_size_setting()
+    run = _Run()
+    queues = [queue.Queue(maxsize) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_feed, args=(run, source, queues[0]), name="pipeline-source", daemon=True)]
+    for i, stage in enumerate(stages):
+        remaining, lock = [stage.workers], threading.Lock()
+        threads += [threading.Thread(target=_work, args=(run, stage, queues[i], queues[i + 1], remaining, lock),
+                                     name=f"pipeline-{stage.name}-{n}", daemon=True)
+                    for n in range(stage.workers)]
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            item = run.get(queues[-1])
+            if item is _DONE:
+                break
+            sink(item)
+    except BaseException as e:
+        run.fail(e)
+    finally:
+        for t in threads:
+            t.join()
+    if run.error is not None:
+        raise run.error
@@ -0,0 +1,85 @@
+"""Fetch thread-pool sizing from cache warmth, cores and the Yahoo HTTP limit.
+
+A fully cached run only unpickles and scores, so it is CPU-bound and more
+threads than cores just contend for the GIL. A cold run mostly waits on Yahoo,
+so it wants enough threads to keep YF_HTTP_CONCURRENCY requests in flight
+while other threads parse. fetch_pool_size() stats the yf disk cache for an
+evenly spaced sample of the tickers to fetch and interpolates between the two
+by the hit ratio. The decision is printed with its inputs so runs can be
+compared.
+
+Env vars (optional):
+  FETCH_WORKERS=auto        # or a fixed fetch thread count (cli.py --workers overrides both)
+  FETCH_WARMUP_SAMPLE=24    # tickers probed for the cache-hit ratio
+  YF_MAX_WORKERS=           # upper bound on auto-sized fetch threads (default: 2 x YF_HTTP_CONCURRENCY)
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from cache_utils import _safe_int, yf_http_concurrency
+from metrics import yf_cache_hit
+
+
+def fetch_workers_setting() -> Optional[int]:
+    """FETCH_WORKERS as a fixed count, or None for auto sizing."""
+    raw = (os.environ.get("FETCH_WORKERS", "auto") or "auto").strip().lower()
+    n = _safe_int(raw, default=0) if raw != "auto" else 0
+    return n if n > 0 else None
+
+
+def warmup_sample_setting() -> int:
+    return max(1, _safe_int(os.environ.get("FETCH_WARMUP_SAMPLE", "24"), default=24))
+
+
+def max_workers_setting(http_limit: int) -> int:
+    return max(1, _safe_int(os.environ.get("YF_MAX_WORKERS", ""), default=2 * http_limit))
+
+
+@dataclass(frozen=True)
+class PoolSize:
+    workers: int
+    source: str  # "auto", "FETCH_WORKERS" or "override"
+    hits: int = 0
+    sampled: int = 0
+    cores: int = 0
+    http_limit: int = 0
+    cap: int = 0
+
+    def describe(self) -> str:
+        if self.source != "auto":
+            return f"Fetch workers: {self.workers} ({self.source})"
+        ratio = self.hits / self.sampled if self.sampled else 0.0
+        return (f"Fetch workers: {self.workers} (auto: cache hits {self.hits}/{self.sampled} = {ratio:.0%}, "
+                f"{self.cores} cores, YF_HTTP_CONCURRENCY {self.http_limit}, cap {self.cap})")
+
+
+def _sample(tickers: Sequence[str], size: int) -> Sequence[str]:
+    if len(tickers) <= size:
+        return tickers
+    step = len(tickers) / size
+    return [tickers[int(i * step)] for i in range(size)]
+
+
+def fetch_pool_size(tickers: Sequence[str], override: Optional[int] = None) -> PoolSize:
+    """Fetch threads for `tickers`: `override`, else FETCH_WORKERS, else sized from a cache warm-up sample."""
+    if override is not None:
+        return PoolSize(max(1, int(override)), "override")
+    fixed = fetch_workers_setting()
+    if fixed is not None:
+        return PoolSize(fixed, "FETCH_WORKERS")
+
+    sample = _sample(list(tickers), warmup_sample_setting())
+    hits = sum(1 for t in sample if yf_cache_hit(t))
+    cold_share = 1.0 - hits / len(sample) if sample else 1.0
+    cores = os.cpu_count() or 1
+    http_limit = yf_http_concurrency()
+    cap = max_workers_setting(http_limit)
+    warm = max(2, min(cores, 4))
+    cold = max(warm, 2 * http_limit)
+    workers = round(warm + cold_share * (cold - warm))
+    workers = max(1, min(workers, cap, len(tickers) or 1))
+    return PoolSize(workers, "auto", hits, len(sample), cores, http_limit, cap)
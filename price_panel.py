@@ -0,0 +1,117 @@
+"""Shared-memory price panel for compute worker processes.
+
+The parent copies every ticker's PriceHistory (and the sector benchmark
+histories) once into a single `multiprocessing.shared_memory` block laid out
+as three contiguous columns: dates | close | adj_close. Workers attach by name
+and get zero-copy PriceHistory views by ticker offset, so memory stays at one
+copy of the price data no matter how many workers run, and nothing but a small
+offset index crosses the process boundary.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from prices import PriceHistory
+
+_ROW_BYTES = 8 * 3  # int64 date + float64 close + float64 adj_close
+
+
+def ticker_key(ticker: str) -> str:
+    return f"T:{ticker}"
+
+
+def bench_key(ticker: str) -> str:
+    return f"B:{ticker}"
+
+
+@dataclass(frozen=True)
+class PanelHandle:
+    """Picklable description of a panel: shared block name, row count and per-key (offset, length, tz)."""
+    name: str
+    total: int
+    index: Dict[str, Tuple[int, int, Optional[str]]]
+
+
+def _columns(buf, total: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    dates = np.ndarray((total,), dtype=np.int64, buffer=buf, offset=0)
+    close = np.ndarray((total,), dtype=np.float64, buffer=buf, offset=8 * total)
+    adj = np.ndarray((total,), dtype=np.float64, buffer=buf, offset=16 * total)
+    return dates, close, adj
+
+
+class _PanelBase:
+    def __init__(self, shm: shared_memory.SharedMemory, handle: PanelHandle):
+        self._shm = shm
+        self.handle = handle
+        self._dates, self._close, self._adj = _columns(shm.buf, handle.total)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.handle.index
+
+    def get(self, key: str) -> PriceHistory:
+        """Zero-copy PriceHistory view for a key (empty history if unknown)."""
+        loc = self.handle.index.get(key)
+        if loc is None:
+            return PriceHistory.empty()
+        off, n, tz = loc
+        return PriceHistory(self._dates[off:off + n], self._close[off:off + n], self._adj[off:off + n], tz)
+
+    def close(self) -> None:
+        # Views must be released before the mapping can be closed.
+        self._dates = self._close = self._adj = None
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+
+
+class SharedPricePanel(_PanelBase):
+    """Parent-side owner of the shared block. Use as a context manager so it is always unlinked."""
+
+    @classmethod
+    def build(cls, histories: Dict[str, PriceHistory]) -> "SharedPricePanel":
+        index: Dict[str, Tuple[int, int, Optional[str]]] = {}
+        total = 0
+        for key, h in histories.items():
+            n = len(h) if h is not None else 0
+            index[key] = (total, n, h.tz if h is not None else None)
+            total += n
+
+        shm = shared_memory.SharedMemory(create=True, size=max(1, total * _ROW_BYTES))
+        panel = cls(shm, PanelHandle(name=shm.name, total=total, index=index))
+        for key, h in histories.items():
+            off, n, _ = index[key]
+            if n:
+                panel._dates[off:off + n] = h.dates
+                panel._close[off:off + n] = h.close
+                panel._adj[off:off + n] = h.adj_close
+        return panel
+
+    def unlink(self) -> None:
+        try:
+            self._shm.unlink()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "SharedPricePanel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        self.unlink()
+
+
+class AttachedPricePanel(_PanelBase):
+    """Worker-side read-only view of a SharedPricePanel."""
+
+    @classmethod
+    def attach(cls, handle: PanelHandle) -> "AttachedPricePanel":
+        # Pool workers share the parent's resource tracker, so attaching does not
+        # transfer ownership; the parent unlinks the block when the run ends.
+        shm = shared_memory.SharedMemory(name=handle.name)
+        return cls(shm, handle)
@@ -0,0 +1,101 @@
+"""Compact daily price history.
+
+yfinance history frames are converted once into three flat arrays (UTC
+nanosecond timestamps, Close, Adj Close). They pickle in a fraction of the
+size of a DataFrame, which matters when the compute stage runs in worker
+processes, and the look-back windows (1Y/2Y/3Y) become cheap array slices.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class PriceHistory:
+    dates: np.ndarray       # int64 UTC nanoseconds, ascending
+    close: np.ndarray       # float64
+    adj_close: np.ndarray   # float64 (equals close when the source had no Adj Close)
+    tz: Optional[str] = None
+
+    @classmethod
+    def empty(cls) -> "PriceHistory":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=float), np.empty(0, dtype=float))
+
+    @classmethod
+    def from_frame(cls, hist: Optional[pd.DataFrame]) -> "PriceHistory":
+        if hist is None or getattr(hist, "empty", True):
+            return cls.empty()
+        df = hist
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.copy()
+            df.columns = df.columns.get_level_values(0)
+
+        def _col(name: str) -> Optional[np.ndarray]:
+            if name not in df.columns:
+                return None
+            c = df[name]
+            if isinstance(c, pd.DataFrame):
+                c = c.iloc[:, 0]
+            return np.asarray(pd.to_numeric(c, errors="coerce"), dtype=float)
+
+        close = _col("Close")
+        if close is None:
+            return cls.empty()
+        adj = _col("Adj Close")
+
+        idx = pd.DatetimeIndex(df.index)
+        tz = str(idx.tz) if idx.tz is not None else None
+        if tz is not None:
+            idx = idx.tz_convert("UTC").tz_localize(None)
+        dates = idx.values.astype("datetime64[ns]").view(np.int64)
+        adj = adj if adj is not None else close
+        if dates.size > 1 and np.any(np.diff(dates) < 0):
+            order = np.argsort(dates, kind="stable")
+            dates, close, adj = dates[order], close[order], adj[order]
+        return cls(dates, close, adj, tz)
+
+    def __len__(self) -> int:
+        return int(self.dates.size)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.dates.size == 0
+
+    def timestamp(self, ns: int) -> pd.Timestamp:
+        ts = pd.Timestamp(int(ns))
+        return ts.tz_localize("UTC").tz_convert(self.tz) if self.tz else ts
+
+    def _cutoff_ns(self, start: pd.Timestamp) -> int:
+        if start.tzinfo is not None:
+            start = start.tz_convert("UTC").tz_localize(None)
+        return int(start.value)
+
+    def since(self, start: pd.Timestamp) -> "PriceHistory":
+        """Rows with date >= start (same rule as `df.loc[df.index >= start]`).
+
+        Dates are ascending, so this is a slice (a view, never a copy).
+        """
+        if self.is_empty:
+            return self
+        i = int(np.searchsorted(self.dates, self._cutoff_ns(start), side="left"))
+        return PriceHistory(self.dates[i:], self.close[i:], self.adj_close[i:], self.tz)
+
+    def last_years(self, years: int) -> "PriceHistory":
+        """Window ending at the latest bar, like `h.index.max() - pd.DateOffset(years=n)`."""
+        if self.is_empty:
+            return self
+        return self.since(self.timestamp(self.dates[-1]) - pd.DateOffset(years=years))
+
+    def first_timestamp(self) -> Optional[pd.Timestamp]:
+        return None if self.is_empty else self.timestamp(self.dates[0])
+
+    def close_series(self, adjusted: bool = False) -> pd.Series:
+        """Closing prices (NaN dropped) as a plain Series for rolling-window math."""
+        vals = self.adj_close if adjusted else self.close
+        s = pd.Series(vals, dtype=float)
+        return s.dropna().reset_index(drop=True)
@@ -0,0 +1,94 @@
+"""Bounded top-N ranking of screen results.
+
+In ranked mode the screen reports only the best N qualifying tickers by a
+composite of avg fund score, reversal total and coverage. Results are offered
+to a TopK heap as they stream in from the compute stage, so the report set is
+known as soon as the last result arrives and its size stays bounded regardless
+of universe size. The scalar results of every scored ticker are still kept
+and persisted, so a rescore, the history and shard merges see all of them.
+
+Env vars (optional):
+  TOP_N=0                                        # >0: ranked mode, report only the best N
+  RANK_WEIGHTS=fund=0.5,reversal=0.3,coverage=0.2
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cache_utils import _safe_float, _safe_int
+
+DEFAULT_WEIGHTS = {"fund": 0.5, "reversal": 0.3, "coverage": 0.2}
+
+
+def top_n_setting() -> int:
+    return max(0, _safe_int(os.environ.get("TOP_N", "0"), default=0))
+
+
+def rank_weights_setting() -> Dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in (os.environ.get("RANK_WEIGHTS") or "").split(","):
+        name, _, val = part.partition("=")
+        name = name.strip().lower()
+        if name in weights and val.strip():
+            weights[name] = _safe_float(val.strip(), default=weights[name])
+    return weights
+
+
+def composite_score(card, weights: Optional[Dict[str, float]] = None) -> float:
+    """Weighted blend of a ScoreCard's avg fund score, reversal total and coverage (all 0-100)."""
+    w = weights or DEFAULT_WEIGHTS
+    return (w.get("fund", 0.0) * float(card.avg_fund_score or 0.0)
+            + w.get("reversal", 0.0) * float(card.reversal_total or 0.0)
+            + w.get("coverage", 0.0) * float(card.avg_coverage or 0.0))
+
+
+class _Entry:
+    __slots__ = ("score", "key", "item")
+
+    def __init__(self, score: float, key: str, item: Any):
+        self.score, self.key, self.item = score, key, item
+
+    def __lt__(self, other: "_Entry") -> bool:
+        # Heap top = worst entry: lowest score; on ties the later ticker (alphabetically) ranks lower,
+        # so the result does not depend on completion order.
+        return (self.score, other.key) < (other.score, self.key)
+
+
+class TopK:
+    """Min-heap holding the best `k` (key, score, item) entries seen so far."""
+
+    def __init__(self, k: int):
+        self.k = max(0, int(k))
+        self._heap: List[_Entry] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: str) -> bool:
+        return any(e.key == key for e in self._heap)
+
+    def offer(self, key: str, score: float, item: Any = None) -> Optional[str]:
+        """Add an entry. Returns the key that is no longer retained (this one or an evicted one), or None."""
+        entry = _Entry(float(score), key, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return None
+        if not self._heap or not (self._heap[0] < entry):
+            return key
+        return heapq.heapreplace(self._heap, entry).key
+
+    def ranked(self) -> List[Tuple[str, float, Any]]:
+        """Retained entries, best first."""
+        return [(e.key, e.score, e.item) for e in sorted(self._heap, reverse=True)]
+
+
+def rank_candidates(tickers: Sequence[str], scorecards: Dict[str, Any], n: int,
+                    weights: Optional[Dict[str, float]] = None) -> List[str]:
+    """Best `n` of already-selected tickers by composite score, best first."""
+    top = TopK(n)
+    for t in tickers:
+        top.offer(t, composite_score(scorecards[t], weights))
+    return [k for k, _, _ in top.ranked()]
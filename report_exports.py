@@ -0,0 +1,107 @@
+"""Plain-data report outputs (CSV / Parquet / JSON Lines / HTML).
+
+Machine consumers only need the numbers, so these writers skip the styled
+workbook (no per-cell formatting, no xlsx serialization). They render the same
+ScoreCards as the workbook into two tables:
+
+  summary   one row per reported ticker (scores, coverage, recommendation)
+  ratings   one row per (ticker, category, metric): value and rating colour
+
+Each format writes `<stem>_summary.<ext>` and `<stem>_ratings.<ext>`; "html"
+writes a single compact summary page. Parquet needs pyarrow or fastparquet;
+callers check parquet_supported() and leave it out (with a notice) otherwise.
+
+Env vars (optional):
+  REPORT_FORMATS=xlsx      # comma-separated: xlsx, csv, parquet, jsonl, html
+"""
+
+from __future__ import annotations
+
+import html
+import importlib.util
+import os
+from typing import Any, Dict, List, Sequence
+
+import pandas as pd
+
+from scorecard import CATEGORY_MAPS, ScoreCard
+
+FORMATS = ("xlsx", "csv", "parquet", "jsonl", "html")
+
+_HTML_STYLE = ("<style>body{font-family:sans-serif;font-size:13px}table{border-collapse:collapse}"
+               "th,td{border:1px solid #ccc;padding:2px 6px;text-align:right}th{background:#1F4E78;color:#fff}"
+               "td:nth-child(-n+2),td:nth-child(8){text-align:left}</style>")
+
+
+def report_formats_setting() -> List[str]:
+    raw = (os.environ.get("REPORT_FORMATS") or "xlsx").lower()
+    formats = [f for f in dict.fromkeys(s.strip() for s in raw.split(",")) if f in FORMATS]
+    return formats or ["xlsx"]
+
+
+def parquet_supported() -> bool:
+    """True when pandas has a Parquet engine (pyarrow or fastparquet) to write with."""
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+
+def summary_frame(tickers: Sequence[str], scorecards: Dict[str, ScoreCard]) -> pd.DataFrame:
+    rows = []
+    for t in tickers:
+        card = scorecards[t]
+        rev = card.reversal
+        row = {"ticker": t, "sector_bucket": card.sector_bucket, "avg_fund_score": card.avg_fund_score,
+               "reversal_score": card.reversal_total, "fund_score_pct": rev.get("fund_score_pct"),
+               "tech_score_pct": rev.get("tech_score_pct"), "coverage_pct": card.avg_coverage,
+               "recommendation": card.recommendation, "status": card.status,
+               "eligibility": card.eligibility.status if card.eligibility is not None else None}
+        for display in CATEGORY_MAPS.values():
+            row[display.lower()] = card.cat_scores.get(display)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def ratings_frame(tickers: Sequence[str], metrics_by_ticker: Dict[str, Dict[str, Any]],
+                  scorecards: Dict[str, ScoreCard]) -> pd.DataFrame:
+    rows = []
+    for t in tickers:
+        card, m = scorecards[t], metrics_by_ticker.get(t) or {}
+        for cat_sheet, cat_display in CATEGORY_MAPS.items():
+            for metric, rating in card.ratings.get(cat_sheet, {}).items():
+                rows.append((t, card.sector_bucket, cat_display, metric, m.get(metric), rating))
+    df = pd.DataFrame(rows, columns=["ticker", "sector_bucket", "category", "metric", "value", "rating"])
+    df["value"] = pd.to_numeric(df["value"], errors="coerce")
+    return df
+
+
+def _summary_html(df: pd.DataFrame, title: str) -> str:
+    table = df.to_html(index=False, na_rep="", float_format=lambda v: f"{v:.1f}", border=0)
+    return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            f"{_HTML_STYLE}</head><body><h3>{html.escape(title)}</h3>{table}</body></html>")
+
+
+def write_exports(formats: Sequence[str], tickers: Sequence[str], metrics_by_ticker: Dict[str, Dict[str, Any]],
+                  scorecards: Dict[str, ScoreCard], out_stem: str) -> List[str]:
+    """Write the non-xlsx `formats` for `tickers`; returns the written paths."""
+    formats = [f for f in formats if f != "xlsx"]
+    if not formats:
+        return []
+    summary = summary_frame(tickers, scorecards)
+    ratings = ratings_frame(tickers, metrics_by_ticker, scorecards) if set(formats) - {"html"} else None
+    paths: List[str] = []
+    for fmt in formats:
+        if fmt == "html":
+            path = f"{out_stem}_summary.html"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_summary_html(summary, os.path.basename(out_stem)))
+            paths.append(path)
+            continue
+        for name, df in (("summary", summary), ("ratings", ratings)):
+            path = f"{out_stem}_{name}.{fmt}"
+            if fmt == "csv":
+                df.to_csv(path, index=False, encoding="utf-8-sig")  # BOM so Excel reads the banners
+            elif fmt == "jsonl":
+                df.to_json(path, orient="records", lines=True)
+            elif fmt == "parquet":
+                df.to_parquet(path, index=False)
+            paths.append(path)
+    return paths
@@ -0,0 +1,125 @@
+"""Sharded report output for large result sets.
+
+Instead of one workbook with hundreds of ticker sheets, the report is split
+into a lightweight index workbook (Summary + Cheat Sheet) at the requested
+path and N detail workbooks next to it, one per sector bucket or per fixed
+number of tickers:
+
+  Filtered_Report_Strict_<ts>.xlsx              index; ticker cells link to the detail sheet
+  Filtered_Report_Strict_<ts>_Technology.xlsx   detail workbooks (sector mode)
+  Filtered_Report_Strict_<ts>_part01.xlsx       detail workbooks (count mode)
+
+Detail workbooks are independent, so with REPORT_SHARD_PROCESSES they are
+written in worker processes and total write time scales with cores rather than
+ticker count. The default writes them in-process: the compute stage
+(COMPUTE_PROCESSES) may already own a process pool.
+
+Env vars (optional):
+  REPORT_SHARDS=              # "sector", or N>0 tickers per detail workbook; empty/0 = single workbook
+  REPORT_SHARD_PROCESSES=0    # processes writing detail workbooks (0/1 = in-process)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from openpyxl import Workbook
+
+from cache_utils import _safe_int
+from report_writer import (_format_summary, _render_cheat_sheet, _render_summary_header, _render_ticker_sheet,
+                           _summary_row, register_report_styles)
+from scorecard import ScoreCard
+from sheet_buffer import SheetBuffer
+
+ShardBy = Union[str, int]
+
+
+def shard_setting() -> Optional[ShardBy]:
+    raw = (os.environ.get("REPORT_SHARDS") or "").strip().lower()
+    if raw == "sector":
+        return "sector"
+    n = _safe_int(raw, default=0) if raw else 0
+    return n if n > 0 else None
+
+
+def shard_processes_setting() -> int:
+    return max(0, _safe_int(os.environ.get("REPORT_SHARD_PROCESSES", "0"), default=0))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text or "").strip("_") or "Other"
+
+
+def plan_shards(tickers: List[str], scorecards: Dict[str, ScoreCard], shard_by: ShardBy) -> List[Tuple[str, List[str]]]:
+    """(label, tickers) per detail workbook; ticker order is preserved within a shard."""
+    if shard_by == "sector":
+        groups: Dict[str, List[str]] = {}
+        for t in tickers:
+            groups.setdefault(_slug(scorecards[t].sector_bucket), []).append(t)
+        return sorted(groups.items())
+    size = max(1, int(shard_by))
+    chunks = [tickers[i:i + size] for i in range(0, len(tickers), size)]
+    width = max(2, len(str(len(chunks))))
+    return [(f"part{i:0{width}d}", chunk) for i, chunk in enumerate(chunks, 1)]
+
+
+def shard_path(out_path: str, label: str) -> str:
+    stem, ext = os.path.splitext(out_path)
+    return f"{stem}_{label}{ext or '.xlsx'}"
+
+
+def _write_shard(path: str, tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                 metrics_by_ticker: Dict[str, Dict[str, Any]], scorecards: Dict[str, ScoreCard],
+                 write_only: bool) -> str:
+    wb = Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)
+    register_report_styles(wb)
+    for t in tickers:
+        buf = SheetBuffer(t)
+        _render_ticker_sheet(buf, t, metrics_by_ticker.get(t, {}), scorecards[t], thresholds)
+        buf.flush(wb.create_sheet(t))
+    wb.save(path)
+    return path
+
+
+def _write_index(out_path: str, shards: List[Tuple[str, List[str]]], scorecards: Dict[str, ScoreCard],
+                 target_threshold: float) -> None:
+    wb = Workbook()
+    wb.remove(wb.active)
+    register_report_styles(wb)
+    summary = SheetBuffer("Summary")
+    _render_summary_header(summary, ("Workbook",))
+    for label, tickers in shards:
+        name = os.path.basename(shard_path(out_path, label))
+        for t in tickers:
+            summary.append(_summary_row(t, scorecards[t]) + [name])
+            c = summary.cell(summary.max_row, 1)
+            c.hyperlink, c.style = f"{name}#'{t}'!A1", "Hyperlink"
+    _format_summary(summary, summary.max_row - 1)
+    summary.flush(wb.create_sheet("Summary"))
+    cheat = SheetBuffer("Cheat Sheet")
+    _render_cheat_sheet(cheat, target_threshold)
+    cheat.flush(wb.create_sheet("Cheat Sheet"))
+    wb.save(out_path)
+
+
+def write_sharded_report(tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                         metrics_by_ticker: Dict[str, Dict[str, Any]], scorecards: Dict[str, ScoreCard],
+                         out_path: str, target_threshold: float, shard_by: ShardBy,
+                         processes: Optional[int] = None, write_only: bool = False) -> List[str]:
+    """Write the index workbook at `out_path` plus one detail workbook per shard; returns all paths."""
+    shards = plan_shards(list(tickers), scorecards, shard_by)
+    jobs = [(shard_path(out_path, label), ts, thresholds, {t: metrics_by_ticker.get(t, {}) for t in ts},
+             {t: scorecards[t] for t in ts}, write_only) for label, ts in shards]
+    processes = min(processes if processes is not None else shard_processes_setting(), len(jobs))
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            paths = list(pool.map(_write_shard, *zip(*jobs)))
+    else:
+        paths = [_write_shard(*job) for job in jobs]
+    _write_index(out_path, shards, scorecards, target_threshold)
+    return [out_path] + paths
@@ -1,19 +1,26 @@
 from typing import Any, Dict, List, Optional, Tuple
-import math
+from copy import copy
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import zipfile
 from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, Alignment
-from config import FILL_HDR, FONT_HDR, ALIGN_CENTER, ALIGN_WRAP, FILL_GREEN, FILL_YELLOW, FILL_RED, FILL_GRAY
-from checklist_loader import get_threshold_set, parse_range_cell
-from scoring import score_with_threshold_txt, compute_category_score_and_coverage, adjusted_from_raw_and_coverage
-
-WHITELIST = {
-    "P/E (TTM, positive EPS)", "EV/EBIT", "FCF Yield (TTM FCF / Market Cap)",
-    "Gross Margin %", "Operating Margin %", "ROIC % (standardized)",
-    "Net Debt / EBITDA", "Interest Coverage (EBIT / Interest)",
-    "Revenue per Share CAGR (5Y)", "FCF per Share CAGR (5Y)",
-    "Market Cap", "Max Drawdown (3–5Y)"
-}
+from openpyxl.reader.strings import read_string_table
+from openpyxl.reader.workbook import WorkbookParser
+from openpyxl.styles.stylesheet import apply_stylesheet
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet._reader import WorkSheetParser
+from openpyxl.xml.constants import ARC_SHARED_STRINGS, ARC_WORKBOOK
+from openpyxl.formatting.rule import CellIsRule, FormulaRule
+from openpyxl.styles import Font, NamedStyle, PatternFill
+from openpyxl.styles.fonts import DEFAULT_FONT
+from config import FILL_HDR, FONT_HDR, ALIGN_CENTER, FILL_GREEN, FILL_YELLOW, FILL_RED, FILL_GRAY
+from checklist_loader import get_threshold_set
+from scorecard import CATEGORY_MAPS, ScoreCard, build_scorecards
+from sheet_buffer import SheetBuffer
 
 
 def _apply_metric_value_format(cell, metric: str, val: Any):
@@ -34,63 +41,73 @@ def reversal_fill(score: Optional[float]):
     return FILL_GREEN if score >= 70.0 else (FILL_YELLOW if score >= 50.0 else FILL_RED)
 
 
-def _limits_text(th: Optional[Dict[str, Any]]) -> str:
-    if not th: return ""
-    return " | ".join(
-        [f"{p}:{th.get(k)}" for k, p in [("green_txt", "G"), ("yellow_txt", "Y"), ("red_txt", "R")] if th.get(k)])
+# Named styles are registered once per workbook and cells refer to them by name. Assigning
+# Fill/Font objects cell by cell makes openpyxl hash every object on every assignment.
+STYLE_HEADER = "Report Header"
+STYLE_HEADER_CENTER = "Report Header Centered"
+STYLE_TITLE = "Report Title"
+STYLE_SECTION = "Report Section"
+STYLE_BOLD = "Report Bold"
+FILL_STYLES = {"GREEN": "Report Green", "YELLOW": "Report Yellow", "RED": "Report Red", "NA": "Report Gray"}
+_FILLS_BY_STYLE = ((FILL_GREEN, FILL_STYLES["GREEN"]), (FILL_YELLOW, FILL_STYLES["YELLOW"]),
+                   (FILL_RED, FILL_STYLES["RED"]), (FILL_GRAY, FILL_STYLES["NA"]))
 
 
-def _metric_weight(metric: str) -> float:
-    if metric in ["EV/EBIT", "FCF Yield (TTM FCF / Market Cap)", "ROIC % (standardized)"]: return 2.0
-    return 1.5 if metric == "Net Debt / EBITDA" else 1.0
+def _report_named_styles() -> List[NamedStyle]:
+    return [NamedStyle(STYLE_HEADER, fill=FILL_HDR, font=FONT_HDR),
+            NamedStyle(STYLE_HEADER_CENTER, fill=FILL_HDR, font=FONT_HDR, alignment=ALIGN_CENTER),
+            NamedStyle(STYLE_TITLE, font=Font(size=14, bold=True)),
+            NamedStyle(STYLE_SECTION, font=Font(size=12, bold=True)),
+            NamedStyle(STYLE_BOLD, font=Font(bold=True))] + [NamedStyle(name, fill=fill, font=copy(DEFAULT_FONT))
+                                                             for fill, name in _FILLS_BY_STYLE]
 
 
-def final_recommendation_banner(cat_scores: Dict[str, Optional[float]], reversal_total: Optional[float],
-                                threshold: float) -> Tuple[str, Any]:
-    scores = {k: (v if v is not None else 0.0) for k, v in cat_scores.items()}
-    rev = reversal_total if reversal_total is not None else 0.0
+def register_report_styles(wb: Workbook) -> None:
+    existing = set(wb.named_styles)
+    for ns in _report_named_styles():
+        if ns.name not in existing:
+            wb.add_named_style(ns)
 
-    # Fundamental pass: All 5 categories >= threshold
-    all_fund_pass = all(s >= threshold for s in scores.values())
 
-    if all_fund_pass and rev >= threshold:
-        return (f"✅ STRONG BUY ({int(threshold)}% Threshold)", FILL_GREEN)
+def _fill_style(fill) -> str:
+    # Band/recommendation helpers return the config fill objects themselves, so identity is enough.
+    for f, name in _FILLS_BY_STYLE:
+        if fill is f:
+            return name
+    return FILL_STYLES["NA"]
 
-    # Watch logic: Fundamental quality is high, technicals are low
-    if all_fund_pass and rev < threshold:
-        return (f"⚠ WATCH ({int(threshold)}% Fund. Pass)", FILL_YELLOW)
 
-    if any(s < 30 for s in scores.values()):
-        return ("❌ AVOID — Significant Fundamental Risks", FILL_RED)
+def _cf_fill(fill) -> PatternFill:
+    # Conditional-format (dxf) fills take their colour from bgColor.
+    color = fill.fgColor.rgb
+    return PatternFill("solid", fgColor=color, bgColor=color)
 
-    return ("⚠ HOLD / NEUTRAL", FILL_YELLOW)
 
+def _add_band_rules(ws, rng: str, green_at: float, yellow_at: float) -> None:
+    """Score bands as conditional formatting (same cut-offs as band_fill / reversal_fill)."""
+    first = rng.split(":")[0]
+    ws.conditional_formatting.add(rng, FormulaRule(formula=[f"ISBLANK({first})"], fill=_cf_fill(FILL_GRAY),
+                                                   stopIfTrue=True))
+    ws.conditional_formatting.add(rng, CellIsRule(operator="greaterThanOrEqual", formula=[str(green_at)],
+                                                  fill=_cf_fill(FILL_GREEN), stopIfTrue=True))
+    ws.conditional_formatting.add(rng, CellIsRule(operator="greaterThanOrEqual", formula=[str(yellow_at)],
+                                                  fill=_cf_fill(FILL_YELLOW), stopIfTrue=True))
+    ws.conditional_formatting.add(rng, CellIsRule(operator="lessThan", formula=[str(yellow_at)],
+                                                  fill=_cf_fill(FILL_RED), stopIfTrue=True))
 
-def _normalize_reversal_pack(revpack: Dict[str, Any]) -> Dict[str, Any]:
-    if not isinstance(revpack, dict): revpack = {}
-    fs = revpack.get("fund_score_pct") or revpack.get("fundamental_score")
-    ts = revpack.get("tech_score_pct") or revpack.get("technical_score")
-    total = revpack.get("total_score_pct")
-    if total is None and fs is not None and ts is not None:
-        total = 0.6 * float(fs) + 0.4 * float(ts)
-    return {
-        "fund_symbols": revpack.get("fund_symbols", {}) or revpack.get("fundamental_symbols", {}),
-        "tech_symbols": revpack.get("tech_symbols", {}) or revpack.get("technical_symbols", {}),
-        "fund_details": revpack.get("fund_details", {}) or revpack.get("fundamental", {}),
-        "tech_details": revpack.get("tech_details", {}) or revpack.get("technical", {}),
-        "fund_score_pct": fs, "tech_score_pct": ts, "total_score_pct": total,
-    }
+
+def _limits_text(th: Optional[Dict[str, Any]]) -> str:
+    if not th: return ""
+    return " | ".join(
+        [f"{p}:{th.get(k)}" for k, p in [("green_txt", "G"), ("yellow_txt", "Y"), ("red_txt", "R")] if th.get(k)])
 
 
 def _write_reversal_block(ws, start_row: int, title: str, symbols: Dict[str, str], details: Dict[str, Tuple[int, str]],
                           score: Optional[float]) -> int:
     ws[f"A{start_row}"] = title;
-    ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=6);
     start_row += 1
     for i, h in enumerate(["Condition", "Score", "Details"]):
-        c = ws.cell(start_row, i + 1, h);
-        c.fill = FILL_HDR;
-        c.font = FONT_HDR
+        ws.cell(start_row, i + 1, h).style = STYLE_HEADER
     ws.cell(start_row, 4).value = f"Score: {float(score):.1f}%" if score is not None else "Score: NA";
     start_row += 1
     for cond, sym in symbols.items():
@@ -102,57 +119,48 @@ def _write_reversal_block(ws, start_row: int, title: str, symbols: Dict[str, str
     return start_row + 1
 
 
-def autosize_columns(ws):
-    for col in ws.columns:
-        max_length = 0
-        column = get_column_letter(col[0].column)
-        for cell in col:
-            try:
-                if cell.value:
-                    val_len = len(str(cell.value))
-                    if val_len > max_length: max_length = val_len
-            except:
-                pass
-        ws.column_dimensions[column].width = max(min(max_length + 3, 70), 10)
+def _add_cheat_sheet(wb: Workbook, threshold: float):
+    buf = SheetBuffer("Cheat Sheet")
+    _render_cheat_sheet(buf, threshold)
+    buf.flush(wb.create_sheet("Cheat Sheet", 1))
 
 
-def _add_cheat_sheet(wb: Workbook, threshold: float):
-    ws = wb.create_sheet("Cheat Sheet", 1)
+def _render_cheat_sheet(ws, threshold: float):
     ws["A1"] = "REPORT GUIDE & METRIC EXPLANATIONS";
-    ws["A1"].font = Font(size=14, bold=True)
+    ws["A1"].style = STYLE_TITLE
 
     # Section 1: Color Bands
     ws["A3"] = "1. SCORING BANDS (Colors)";
-    ws["A3"].font = Font(bold=True)
+    ws["A3"].style = STYLE_BOLD
     ws["A4"] = "GREEN";
     ws["B4"] = "High Quality / Pass";
     ws["C4"] = "Meets or exceeds strict criteria";
-    ws["A4"].fill = FILL_GREEN
+    ws["A4"].style = FILL_STYLES["GREEN"]
     ws["A5"] = "YELLOW";
     ws["B5"] = "Average / Warning";
     ws["C5"] = "Acceptable but not leading";
-    ws["A5"].fill = FILL_YELLOW
+    ws["A5"].style = FILL_STYLES["YELLOW"]
     ws["A6"] = "RED";
     ws["B6"] = "Risky / Fail";
     ws["C6"] = "Potential fundamental or technical weakness";
-    ws["A6"].fill = FILL_RED
+    ws["A6"].style = FILL_STYLES["RED"]
 
     # Section 2: Logic
     ws["A8"] = "2. RECOMMENDATION RULES";
-    ws["A8"].font = Font(bold=True)
+    ws["A8"].style = STYLE_BOLD
     ws["A9"] = "✅ STRONG BUY";
     ws["B9"] = f"All fundamental categories AND Reversal score ≥ {int(threshold)}%";
-    ws["A9"].fill = FILL_GREEN
+    ws["A9"].style = FILL_STYLES["GREEN"]
     ws["A10"] = "⚠ WATCH";
     ws["B10"] = f"All fundamental categories ≥ {int(threshold)}% but Reversal score is low";
-    ws["A10"].fill = FILL_YELLOW
+    ws["A10"].style = FILL_STYLES["YELLOW"]
     ws["A11"] = "❌ AVOID";
     ws["B11"] = "Any core fundamental category score < 30%";
-    ws["A11"].fill = FILL_RED
+    ws["A11"].style = FILL_STYLES["RED"]
 
     # Section 3: Metric Definitions
     ws["A13"] = "3. METRIC DEFINITIONS";
-    ws["A13"].font = Font(bold=True)
+    ws["A13"].style = STYLE_BOLD
     metrics_list = [
         ("P/E (TTM)", "Price-to-Earnings: Standard valuation relative to earnings."),
         ("EV/EBIT", "Enterprise Value / EBIT: Valuation including debt/cash levels."),
@@ -163,88 +171,363 @@ def _add_cheat_sheet(wb: Workbook, threshold: float):
         ("Reversal Score", "Combo of fundamental improvement (Margins/CF) and Technical Trend.")
     ]
     for i, (m, d) in enumerate(metrics_list):
-        ws.cell(14 + i, 1, m).font = Font(bold=True)
+        ws.cell(14 + i, 1, m).style = STYLE_BOLD
         ws.cell(14 + i, 2, d)
 
-    autosize_columns(ws)
+
+SUMMARY_HEADER = ["Ticker", "Sector", "Avg Fund Score", "Reversal Score", "Recommendation", "Valuation", "Quality",
+                  "Safety", "Growth", "Risk", "Coverage %"]
+
+
+def _render_summary_header(ws, extra_columns: Tuple[str, ...] = ()):
+    header = SUMMARY_HEADER + list(extra_columns)
+    ws.append(header)
+    for i in range(1, len(header) + 1):
+        ws.cell(1, i).style = STYLE_HEADER_CENTER
+
+
+def _format_summary(ws, n_rows: int) -> None:
+    """Band colours for the score columns of a Summary with `n_rows` data rows."""
+    if n_rows <= 0:
+        return
+    last = n_rows + 1
+    _add_band_rules(ws, f"C2:C{last}", 60.0, 40.0)   # Avg Fund Score (band_fill)
+    _add_band_rules(ws, f"D2:D{last}", 70.0, 50.0)   # Reversal Score (reversal_fill)
+    _add_band_rules(ws, f"F2:J{last}", 60.0, 40.0)   # category scores
+
+
+def _summary_row(t: str, card: ScoreCard) -> List[Any]:
+    cat_scores = card.cat_scores
+    return [t, card.sector_bucket, card.avg_fund_score, card.reversal_total, card.recommendation,
+            cat_scores.get("Valuation"), cat_scores.get("Quality"), cat_scores.get("Safety"), cat_scores.get("Growth"),
+            cat_scores.get("Risk"), card.avg_coverage]
+
+
+def _render_ticker_sheet(ws, t: str, m: Dict[str, Any], card: ScoreCard,
+                         thresholds: Dict[str, Dict[str, Dict[str, Any]]]):
+    revpack = card.reversal
+    bucket = card.sector_bucket
+    ws["A1"] = f"{t} — {bucket}";
+    ws.merge_cells("A1:C1");
+    ws["A1"].style = STYLE_TITLE
+    row = 3
+    for cat_sheet, cat_display in CATEGORY_MAPS.items():
+        ws.cell(row, 1, cat_display).style = STYLE_SECTION;  # spills over B:F, no merge needed
+        row += 1
+        for i, h in enumerate(["Metric", "Value", "Rating", "Mode", "Limits", "Notes"]):
+            ws.cell(row, i + 1, h).style = STYLE_HEADER
+        row += 1
+        for metric, rating in card.ratings.get(cat_sheet, {}).items():
+            val = m.get(metric);
+            th = get_threshold_set(thresholds, cat_sheet, metric, bucket)
+            ws.cell(row, 1, metric);
+            c = ws.cell(row, 2, val);
+            _apply_metric_value_format(c, metric, val)
+            ws.cell(row, 3, rating).style = FILL_STYLES.get(rating, FILL_STYLES["NA"]);
+            ws.cell(row, 4, bucket);
+            ws.cell(row, 5, _limits_text(th));
+            ws.cell(row, 6, th.get("notes", ""));
+            row += 1
+        adj = card.cat_scores.get(cat_display)
+        ws.cell(row, 1, f"{cat_display} Adjusted: {adj:.1f}%" if adj is not None else "NA").style = STYLE_BOLD;
+        row += 2
+    rev_total = card.reversal_total
+    avg_f = card.avg_fund_score
+    ws["D1"] = "Avg Fund Score";
+    ws["E1"] = avg_f;
+    ws["E1"].style = _fill_style(band_fill(avg_f))
+    ws["D2"] = "Reversal Score";
+    ws["E2"] = rev_total;
+    ws["E2"].style = _fill_style(reversal_fill(rev_total))
+    ws["A2"] = "Recommendation";
+    ws["B2"] = card.recommendation;
+    ws["B2"].style = _fill_style(card.recommendation_fill)
+    row = _write_reversal_block(ws, row, "Fundamental Turnaround", revpack.get("fund_symbols", {}),
+                                revpack.get("fund_details", {}), revpack.get("fund_score_pct"))
+    _write_reversal_block(ws, row, "Technical Confirmation", revpack.get("tech_symbols", {}),
+                          revpack.get("tech_details", {}), revpack.get("tech_score_pct"))
+
+
+# Hidden sheet recording what each ticker sheet was rendered from, so a later run can update the
+# workbook in place (update_report_workbook) instead of regenerating every sheet.
+META_SHEET = "_meta"
+META_VERSION = 2  # bump when the sheet layout changes so old reports are fully regenerated
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def content_hash(metrics: Dict[str, Any], card: ScoreCard) -> str:
+    """Hash of everything a ticker sheet and its summary row are rendered from."""
+    return _digest([{k: v for k, v in (metrics or {}).items() if not k.startswith("__")}, card.reversal])
+
+
+def report_fingerprint(thresholds: Dict[str, Dict[str, Dict[str, Any]]], target_threshold: float) -> str:
+    return _digest([META_VERSION, float(target_threshold), thresholds])
+
+
+def _render_meta_sheet(ws, fingerprint: str, hashes: Dict[str, str]):
+    ws.append(["__fingerprint__", fingerprint])
+    for t, h in hashes.items():
+        ws.append([t, h])
+
+
+def _read_report_package(z: zipfile.ZipFile) -> Tuple[Optional[str], Dict[str, str], Dict[str, str], List[Any]]:
+    """(fingerprint, ticker -> content hash, sheet title -> part name, shared strings) of a saved report.
+
+    Reads the package directly: only workbook.xml, the string table and the meta sheet are parsed.
+    """
+    strings: List[Any] = []
+    if ARC_SHARED_STRINGS in z.namelist():
+        with z.open(ARC_SHARED_STRINGS) as f:
+            strings = read_string_table(f)
+    parser = WorkbookParser(z, ARC_WORKBOOK)
+    parser.parse()
+    parts = {sheet.name: rel.target.lstrip("/") for sheet, rel in parser.find_sheets()}
+    fingerprint, hashes = None, {}
+    if META_SHEET in parts:
+        with z.open(parts[META_SHEET]) as src:
+            for _, cells in WorkSheetParser(src, strings).parse():
+                values = [c["value"] for c in cells]
+                if len(values) >= 2 and values[0] is not None:
+                    hashes[str(values[0])] = str(values[1])
+        fingerprint = hashes.pop("__fingerprint__", None)
+    return fingerprint, hashes, parts, strings
+
+
+def _ensure_scorecards(tickers, thresholds, metrics_by_ticker, reversal_by_ticker, target_threshold, scorecards):
+    if scorecards is None:
+        scorecards = {}
+    missing = [t for t in tickers if t not in scorecards]
+    if missing:
+        scorecards = dict(scorecards)
+        scorecards.update(build_scorecards(missing, {t: metrics_by_ticker.get(t, {}) for t in missing},
+                                           reversal_by_ticker, thresholds, target_threshold))
+    return scorecards
+
+
+def write_only_setting() -> bool:
+    return (os.environ.get("REPORT_WRITE_ONLY", "0") or "0").strip().lower() in ("1", "true", "yes")
+
+
+def update_mode_setting() -> bool:
+    return (os.environ.get("REPORT_UPDATE", "0") or "0").strip().lower() in ("1", "true", "yes")
+
+
+class StreamingReportWriter:
+    """Write-only report (REPORT_WRITE_ONLY=1): `add()` renders each ticker sheet into a SheetBuffer and spools
+    it to a temp directory the writer owns, so only the summary rows stay in memory. `close()` streams the sheets
+    into a write-only workbook in candidate order, then Summary, Cheat Sheet and meta; `discard()` (or leaving
+    the `with` block on an error or with no sheets) deletes the spool instead.
+    """
+
+    def __init__(self, out_path: str, thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                 target_threshold: float = 60.0):
+        self.out_path = out_path
+        self.thresholds = thresholds
+        self.target_threshold = target_threshold
+        self._spool = tempfile.mkdtemp(prefix="report_sheets_")
+        self._sheets: Dict[str, str] = {}  # ticker -> spooled SheetBuffer file, in completion order
+        self._summary_rows: Dict[str, List[Any]] = {}
+        self._hashes: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._summary_rows)
+
+    def add(self, t: str, metrics: Dict[str, Any], card: ScoreCard) -> None:
+        buf = SheetBuffer(t)
+        _render_ticker_sheet(buf, t, metrics or {}, card, self.thresholds)
+        path = os.path.join(self._spool, f"{len(self._sheets):06d}.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(buf, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._sheets[t] = path
+        self._summary_rows[t] = _summary_row(t, card)
+        self._hashes[t] = content_hash(metrics, card)
+
+    def close(self, order: Optional[List[str]] = None) -> str:
+        """Write the workbook and delete the spool; returns the path.
+
+        Sheets arrive in completion order; `order` (the candidate list) fixes the ticker sheet, Summary row
+        and meta order so the report does not depend on which fetch finished first.
+        """
+        tickers = list(self._sheets)
+        if order is not None:
+            rank = {t: i for i, t in enumerate(order)}
+            tickers.sort(key=lambda t: rank.get(t, len(rank)))
+        try:
+            wb = Workbook(write_only=True)
+            register_report_styles(wb)
+            ws_sum = wb.create_sheet("Summary")
+            cheat = SheetBuffer("Cheat Sheet")
+            _render_cheat_sheet(cheat, self.target_threshold)
+            cheat.flush(wb.create_sheet("Cheat Sheet"))
+            for t in tickers:
+                with open(self._sheets[t], "rb") as f:
+                    buf = pickle.load(f)
+                buf.flush(wb.create_sheet(t))
+
+            summary = SheetBuffer("Summary")
+            _render_summary_header(summary)
+            for t in tickers:
+                summary.append(self._summary_rows[t])
+            _format_summary(summary, len(tickers))
+            summary.flush(ws_sum)
+
+            meta = wb.create_sheet(META_SHEET)
+            meta.sheet_state = "hidden"
+            _render_meta_sheet(meta, report_fingerprint(self.thresholds, self.target_threshold),
+                               {t: self._hashes[t] for t in tickers})
+            wb.save(self.out_path)
+        finally:
+            self.discard()
+        return self.out_path
+
+    def discard(self) -> None:
+        """Delete the spooled sheets without writing a report (no-op once closed or discarded)."""
+        shutil.rmtree(self._spool, ignore_errors=True)
+        self._sheets.clear()
+
+    def __enter__(self) -> "StreamingReportWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None and len(self):
+            self.close()
+        else:
+            self.discard()
 
 
 def create_report_workbook(tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
                            metrics_by_ticker: Dict[str, Dict[str, Any]], reversal_by_ticker: Dict[str, Dict[str, Any]],
-                           out_path: str, target_threshold: float = 60.0):
+                           out_path: str, target_threshold: float = 60.0,
+                           scorecards: Optional[Dict[str, ScoreCard]] = None, write_only: Optional[bool] = None,
+                           shard_by=None):
+    """Write the report to `out_path`.
+
+    `write_only` (default: REPORT_WRITE_ONLY) streams sheets through a write-only workbook; `shard_by`
+    (default: REPORT_SHARDS, "sector" or a ticker count) splits ticker sheets into detail workbooks
+    next to an index workbook, see report_shards.py.
+    """
+    scorecards = _ensure_scorecards(tickers, thresholds, metrics_by_ticker, reversal_by_ticker, target_threshold,
+                                    scorecards)
+    if write_only is None:
+        write_only = write_only_setting()
+    if shard_by is None:
+        from report_shards import shard_setting
+        shard_by = shard_setting()
+    if shard_by:
+        from report_shards import write_sharded_report
+        write_sharded_report(tickers, thresholds, metrics_by_ticker, scorecards, out_path, target_threshold,
+                             shard_by, write_only=write_only)
+        return
+    if write_only:
+        writer = StreamingReportWriter(out_path, thresholds, target_threshold)
+        for t in tickers:
+            writer.add(t, metrics_by_ticker.get(t, {}), scorecards[t])
+        writer.close()
+        return
+
     wb = Workbook();
     wb.remove(wb.active)
+    _fill_workbook(wb, tickers, thresholds, metrics_by_ticker, scorecards, target_threshold)
+    wb.save(out_path)
+
+
+def _fill_workbook(wb: Workbook, tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                   metrics_by_ticker: Dict[str, Dict[str, Any]], scorecards: Dict[str, ScoreCard],
+                   target_threshold: float, reuse=frozenset()) -> Dict[str, Any]:
+    """Summary, Cheat Sheet, ticker sheets and meta; tickers in `reuse` get an empty placeholder sheet."""
+    register_report_styles(wb)
     ws_sum = wb.create_sheet("Summary", 0)
-    ws_sum.append(
-        ["Ticker", "Sector", "Avg Fund Score", "Reversal Score", "Recommendation", "Valuation", "Quality", "Safety",
-         "Growth", "Risk", "Coverage %"])
-    for c in ws_sum[1]: c.fill = FILL_HDR; c.font = FONT_HDR; c.alignment = ALIGN_CENTER
+    summary = SheetBuffer("Summary")
+    _render_summary_header(summary)
 
     _add_cheat_sheet(wb, target_threshold)
 
-    category_maps = {"Valuation": "Valuation", "Profitability": "Quality", "Balance Sheet": "Safety",
-                     "Growth": "Growth", "Risk": "Risk"}
+    placeholders = {}
     for t in tickers:
-        m = metrics_by_ticker.get(t, {});
-        revpack = _normalize_reversal_pack(reversal_by_ticker.get(t, {}))
-        bucket = m.get("Sector Bucket", "Default (All)")
-        ws = wb.create_sheet(t);
-        ws["A1"] = f"{t} — {bucket}";
-        ws.merge_cells("A1:C1");
-        ws["A1"].font = Font(size=14, bold=True)
-        cat_scores, cat_coverages, row = {}, {}, 3
-        for cat_sheet, cat_display in category_maps.items():
-            ws.cell(row, 1, cat_display).font = Font(bold=True, size=12);
-            ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=6);
-            row += 1
-            for i, h in enumerate(["Metric", "Value", "Rating", "Mode", "Limits", "Notes"]):
-                c = ws.cell(row, i + 1, h);
-                c.fill = FILL_HDR;
-                c.font = FONT_HDR
-            row += 1
-            ratings, weights = {}, {}
-            for metric in thresholds.get(cat_sheet, {}):
-                if metric not in WHITELIST: continue
-                val = m.get(metric);
-                th = get_threshold_set(thresholds, cat_sheet, metric, bucket)
-                rating, fill = "NA", FILL_GRAY
-                if th and val is not None:
-                    rating, fill = score_with_threshold_txt(val, th.get("green_txt"), th.get("yellow_txt"),
-                                                            th.get("red_txt"))
-                ratings[metric], weights[metric] = rating, _metric_weight(metric)
-                ws.cell(row, 1, metric);
-                c = ws.cell(row, 2, val);
-                _apply_metric_value_format(c, metric, val)
-                ws.cell(row, 3, rating).fill = fill;
-                ws.cell(row, 4, bucket);
-                ws.cell(row, 5, _limits_text(th));
-                ws.cell(row, 6, th.get("notes", ""));
-                row += 1
-            raw, cov = compute_category_score_and_coverage(ratings, weights)
-            adj = adjusted_from_raw_and_coverage(raw, cov)
-            cat_scores[cat_display], cat_coverages[cat_display] = adj, cov
-            ws.cell(row, 1, f"{cat_display} Adjusted: {adj:.1f}%" if adj is not None else "NA").font = Font(bold=True);
-            row += 2
-        rev_total = revpack.get("total_score_pct")
-        rec_txt, rec_fill = final_recommendation_banner(cat_scores, rev_total, target_threshold)
-        valid_cats = [s for s in cat_scores.values() if s is not None]
-        avg_f = sum(valid_cats) / len(valid_cats) if valid_cats else 0.0
-        ws["D1"] = "Avg Fund Score";
-        ws["E1"] = avg_f;
-        ws["E1"].fill = band_fill(avg_f)
-        ws["D2"] = "Reversal Score";
-        ws["E2"] = rev_total;
-        ws["E2"].fill = reversal_fill(rev_total)
-        ws["A2"] = "Recommendation";
-        ws["B2"] = rec_txt;
-        ws["B2"].fill = rec_fill
-        avg_cov = sum(cat_coverages.values()) / len(cat_coverages) if cat_coverages else 0
-        ws_sum.append([t, bucket, avg_f, rev_total, rec_txt, cat_scores.get("Valuation"), cat_scores.get("Quality"),
-                       cat_scores.get("Safety"), cat_scores.get("Growth"), cat_scores.get("Risk"), avg_cov])
-        row = _write_reversal_block(ws, row, "Fundamental Turnaround", revpack.get("fund_symbols", {}),
-                                    revpack.get("fund_details", {}), revpack.get("fund_score_pct"))
-        row = _write_reversal_block(ws, row, "Technical Confirmation", revpack.get("tech_symbols", {}),
-                                    revpack.get("tech_details", {}), revpack.get("tech_score_pct"))
-        autosize_columns(ws)
-    autosize_columns(ws_sum);
-    wb.save(out_path)
\ No newline at end of file
+        card = scorecards[t]
+        ws = wb.create_sheet(t)
+        if t in reuse:
+            placeholders[t] = ws
+        else:
+            buf = SheetBuffer(t)
+            _render_ticker_sheet(buf, t, metrics_by_ticker.get(t, {}), card, thresholds)
+            buf.flush(ws)
+        summary.append(_summary_row(t, card))
+    _format_summary(summary, len(tickers))
+    summary.flush(ws_sum)
+    meta = wb.create_sheet(META_SHEET)
+    meta.sheet_state = "hidden"
+    _render_meta_sheet(meta, report_fingerprint(thresholds, target_threshold),
+                       {t: content_hash(metrics_by_ticker.get(t, {}), scorecards[t]) for t in tickers})
+    return placeholders
+
+
+def update_report_workbook(prev_path: str, tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                           metrics_by_ticker: Dict[str, Dict[str, Any]],
+                           reversal_by_ticker: Dict[str, Dict[str, Any]], out_path: Optional[str] = None,
+                           target_threshold: float = 60.0,
+                           scorecards: Optional[Dict[str, ScoreCard]] = None) -> List[str]:
+    """Bring the report at `prev_path` up to date with `tickers`, saving it to `out_path` (default: in place).
+
+    Only ticker sheets whose content hash changed (or that are new) are rendered; the XML of unchanged
+    sheets is copied over from the previous file as-is. Summary and Cheat Sheet are rebuilt from the
+    scorecards, so the result matches a full regeneration. To keep the copied sheets' style and shared
+    string ids valid, the new workbook starts from the previous file's stylesheet and string table.
+    A report written with other thresholds, another target or an older layout is regenerated in full.
+    Returns the tickers whose sheets were rendered.
+
+    Reading the previous package relies on openpyxl's reader internals (requirements.txt pins the tested
+    range); if that fails the report is regenerated in full instead.
+    """
+    out_path = out_path or prev_path
+    scorecards = _ensure_scorecards(tickers, thresholds, metrics_by_ticker, reversal_by_ticker, target_threshold,
+                                    scorecards)
+    try:
+        return _update_report_package(prev_path, tickers, thresholds, metrics_by_ticker, reversal_by_ticker,
+                                      out_path, target_threshold, scorecards)
+    except Exception as e:
+        print(f"Report update failed ({type(e).__name__}: {e}); writing the full report")
+    create_report_workbook(tickers, thresholds, metrics_by_ticker, reversal_by_ticker, out_path,
+                           target_threshold, scorecards=scorecards, write_only=False, shard_by=0)
+    return list(tickers)
+
+
+def _update_report_package(prev_path: str, tickers: List[str], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                           metrics_by_ticker: Dict[str, Dict[str, Any]],
+                           reversal_by_ticker: Dict[str, Dict[str, Any]], out_path: str, target_threshold: float,
+                           scorecards: Dict[str, ScoreCard]) -> List[str]:
+    with zipfile.ZipFile(prev_path) as z:
+        fingerprint, old_hashes, old_parts, strings = _read_report_package(z)
+        current = fingerprint == report_fingerprint(thresholds, target_threshold)
+        if current:
+            wb = Workbook()
+            wb.remove(wb.active)
+            apply_stylesheet(z, wb)
+            wb.shared_strings = IndexedList(strings)
+    if not current:
+        create_report_workbook(tickers, thresholds, metrics_by_ticker, reversal_by_ticker, out_path,
+                               target_threshold, scorecards=scorecards, write_only=False, shard_by=0)
+        return list(tickers)
+
+    reuse = {t for t in tickers if t in old_parts and t in old_hashes
+             and old_hashes[t] == content_hash(metrics_by_ticker.get(t, {}), scorecards[t])}
+    placeholders = _fill_workbook(wb, tickers, thresholds, metrics_by_ticker, scorecards, target_threshold, reuse)
+
+    tmp_new, tmp_out = out_path + ".new.tmp", out_path + ".tmp"
+    try:
+        wb.save(tmp_new)
+        copy_parts = {ws.path.lstrip("/"): old_parts[t] for t, ws in placeholders.items()}
+        with zipfile.ZipFile(prev_path) as zold, zipfile.ZipFile(tmp_new) as znew, \
+                zipfile.ZipFile(tmp_out, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in znew.infolist():
+                src = copy_parts.get(item.filename)
+                zout.writestr(item, zold.read(src) if src else znew.read(item.filename))
+        os.replace(tmp_out, out_path)
+    finally:
+        for p in (tmp_new, tmp_out):
+            if os.path.exists(p):
+                os.remove(p)
+    return [t for t in tickers if t not in reuse]
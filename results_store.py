@@ -0,0 +1,169 @@
+"""Persisted per-ticker results of a screening run.
+
+Every run stores the scalar metrics and reversal packs of all scored tickers
+(no DataFrames, no bundles) as one gzip'd JSON file under .cache/runs/
+(run_<ts>_<usec>_<pid>.json.gz, so runs finishing in the same second do not
+overwrite each other). A rescore reloads them and re-applies the checklist
+without touching Yahoo/FMP.
+
+While a screen runs, RunJournal checkpoints each finished ticker to
+.cache/runs/journal_<ts>_<pid>.jsonl (a shard's next to its results file in
+the shard directory), so an interrupted run can be resumed.
+
+Env vars (optional):
+  RUN_JOURNAL=1      # 0 = no per-ticker checkpoints (runs cannot be resumed)
+"""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import json
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+def runs_dir() -> str:
+    return os.path.join(os.getcwd(), ".cache", "runs")
+
+
+def _jsonable(v: Any) -> Any:
+    if isinstance(v, dict):
+        return {str(k): _jsonable(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_jsonable(x) for x in v]
+    if isinstance(v, (np.floating, float)):
+        f = float(v)
+        return None if (math.isnan(f) or math.isinf(f)) else f
+    if isinstance(v, np.integer):
+        return int(v)
+    if isinstance(v, np.bool_):
+        return bool(v)
+    return v
+
+
+def strip_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop in-memory bundles (DataFrames, arrays) and keep the persisted scalars."""
+    return {k: v for k, v in (metrics or {}).items() if k != "__yf_bundle__"}
+
+
+def dump_results(metrics_map: Dict[str, Dict[str, Any]], reversal_map: Dict[str, Dict[str, Any]],
+                 meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "meta": _jsonable(meta or {}),
+        "metrics": {t: _jsonable(strip_metrics(m)) for t, m in metrics_map.items()},
+        "reversal": {t: _jsonable(r) for t, r in reversal_map.items() if r is not None},
+    }
+
+
+def save_run_results(metrics_map: Dict[str, Dict[str, Any]], reversal_map: Dict[str, Dict[str, Any]], *,
+                     meta: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> str:
+    """Write a run's results and return the file path."""
+    if path is None:
+        os.makedirs(runs_dir(), exist_ok=True)
+        # fixed-width timestamp first, so the names still sort by time for latest_run_path()
+        path = os.path.join(runs_dir(), f"run_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}.json.gz")
+    payload = dump_results(metrics_map, reversal_map, meta)
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    return path
+
+
+def latest_run_path() -> Optional[str]:
+    paths = sorted(glob.glob(os.path.join(runs_dir(), "run_*.json.gz")))
+    return paths[-1] if paths else None
+
+
+def load_run_results(path: Optional[str] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]],
+                                                          Dict[str, Any]]:
+    """Return (metrics_map, reversal_map, meta) from `path` or the latest stored run."""
+    path = path or latest_run_path()
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError("No stored run results found (run a full screen first).")
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload.get("metrics") or {}, payload.get("reversal") or {}, payload.get("meta") or {}
+
+
+def shard_journal_path(results_path: str) -> str:
+    """Journal of the run writing `results_path` (shard_000_of_004.json.gz -> shard_000_of_004.journal.jsonl)."""
+    base = results_path[:-len(".json.gz")] if results_path.endswith(".json.gz") else results_path
+    return base + ".journal.jsonl"
+
+
+def journal_setting() -> bool:
+    return (os.environ.get("RUN_JOURNAL", "1") or "1").strip().lower() not in ("0", "false", "no")
+
+
+def latest_journal_path() -> Optional[str]:
+    """Journal of the most recent unfinished run (finished runs delete theirs)."""
+    paths = sorted(glob.glob(os.path.join(runs_dir(), "journal_*.jsonl")))
+    return paths[-1] if paths else None
+
+
+class RunJournal:
+    """Append-only JSON Lines checkpoint of a screen in progress.
+
+    Line 1 is {"meta": {...}} (tickers, rule mode, options); every finished ticker appends
+    {"ticker", "metrics", "reversal"} and is flushed right away, so a crash loses at most the line
+    being written (a torn last line is cut off on load). Tickers that failed are not recorded and are
+    retried on resume. The journal is removed once the run's report is written.
+    """
+
+    def __init__(self, path: str, meta: Dict[str, Any], done: Optional[Dict[str, Tuple[Dict[str, Any],
+                                                                                      Dict[str, Any]]]] = None):
+        self.path, self.meta = path, meta
+        self.done = done or {}
+        self._f = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def create(cls, meta: Dict[str, Any], path: Optional[str] = None) -> "RunJournal":
+        if path is None:
+            os.makedirs(runs_dir(), exist_ok=True)
+            # pid: runs started in the same second (local shard workers) must not share a journal
+            path = os.path.join(runs_dir(), f"journal_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"meta": _jsonable(meta)}, separators=(",", ":")) + "\n")
+        return cls(path, meta)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "RunJournal":
+        path = path or latest_journal_path()
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError("No unfinished run to resume.")
+        meta, done = {}, {}
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                # Drop the torn last line, or the next record would be appended to it and lost too.
+                data = data[:data.rfind(b"\n") + 1]
+                f.truncate(len(data))
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # a corrupt line in the middle
+            if "meta" in rec:
+                meta = rec["meta"]
+            elif rec.get("ticker"):
+                done[rec["ticker"]] = (rec.get("metrics") or {}, rec.get("reversal") or {})
+        return cls(path, meta, done)
+
+    def record(self, ticker: str, metrics: Dict[str, Any], reversal: Optional[Dict[str, Any]]) -> None:
+        rec = {"ticker": ticker, "metrics": _jsonable(strip_metrics(metrics)), "reversal": _jsonable(reversal or {})}
+        self._f.write(json.dumps(rec, separators=(",", ":"), default=str) + "\n")
+        self._f.flush()
+
+    def close(self, finished: bool = False) -> None:
+        self._f.close()
+        if finished:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
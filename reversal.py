@@ -1,7 +1,12 @@
 import math
 from typing import Any, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
-import yfinance as yf
+from prices import PriceHistory
+from statements import StatementSet
+
+# Metrics (from metrics.py) that the reversal checks read; the compute stage always evaluates them.
+REVERSAL_METRICS = ("ROIC % (standardized)", "EV/EBIT", "Sector Relative Return (1Y)")
 
 
 # ==========================
@@ -16,17 +21,8 @@ def _to_num(x):
         return None
 
 
-def _safe_series(df: pd.DataFrame, row_names, n: int = 8) -> Optional[pd.Series]:
-    if df is None or df.empty: return None
-    for rn in row_names:
-        if rn in df.index:
-            row = df.loc[rn]
-            if isinstance(row, pd.DataFrame): row = row.iloc[0]
-            return pd.to_numeric(row.iloc[:n], errors="coerce")
-    return None
-
-
-def _get_close_series(hist: pd.DataFrame) -> pd.Series:
+def _get_close_series(hist) -> pd.Series:
+    if isinstance(hist, PriceHistory): return hist.close_series(adjusted=True)
     if hist is None or hist.empty: return pd.Series(dtype=float)
     df = hist.copy()
     if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
@@ -49,16 +45,16 @@ def _score_symbol(points: int) -> str:
 # ==========================
 # Fundamental Turnaround (With Fallback)
 # ==========================
-def _fund_margin_trend(q_income: pd.DataFrame, a_income: pd.DataFrame) -> Tuple[int, str]:
+def _fund_margin_trend(stmts: StatementSet) -> Tuple[int, str]:
     # 1. Try Quarterly TTM (Need 8 qtrs)
-    q_rev = _safe_series(q_income, ["Total Revenue", "TotalRevenue"], 8)
-    q_opi = _safe_series(q_income, ["Operating Income", "OperatingIncome"], 8)
+    q_rev = stmts.recent("q_income", "total_revenue", 8)
+    q_opi = stmts.recent("q_income", "operating_income", 8)
 
     if q_rev is not None and len(q_rev) >= 8 and q_opi is not None and len(q_opi) >= 8:
-        ttm_rev = q_rev.iloc[:4].sum();
-        prev_rev = q_rev.iloc[4:8].sum()
-        ttm_opi = q_opi.iloc[:4].sum();
-        prev_opi = q_opi.iloc[4:8].sum()
+        ttm_rev = np.nansum(q_rev[:4]);
+        prev_rev = np.nansum(q_rev[4:8])
+        ttm_opi = np.nansum(q_opi[:4]);
+        prev_opi = np.nansum(q_opi[4:8])
         if ttm_rev > 0 and prev_rev > 0:
             m_now = ttm_opi / ttm_rev * 100
             m_prev = prev_opi / prev_rev * 100
@@ -68,13 +64,13 @@ def _fund_margin_trend(q_income: pd.DataFrame, a_income: pd.DataFrame) -> Tuple[
             return (0, "Op Margin Falling (TTM)")
 
     # 2. Fallback to Annual (Need 2 years)
-    a_rev = _safe_series(a_income, ["Total Revenue", "TotalRevenue"], 2)
-    a_opi = _safe_series(a_income, ["Operating Income", "OperatingIncome"], 2)
+    a_rev = stmts.recent("annual_income", "total_revenue", 2)
+    a_opi = stmts.recent("annual_income", "operating_income", 2)
     if a_rev is not None and len(a_rev) >= 2 and a_opi is not None and len(a_opi) >= 2:
-        rev_now = a_rev.iloc[0];
-        rev_prev = a_rev.iloc[1]
-        opi_now = a_opi.iloc[0];
-        opi_prev = a_opi.iloc[1]
+        rev_now = a_rev[0];
+        rev_prev = a_rev[1]
+        opi_now = a_opi[0];
+        opi_prev = a_opi[1]
         if rev_now > 0 and rev_prev > 0:
             m_now = opi_now / rev_now * 100
             m_prev = opi_prev / rev_prev * 100
@@ -84,29 +80,29 @@ def _fund_margin_trend(q_income: pd.DataFrame, a_income: pd.DataFrame) -> Tuple[
     return (0, "No Margin Trend Data")
 
 
-def _fund_cashflow_trend(q_cf: pd.DataFrame, a_cf: pd.DataFrame) -> Tuple[int, str]:
+def _fund_cashflow_trend(stmts: StatementSet) -> Tuple[int, str]:
     # 1. Try Quarterly TTM
-    q_ocf = _safe_series(q_cf, ["Operating Cash Flow", "Total Cash From Operating Activities"], 8)
+    q_ocf = stmts.recent("q_cf", "operating_cash_flow", 8)
     if q_ocf is not None and len(q_ocf) >= 8:
-        ocf_now = q_ocf.iloc[:4].sum()
-        ocf_prev = q_ocf.iloc[4:8].sum()
+        ocf_now = float(np.nansum(q_ocf[:4]))
+        ocf_prev = float(np.nansum(q_ocf[4:8]))
         return _calc_trend_score(ocf_now, ocf_prev, "OCF (TTM)")
 
     # 2. Fallback Annual
-    a_ocf = _safe_series(a_cf, ["Operating Cash Flow", "Total Cash From Operating Activities"], 2)
+    a_ocf = stmts.recent("annual_cf", "operating_cash_flow", 2)
     if a_ocf is not None and len(a_ocf) >= 2:
-        return _calc_trend_score(a_ocf.iloc[0], a_ocf.iloc[1], "OCF (Annual)")
+        return _calc_trend_score(float(a_ocf[0]), float(a_ocf[1]), "OCF (Annual)")
 
     return (0, "No CF Trend Data")
 
 
-def _fund_balance_sheet_healing(annual_bs: pd.DataFrame) -> Tuple[int, str]:
-    if annual_bs is None or annual_bs.empty: return (0, "Missing BS")
-    debt = _safe_series(annual_bs, ["Total Debt", "TotalDebt"], 2)
-    cash = _safe_series(annual_bs, ["Cash And Cash Equivalents"], 2)
-    if debt is not None and cash is not None and len(debt) >= 2:
-        nd_now = debt.iloc[0] - cash.iloc[0]
-        nd_prev = debt.iloc[1] - cash.iloc[1]
+def _fund_balance_sheet_healing(stmts: StatementSet) -> Tuple[int, str]:
+    if not stmts.has("annual_bs"): return (0, "Missing BS")
+    debt = stmts.recent("annual_bs", "total_debt", 2)
+    cash = stmts.recent("annual_bs", "cash", 2)
+    if debt is not None and cash is not None and len(debt) >= 2 and len(cash) >= 2:
+        nd_now = debt[0] - cash[0]
+        nd_prev = debt[1] - cash[1]
         if nd_now < nd_prev: return (2, "Net Debt Decreasing")
         if nd_now < 0: return (2, "Net Cash Position")
         if nd_now < nd_prev * 1.05: return (1, "Net Debt Stable")
@@ -211,11 +207,15 @@ def _calculate_weighted(items: Dict[str, Tuple[int, str]], weights: Dict[str, fl
 
 
 def trend_reversal_scores_from_data(*, q_income=None, q_cf=None, annual_income=None, annual_cf=None, annual_bs=None,
-                                    h_1y=None, h_2y=None, metrics=None, **kwargs) -> Dict[str, Any]:
+                                    h_1y=None, h_2y=None, metrics=None, statements: Optional[StatementSet] = None,
+                                    **kwargs) -> Dict[str, Any]:
+    if statements is None:
+        statements = StatementSet.from_frames(annual_income=annual_income, annual_bs=annual_bs, annual_cf=annual_cf,
+                                              q_income=q_income, q_cf=q_cf)
     fund = {}
-    fund["Margins"] = _fund_margin_trend(q_income, annual_income)
-    fund["Cashflow"] = _fund_cashflow_trend(q_cf, annual_cf)
-    fund["Balance Sheet"] = _fund_balance_sheet_healing(annual_bs)
+    fund["Margins"] = _fund_margin_trend(statements)
+    fund["Cashflow"] = _fund_cashflow_trend(statements)
+    fund["Balance Sheet"] = _fund_balance_sheet_healing(statements)
     fund["ROIC"] = _fund_roic_check(metrics or {})
     fund["Valuation"] = _fund_value_check(metrics or {})
 
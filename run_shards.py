@@ -0,0 +1,146 @@
+"""Hash-sharded screening runs, coordinated only through a shared directory.
+
+The input tokens (ticker symbols, company names, universe CSV entries) are
+split into N deterministic shards by a stable hash of the upper-cased token,
+which for universe entries is the ticker itself. Every host or process that is
+given the same inputs and N therefore agrees on the split without talking to
+the others.
+
+  worker  (any host)   python cli.py --universe NYSE --universe LSE --shard 3/8 --shard-dir /mnt/runs/0615
+  merge   (any host)   python cli.py --merge /mnt/runs/0615 [--wait 3600]
+  local   (one host)   python cli.py --universe SP500 --shards 4 --shard-dir /tmp/run   # N processes + merge
+
+A worker screens its shard with its own caches and writes the scalar results
+(the results_store format) to `<dir>/shard_<i>_of_<N>.json.gz`, atomically.
+Its run journal sits next to it (shard_<i>_of_<N>.journal.jsonl), so rerunning
+an interrupted worker with the same --shard resumes it. The merge
+waits until all N files exist, rescores their union against the current
+checklist and writes the single filtered report.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from checklist_loader import load_thresholds_from_excel
+from eligibility import eligibility_mode_setting
+from history_store import record_run
+from results_store import journal_setting, load_run_results, shard_journal_path
+from scorecard import build_scorecards
+from screener import (RULE_THRESHOLDS, ScreenResult, find_checklist_file, _raw_tokens, _report_from_scores,
+                      resume_run, screen_inputs)
+
+_SHARD_FILE = re.compile(r"shard_(\d+)_of_(\d+)\.json\.gz$")
+
+
+def shard_of(token: str, shards: int) -> int:
+    """Stable shard index of one input token (same on every host and Python version)."""
+    digest = hashlib.sha1(token.strip().upper().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """"3/8" -> (3, 8); indices run from 0 to N-1."""
+    i, _, n = (spec or "").partition("/")
+    index, shards = int(i), int(n)
+    if shards < 1 or not 0 <= index < shards:
+        raise ValueError(f"bad shard {spec!r}: expected I/N with 0 <= I < N")
+    return index, shards
+
+
+def shard_results_path(shard_dir: str, index: int, shards: int) -> str:
+    return os.path.join(shard_dir, f"shard_{index:03d}_of_{shards:03d}.json.gz")
+
+
+def run_shard(raw_text: str, indices: Sequence[str], index: int, shards: int, shard_dir: str,
+              rule_mode: str = "Strict", use_fmp: bool = False, include_watch: bool = False,
+              **kwargs) -> ScreenResult:
+    """Screen this worker's share of the inputs and write its partial results file (no report).
+
+    An unfinished journal of the same shard (an interrupted earlier attempt) is resumed instead.
+    """
+    results_path = shard_results_path(os.path.abspath(shard_dir), index, shards)
+    journal = shard_journal_path(results_path)
+    if journal_setting() and os.path.exists(journal):
+        print(f"Shard {index}/{shards}: resuming {journal}")
+        return resume_run(journal, **kwargs)
+    tokens = [t for t in _raw_tokens(raw_text, indices) if shard_of(t, shards) == index]
+    os.makedirs(shard_dir, exist_ok=True)
+    print(f"Shard {index}/{shards}: {len(tokens)} inputs")
+    return screen_inputs("\n".join(tokens), [], rule_mode, use_fmp, include_watch, write_report=False,
+                         results_path=results_path, **kwargs)
+
+
+def _shard_files(shard_dir: str) -> Tuple[Optional[int], Dict[int, str]]:
+    found: Dict[int, Dict[int, str]] = {}
+    for path in glob.glob(os.path.join(shard_dir, "shard_*_of_*.json.gz")):
+        m = _SHARD_FILE.search(os.path.basename(path))
+        if m:
+            found.setdefault(int(m.group(2)), {})[int(m.group(1))] = path
+    if len(found) > 1:
+        raise RuntimeError(f"{shard_dir} mixes shard counts {sorted(found)}; use one directory per run")
+    return next(iter(found.items()), (None, {}))
+
+
+def merge_shards(shard_dir: str, rule_mode: Optional[str] = None, include_watch: Optional[bool] = None,
+                 wait_seconds: float = 0.0, allow_partial: bool = False, out_dir: Optional[str] = None) -> Optional[str]:
+    """Merge all shard files of `shard_dir` into one filtered report; returns its path (None: no candidates).
+
+    Polls up to `wait_seconds` for shards that are still running. The rule mode and WATCH option default
+    to the ones the shards ran with. The merged run is recorded in the snapshot history once (shards
+    do not record their parts).
+    """
+    deadline = time.monotonic() + max(0.0, wait_seconds)
+    while True:
+        shards, paths = _shard_files(shard_dir)
+        missing = sorted(set(range(shards)) - set(paths)) if shards else None
+        if missing == [] or time.monotonic() >= deadline:
+            break
+        time.sleep(min(5.0, max(0.1, deadline - time.monotonic())))
+    if shards is None:
+        raise FileNotFoundError(f"No shard results in {shard_dir}")
+    if missing and not allow_partial:
+        raise RuntimeError(f"Shards not finished in {shard_dir}: {missing} of {shards}")
+
+    metrics_map: Dict[str, Dict[str, Any]] = {}
+    reversal_map: Dict[str, Dict[str, Any]] = {}
+    tickers: List[str] = []
+    meta: Dict[str, Any] = {}
+    for i in sorted(paths):
+        m, r, meta = load_run_results(paths[i])
+        metrics_map.update(m)
+        reversal_map.update(r)
+        tickers.extend(meta.get("tickers") or m)
+    tickers = sorted(t for t in set(tickers) if t in metrics_map)
+    print(f"Merged {len(paths)} of {shards} shards: {len(tickers)} tickers")
+
+    rule_mode = rule_mode or meta.get("rule_mode") or "Strict"
+    include_watch = bool(meta.get("include_watch")) if include_watch is None else include_watch
+    thresholds = load_thresholds_from_excel(find_checklist_file())
+    target_threshold = RULE_THRESHOLDS.get(rule_mode, 60.0)
+    scorecards = build_scorecards(tickers, metrics_map, reversal_map, thresholds, target_threshold,
+                                  eligibility_mode_setting())
+    try:
+        record_run(scorecards, metrics_map, rule_mode=rule_mode)
+    except Exception as e:
+        print(f"Could not record the merged run in the snapshot history: {e}")
+    return _report_from_scores(rule_mode, include_watch, tickers, thresholds, metrics_map, reversal_map,
+                               target_threshold, scorecards, out_dir)
+
+
+def run_local_shards(worker_args: Sequence[str], shards: int, shard_dir: str, **merge_kwargs) -> Optional[str]:
+    """Run `shards` cli.py workers as local processes (each with `worker_args`), then merge."""
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+    procs = [subprocess.Popen([sys.executable, cli, *worker_args, "--shard", f"{i}/{shards}",
+                               "--shard-dir", shard_dir]) for i in range(shards)]
+    failed = [i for i, p in enumerate(procs) if p.wait() != 0]
+    if failed:
+        raise RuntimeError(f"Shard workers failed: {failed} (rerun them with --shard I/{shards}; they resume)")
+    return merge_shards(shard_dir, **merge_kwargs)
@@ -0,0 +1,251 @@
+"""Per-ticker scoring result shared by the filter and the report writer.
+
+A ScoreCard is built once per ticker (ratings -> category scores -> coverage ->
+adjusted scores -> recommendation). `main` filters on it and `report_writer`
+renders it, so both always see the same numbers.
+
+The checklist half (FundamentalScore) can be computed on its own so the
+compute stage can apply the eligibility gate before paying for the reversal.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from checklist_loader import get_threshold_set
+from config import FILL_GREEN, FILL_YELLOW, FILL_RED
+from eligibility import EligibilityResult, evaluate_eligibility
+from metric_registry import scored_metric_names
+from scoring import (
+    RATING_FILLS,
+    _metric_weight,
+    adjusted_from_raw_and_coverage,
+    compute_category_score_and_coverage,
+    rate_universe,
+    score_threshold_set,
+)
+
+# Checklist sheet -> display name used in the report.
+CATEGORY_MAPS = {"Valuation": "Valuation", "Profitability": "Quality", "Balance Sheet": "Safety",
+                 "Growth": "Growth", "Risk": "Risk"}
+
+
+def final_recommendation_banner(cat_scores: Dict[str, Optional[float]], reversal_total: Optional[float],
+                                threshold: float) -> Tuple[str, Any]:
+    scores = {k: (v if v is not None else 0.0) for k, v in cat_scores.items()}
+    rev = reversal_total if reversal_total is not None else 0.0
+
+    # Fundamental pass: All 5 categories >= threshold
+    all_fund_pass = all(s >= threshold for s in scores.values())
+
+    if all_fund_pass and rev >= threshold:
+        return (f"✅ STRONG BUY ({int(threshold)}% Threshold)", FILL_GREEN)
+
+    # Watch logic: Fundamental quality is high, technicals are low
+    if all_fund_pass and rev < threshold:
+        return (f"⚠ WATCH ({int(threshold)}% Fund. Pass)", FILL_YELLOW)
+
+    if any(s < 30 for s in scores.values()):
+        return ("❌ AVOID — Significant Fundamental Risks", FILL_RED)
+
+    return ("⚠ HOLD / NEUTRAL", FILL_YELLOW)
+
+
+def _normalize_reversal_pack(revpack: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(revpack, dict): revpack = {}
+    fs = revpack.get("fund_score_pct") or revpack.get("fundamental_score")
+    ts = revpack.get("tech_score_pct") or revpack.get("technical_score")
+    total = revpack.get("total_score_pct")
+    if total is None and fs is not None and ts is not None:
+        total = 0.6 * float(fs) + 0.4 * float(ts)
+    return {
+        "fund_symbols": revpack.get("fund_symbols", {}) or revpack.get("fundamental_symbols", {}),
+        "tech_symbols": revpack.get("tech_symbols", {}) or revpack.get("technical_symbols", {}),
+        "fund_details": revpack.get("fund_details", {}) or revpack.get("fundamental", {}),
+        "tech_details": revpack.get("tech_details", {}) or revpack.get("technical", {}),
+        "fund_score_pct": fs, "tech_score_pct": ts, "total_score_pct": total,
+    }
+
+
+# Reversal pack stored for tickers the eligibility gate failed before their reversal was computed.
+# A rescore under a looser checklist or gate cannot rate them (no reversal) and leaves them unrated.
+GATED_REVERSAL = {"gated": "eligibility"}
+
+NOT_RATED = "⚠ NOT RATED — reversal skipped by the eligibility gate (rerun the screen)"
+
+
+def reversal_gated(reversal: Optional[Dict[str, Any]]) -> bool:
+    return isinstance(reversal, dict) and reversal.get("gated") == GATED_REVERSAL["gated"]
+
+
+def reversal_total(reversal: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Total reversal score % of a raw reversal pack (None without one)."""
+    return _normalize_reversal_pack(reversal).get("total_score_pct") if reversal else None
+
+
+@dataclass(frozen=True)
+class ScoreCard:
+    """Everything the filter and the writer need to know about one ticker's score."""
+    ticker: str
+    sector_bucket: str
+    target_threshold: float
+    ratings: Dict[str, Dict[str, str]]            # checklist sheet -> metric -> GREEN/YELLOW/RED/NA
+    raw_scores: Dict[str, Optional[float]]        # checklist sheet -> raw score %
+    coverages: Dict[str, float]                   # checklist sheet -> coverage %
+    cat_scores: Dict[str, Optional[float]]        # display name -> adjusted score %
+    avg_fund_score: float
+    avg_coverage: float
+    reversal: Dict[str, Any] = field(default_factory=dict)   # normalized reversal pack
+    recommendation: str = ""
+    status: Optional[str] = None                  # "STRONG BUY" | "WATCH" | None
+    eligibility: Optional[EligibilityResult] = None   # set when the eligibility gate ran
+
+    @property
+    def reversal_total(self) -> Optional[float]:
+        return self.reversal.get("total_score_pct")
+
+    @property
+    def recommendation_fill(self):
+        return final_recommendation_banner(self.cat_scores, self.reversal_total, self.target_threshold)[1]
+
+    def fill_for(self, category: str, metric: str):
+        return RATING_FILLS.get(self.ratings.get(category, {}).get(metric, "NA"), RATING_FILLS["NA"])
+
+    @property
+    def fills(self) -> Dict[str, Dict[str, Any]]:
+        return {cat: {m: RATING_FILLS.get(r, RATING_FILLS["NA"]) for m, r in by_metric.items()}
+                for cat, by_metric in self.ratings.items()}
+
+    def passes(self, include_watch: bool = False) -> bool:
+        return self.status == "STRONG BUY" or (include_watch and self.status == "WATCH")
+
+
+@dataclass(frozen=True)
+class FundamentalScore:
+    """Checklist half of a ScoreCard: ratings and coverage-adjusted category scores (no reversal yet)."""
+    ticker: str
+    sector_bucket: str
+    ratings: Dict[str, Dict[str, str]]
+    raw_scores: Dict[str, Optional[float]]
+    coverages: Dict[str, float]
+    cat_scores: Dict[str, Optional[float]]
+    avg_fund_score: float
+    avg_coverage: float
+
+    @property
+    def cat_adj_by_sheet(self) -> Dict[str, Optional[float]]:
+        return {sheet: self.cat_scores.get(display) for sheet, display in CATEGORY_MAPS.items()}
+
+
+def score_fundamentals(ticker: str, metrics: Dict[str, Any], thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                       ratings: Optional[Dict[str, Dict[str, str]]] = None) -> FundamentalScore:
+    """Rate the scored checklist metrics and compute category scores/coverage."""
+    metrics = metrics or {}
+    bucket = metrics.get("Sector Bucket", "Default (All)")
+
+    card_ratings: Dict[str, Dict[str, str]] = {}
+    raw_scores: Dict[str, Optional[float]] = {}
+    coverages: Dict[str, float] = {}
+    cat_scores: Dict[str, Optional[float]] = {}
+    scored = scored_metric_names()
+    for cat_sheet, cat_display in CATEGORY_MAPS.items():
+        cat_ratings, weights = {}, {}
+        for metric in thresholds.get(cat_sheet, {}):
+            if metric not in scored: continue
+            if ratings is not None:
+                rating = ratings.get(cat_sheet, {}).get(metric, "NA")
+            else:
+                rating, _ = score_threshold_set(metrics.get(metric),
+                                                get_threshold_set(thresholds, cat_sheet, metric, bucket))
+            cat_ratings[metric], weights[metric] = rating, _metric_weight(metric)
+        raw, cov = compute_category_score_and_coverage(cat_ratings, weights)
+        card_ratings[cat_sheet], raw_scores[cat_sheet], coverages[cat_sheet] = cat_ratings, raw, cov
+        cat_scores[cat_display] = adjusted_from_raw_and_coverage(raw, cov)
+
+    valid_cats = [s for s in cat_scores.values() if s is not None]
+    avg_f = sum(valid_cats) / len(valid_cats) if valid_cats else 0.0
+    avg_cov = sum(coverages.values()) / len(coverages) if coverages else 0
+
+    return FundamentalScore(ticker=ticker, sector_bucket=bucket, ratings=card_ratings, raw_scores=raw_scores,
+                            coverages=coverages, cat_scores=cat_scores, avg_fund_score=avg_f, avg_coverage=avg_cov)
+
+
+def check_eligibility(fund: FundamentalScore, mode: str,
+                      reversal_total: Optional[float] = None) -> EligibilityResult:
+    """Coverage/structural gates from eligibility.py; needs only the checklist half of the score."""
+    return evaluate_eligibility(mode=mode, cat_adj=fund.cat_adj_by_sheet, cat_cov=fund.coverages,
+                                category_ratings=fund.ratings, sector_bucket=fund.sector_bucket,
+                                fund_adj=fund.avg_fund_score, reversal_total=reversal_total)
+
+
+def finish_scorecard(fund: FundamentalScore, reversal: Optional[Dict[str, Any]], target_threshold: float,
+                     eligibility: Optional[EligibilityResult] = None) -> ScoreCard:
+    """Combine the checklist score with the reversal pack into the final ScoreCard.
+
+    An eligibility FAIL short-circuits: no banner, no status (the ticker is never reported). So does a
+    GATED_REVERSAL from an earlier run's gate that no longer fails: the card is marked NOT_RATED.
+    """
+    common = dict(ticker=fund.ticker, sector_bucket=fund.sector_bucket, target_threshold=float(target_threshold),
+                  ratings=fund.ratings, raw_scores=fund.raw_scores, coverages=fund.coverages,
+                  cat_scores=fund.cat_scores, avg_fund_score=fund.avg_fund_score, avg_coverage=fund.avg_coverage,
+                  eligibility=eligibility)
+    revpack = _normalize_reversal_pack(reversal or {})
+    if eligibility is not None and eligibility.status == "FAIL":
+        return ScoreCard(reversal=revpack, **common)
+    if reversal_gated(reversal):
+        return ScoreCard(reversal=revpack, recommendation=NOT_RATED, **common)
+
+    rev_total = revpack.get("total_score_pct")
+    rec_txt, _ = final_recommendation_banner(fund.cat_scores, rev_total, target_threshold)
+
+    # Fundamental pass: all 5 categories scored and >= threshold; reversal decides BUY vs WATCH.
+    valid_cats = [s for s in fund.cat_scores.values() if s is not None]
+    all_cats_pass = len(valid_cats) == 5 and all(s >= target_threshold for s in valid_cats)
+    status = None
+    if all_cats_pass:
+        status = "STRONG BUY" if (rev_total or 0.0) >= target_threshold else "WATCH"
+
+    return ScoreCard(reversal=revpack, recommendation=rec_txt, status=status, **common)
+
+
+def build_scorecard(ticker: str, metrics: Dict[str, Any], reversal: Optional[Dict[str, Any]],
+                    thresholds: Dict[str, Dict[str, Dict[str, Any]]], target_threshold: float,
+                    ratings: Optional[Dict[str, Dict[str, str]]] = None,
+                    eligibility_mode: Optional[str] = None) -> ScoreCard:
+    """Score one ticker. `ratings` may be precomputed by rate_universe() to skip per-value rating."""
+    fund = score_fundamentals(ticker, metrics, thresholds, ratings)
+    elig = check_eligibility(fund, eligibility_mode, reversal_total(reversal)) if eligibility_mode else None
+    return finish_scorecard(fund, reversal, target_threshold, elig)
+
+
+def build_scorecards(tickers: Sequence[str], metrics_by_ticker: Dict[str, Dict[str, Any]],
+                     reversal_by_ticker: Dict[str, Dict[str, Any]],
+                     thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+                     target_threshold: float, eligibility_mode: Optional[str] = None) -> Dict[str, ScoreCard]:
+    """Score many tickers, rating each metric column in one vectorized pass."""
+    tickers = [t for t in tickers if t in metrics_by_ticker]
+    ratings_map = rate_universe(tickers, metrics_by_ticker, thresholds, metric_filter=scored_metric_names())
+    return {t: build_scorecard(t, metrics_by_ticker[t], reversal_by_ticker.get(t), thresholds, target_threshold,
+                               ratings=ratings_map[t], eligibility_mode=eligibility_mode)
+            for t in tickers}
+
+
+def eligibility_counts(scorecards: Dict[str, ScoreCard]) -> Dict[str, int]:
+    """PASS/WATCH/FAIL tallies over cards that went through the eligibility gate."""
+    counts = {"PASS": 0, "WATCH": 0, "FAIL": 0}
+    for card in scorecards.values():
+        if card.eligibility is not None:
+            counts[card.eligibility.status] = counts.get(card.eligibility.status, 0) + 1
+    return counts
+
+
+def not_rated(tickers: Sequence[str], scorecards: Dict[str, ScoreCard]) -> List[str]:
+    """Tickers stored without a reversal by an earlier eligibility gate that the current one passes."""
+    return [t for t in tickers if t in scorecards and scorecards[t].recommendation == NOT_RATED]
+
+
+def select_candidates(tickers: Sequence[str], scorecards: Dict[str, ScoreCard],
+                      include_watch: bool = False) -> List[str]:
+    """Tickers (in the given order) whose ScoreCard is STRONG BUY, or WATCH when requested."""
+    return [t for t in tickers if t in scorecards and scorecards[t].passes(include_watch)]
@@ -1,11 +1,25 @@
 
 import math
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
 from openpyxl.styles import PatternFill
 
-from checklist_loader import parse_range_cell
+from checklist_loader import ThresholdRule, compile_threshold_set, get_threshold_set
 from config import FILL_GREEN, FILL_YELLOW, FILL_RED, FILL_GRAY
 
+RATING_FILLS = {"GREEN": FILL_GREEN, "YELLOW": FILL_YELLOW, "RED": FILL_RED, "NA": FILL_GRAY}
+
+# Metrics that feed category scores (everything else in the checklist is informational).
+WHITELIST = {
+    "P/E (TTM, positive EPS)", "EV/EBIT", "FCF Yield (TTM FCF / Market Cap)",
+    "Gross Margin %", "Operating Margin %", "ROIC % (standardized)",
+    "Net Debt / EBITDA", "Interest Coverage (EBIT / Interest)",
+    "Revenue per Share CAGR (5Y)", "FCF per Share CAGR (5Y)",
+    "Market Cap", "Max Drawdown (3–5Y)"
+}
+
+
 # ----------------------------
 # Threshold rating (existing)
 # ----------------------------
@@ -15,35 +29,128 @@ def score_with_threshold_txt(
     yellow_txt: Any,
     red_txt: Any
 ) -> Tuple[str, PatternFill]:
-    if value is None or (isinstance(value, float) and (math.isnan(value) or math.isinf(value))):
-        return "NA", FILL_GRAY
+    rule = compile_threshold_set({"green_txt": green_txt, "yellow_txt": yellow_txt, "red_txt": red_txt})
+    return rate_value(value, rule)
 
-    g = parse_range_cell(str(green_txt)) if green_txt is not None else None
-    y = parse_range_cell(str(yellow_txt)) if yellow_txt is not None else None
-    r = parse_range_cell(str(red_txt)) if red_txt is not None else None
-
-    def in_rule(rule):
-        if rule is None:
-            return False
-        lo, hi = rule
-        if lo is None and hi is not None:
-            return value < hi
-        if lo is not None and hi is None:
-            return value > lo
-        if lo is not None and hi is not None:
-            return lo <= value <= hi
-        return False
-
-    if in_rule(g):
-        return "GREEN", FILL_GREEN
-    if in_rule(y):
-        return "YELLOW", FILL_YELLOW
-    if in_rule(r):
-        return "RED", FILL_RED
 
+def rate_value(value: Optional[float], rule: Optional[ThresholdRule]) -> Tuple[str, PatternFill]:
+    """Rate a single value against a precompiled ThresholdRule."""
+    if rule is None or value is None:
+        return "NA", FILL_GRAY
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return "NA", FILL_GRAY
+    if math.isnan(v) or math.isinf(v):
+        return "NA", FILL_GRAY
+
+    for rating, interval in (("GREEN", rule.green), ("YELLOW", rule.yellow), ("RED", rule.red)):
+        if interval is not None and interval.contains(v):
+            return rating, RATING_FILLS[rating]
     return "NA", FILL_GRAY
 
 
+def score_threshold_set(value: Optional[float], th: Optional[Dict[str, Any]]) -> Tuple[str, PatternFill]:
+    """Rate a value against a threshold set returned by get_threshold_set()."""
+    if not th:
+        return "NA", FILL_GRAY
+    rule = th.get("rule")
+    if rule is None:
+        rule = compile_threshold_set(th)
+    return rate_value(value, rule)
+
+
+# ----------------------------
+# Vectorized rating
+# ----------------------------
+def _interval_mask(values: np.ndarray, interval) -> np.ndarray:
+    lo, hi = interval.lo, interval.hi
+    if lo is None and hi is not None:
+        return values < hi
+    if lo is not None and hi is None:
+        return values > lo
+    if lo is not None and hi is not None:
+        return (values >= lo) & (values <= hi)
+    return np.zeros(values.shape, dtype=bool)
+
+
+def _as_float_array(values: Iterable[Any]) -> np.ndarray:
+    out = []
+    for v in values:
+        try:
+            out.append(float(v) if v is not None else np.nan)
+        except (TypeError, ValueError):
+            out.append(np.nan)
+    return np.asarray(out, dtype=float)
+
+
+def rate_column(values: Any, rule: Optional[ThresholdRule]) -> np.ndarray:
+    """Rate a whole column of values against one rule.
+
+    Returns an object array of "GREEN"/"YELLOW"/"RED"/"NA". None/NaN/inf rate as NA.
+    """
+    arr = values if isinstance(values, np.ndarray) and values.dtype.kind == "f" else _as_float_array(values)
+    out = np.full(arr.shape, "NA", dtype=object)
+    if rule is None or arr.size == 0:
+        return out
+    finite = np.isfinite(arr)
+    # Assign lowest priority first so GREEN wins over YELLOW over RED, like rate_value().
+    for rating, interval in (("RED", rule.red), ("YELLOW", rule.yellow), ("GREEN", rule.green)):
+        if interval is None:
+            continue
+        with np.errstate(invalid="ignore"):
+            out[finite & _interval_mask(arr, interval)] = rating
+    return out
+
+
+def rate_metric_column(
+    thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+    category: str,
+    metric: str,
+    buckets: Sequence[str],
+    values: Sequence[Any],
+) -> np.ndarray:
+    """Rate one metric across many tickers, honouring each ticker's sector bucket."""
+    arr = _as_float_array(values)
+    out = np.full(arr.shape, "NA", dtype=object)
+    bucket_arr = np.asarray(list(buckets), dtype=object)
+    for bucket in set(bucket_arr.tolist()):
+        th = get_threshold_set(thresholds, category, metric, bucket)
+        if not th:
+            continue
+        rule = th.get("rule") or compile_threshold_set(th)
+        mask = bucket_arr == bucket
+        out[mask] = rate_column(arr[mask], rule)
+    return out
+
+
+def rate_universe(
+    tickers: Sequence[str],
+    metrics_by_ticker: Dict[str, Dict[str, Any]],
+    thresholds: Dict[str, Dict[str, Dict[str, Any]]],
+    metric_filter: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Rate every (category, metric) for all tickers column by column.
+
+    Returns {ticker: {category: {metric: rating}}}.
+    """
+    allowed = set(metric_filter) if metric_filter is not None else None
+    tickers = list(tickers)
+    rows = [metrics_by_ticker.get(t) or {} for t in tickers]
+    buckets = [m.get("Sector Bucket", "Default (All)") for m in rows]
+    out: Dict[str, Dict[str, Dict[str, str]]] = {t: {} for t in tickers}
+    for cat, by_metric in thresholds.items():
+        for t in tickers:
+            out[t][cat] = {}
+        for metric in by_metric:
+            if allowed is not None and metric not in allowed:
+                continue
+            col = rate_metric_column(thresholds, cat, metric, buckets, [m.get(metric) for m in rows])
+            for t, rating in zip(tickers, col.tolist()):
+                out[t][cat][metric] = rating
+    return out
+
+
 # ----------------------------
 # Scoring helpers (new)
 # ----------------------------
@@ -58,6 +165,11 @@ CATEGORY_WEIGHTS = {
 }
 
 
+def _metric_weight(metric: str) -> float:
+    if metric in ["EV/EBIT", "FCF Yield (TTM FCF / Market Cap)", "ROIC % (standardized)"]: return 2.0
+    return 1.5 if metric == "Net Debt / EBITDA" else 1.0
+
+
 def rating_to_points(rating: str) -> int:
     return POINTS.get((rating or "NA").upper(), 0)
 
@@ -0,0 +1,618 @@
+"""Headless screening core shared by the Tk app (main.py) and the command line (cli.py).
+
+run_screen() takes resolved tickers and runs fetch -> compute/score -> persist
+-> report. Progress goes to any object with ProgressWindow's `step()`, so the
+GUI passes its window and batch runs use ConsoleProgress; nothing here imports
+tkinter. rescore() / follow_checklist() re-apply the checklist to a stored run
+without provider calls.
+
+With PIPELINE=1, screen_inputs() runs resolve -> fetch -> compute -> collect as
+concurrent stages joined by bounded queues (run_pipeline) instead of one phase
+after another.
+
+Env vars (optional):
+  PIPELINE=0            # 1 = streaming stage pipeline
+  RESOLVE_WORKERS=4     # pipeline threads resolving symbols / company names
+  COMPUTE_THREADS=2     # pipeline compute threads when COMPUTE_PROCESSES=0
+"""
+
+import glob, os, sys, re, traceback, warnings, logging
+from datetime import datetime
+from time import perf_counter, sleep
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from cache_utils import _safe_int
+from checklist_loader import load_thresholds_from_excel
+from checklist_watcher import ChecklistWatcher, LiveScores
+from eligibility import eligibility_mode_setting
+from history_store import record_run
+from input_resolver import resolve_to_ticker
+from metrics import fetch_ticker_data, metrics_plan, pack_ticker_data
+from compute_stage import analyze_pack, compute_processes_setting, make_compute_pool, share_prices, submit_compute
+from report_exports import parquet_supported, report_formats_setting, write_exports
+from report_shards import shard_setting
+from report_writer import (StreamingReportWriter, create_report_workbook, update_mode_setting,
+                           update_report_workbook, write_only_setting)
+from pipeline import Stage, run_stages
+from pool_sizing import fetch_pool_size
+from ranking import TopK, composite_score, rank_candidates, rank_weights_setting, top_n_setting
+from results_store import RunJournal, journal_setting, load_run_results, save_run_results, shard_journal_path
+from scorecard import ScoreCard, build_scorecards, eligibility_counts, not_rated, select_candidates
+
+# COMPREHENSIVE WARNING SUPPRESSION
+warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*Timestamp.utcnow.*")
+warnings.filterwarnings("ignore", message=".*Pandas4Warning.*")
+warnings.filterwarnings("ignore", message=".*possibly delisted.*")
+warnings.filterwarnings("ignore", category=UserWarning)
+logging.getLogger('yfinance').setLevel(logging.CRITICAL)
+
+RULE_THRESHOLDS = {"Strict": 60.0, "Moderate": 50.0, "Loose": 40.0}
+
+
+def pipeline_setting() -> bool:
+    return (os.environ.get("PIPELINE", "0") or "0").strip().lower() in ("1", "true", "yes")
+
+
+def resolve_workers_setting() -> int:
+    return max(1, _safe_int(os.environ.get("RESOLVE_WORKERS", "4"), default=4))
+
+
+def compute_threads_setting() -> int:
+    return max(1, _safe_int(os.environ.get("COMPUTE_THREADS", "2"), default=2))
+
+
+def _resource_path(relative_path: str) -> str:
+    base = getattr(sys, "_MEIPASS", os.path.abspath(os.getcwd()))
+    return os.path.join(base, relative_path)
+
+
+def find_checklist_file() -> str:
+    p = os.path.join(os.getcwd(), "Checklist", "Fundamental_Checklist_v3_value_matrix_fixed.xlsx")
+    return p if os.path.exists(p) else _resource_path("Fundamental_Checklist_v3_value_matrix_fixed.xlsx")
+
+
+def reports_dir() -> str:
+    out_dir = os.path.join(os.getcwd(), "reports")
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    return out_dir
+
+
+def _report_path(out_dir: str, rule_mode: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(out_dir, f"Filtered_Report_{rule_mode}_{timestamp}.xlsx")
+
+
+def _latest_report(out_dir: str, rule_mode: str):
+    paths = glob.glob(os.path.join(out_dir, f"Filtered_Report_{rule_mode}_{'[0-9]' * 8}_{'[0-9]' * 6}.xlsx"))
+    return max(paths) if paths else None
+
+
+def _write_filtered_report(out_dir: str, rule_mode: str, tickers, thresholds, metrics_map, reversal_map,
+                           target_threshold: float, scorecards, writer=None) -> str:
+    """Write the selected REPORT_FORMATS; returns the workbook path (or the first other output)."""
+    formats = report_formats_setting()
+    if "parquet" in formats and not parquet_supported():
+        formats = [f for f in formats if f != "parquet"] or ["xlsx"]
+        print(f"Parquet output skipped (install pyarrow or fastparquet); writing {', '.join(formats)}")
+    out_file = writer.out_path if writer is not None else _report_path(out_dir, rule_mode)
+    paths = write_exports(formats, tickers, metrics_map, scorecards, os.path.splitext(out_file)[0])
+    if writer is not None:
+        return writer.close(tickers)
+    if "xlsx" in formats:
+        prev = _latest_report(out_dir, rule_mode) if update_mode_setting() and not shard_setting() else None
+        if prev:
+            # Intraday rerun: re-render only the tickers whose inputs changed since the previous report.
+            changed = update_report_workbook(prev, tickers, thresholds, metrics_map, reversal_map, out_file,
+                                             target_threshold, scorecards)
+            print(f"Report update: {len(changed)} of {len(tickers)} ticker sheets rewritten")
+        else:
+            create_report_workbook(tickers, thresholds, metrics_map, reversal_map, out_file, target_threshold,
+                                   scorecards=scorecards)
+        return out_file
+    return paths[0] if paths else out_file
+
+
+def _fetch_one(sym: str, use_fmp: bool, fmp_mode: str, datasets=None):
+    try:
+        raw = fetch_ticker_data(sym, use_fmp_fallback=use_fmp, fmp_mode=fmp_mode, datasets=datasets)
+        return (sym, pack_ticker_data(raw), None)
+    except Exception:
+        return (sym, None, traceback.format_exc())
+
+
+def _analyze_one(sym: str, use_fmp: bool, fmp_mode: str, thresholds: dict, target_threshold: float,
+                 plan=None, eligibility_mode=None):
+    sym, pack, err = _fetch_one(sym, use_fmp, fmp_mode, plan.datasets if plan is not None else None)
+    if err:
+        return (sym, None, None, None, err)
+    return analyze_pack(sym, pack, thresholds, target_threshold, eligibility_mode, plan)
+
+
+def _eligibility_summary(counts) -> str:
+    return f"Eligibility: PASS {counts['PASS']} / WATCH {counts['WATCH']} / FAIL {counts['FAIL']}"
+
+
+class ConsoleProgress:
+    """ProgressWindow stand-in for headless runs: prints stage changes and every `every`-th step."""
+
+    def __init__(self, every: int = 25, quiet: bool = False):
+        self.every, self.quiet = max(1, every), quiet
+        self.max_steps = self.current_step = 0
+        self._main = None
+        self._t0 = perf_counter()
+
+    def step(self, main_text: str = None, sub_text: str = "", done_text: str = None):
+        self.current_step += 1
+        if self.quiet:
+            return
+        if main_text is not None and main_text != self._main:
+            self._main = main_text
+            print(f"{main_text} {sub_text}".rstrip())
+        elif self.current_step % self.every == 0:
+            total = f"/{self.max_steps}" if self.max_steps else ""
+            print(f"  [{self.current_step}{total}] {sub_text} ({perf_counter() - self._t0:.0f}s)")
+
+    def close(self):
+        pass
+
+
+@dataclass(frozen=True)
+class ScreenResult:
+    report: Optional[str]                  # report path; None when nothing qualified or no report was asked for
+    candidates: List[str]                  # qualifying tickers, in report order
+    scorecards: Dict[str, ScoreCard] = field(default_factory=dict)  # every scored ticker kept by the run
+    tickers: List[str] = field(default_factory=list)                # every resolved ticker of the run
+
+
+class ResultMemo:
+    """Per-ticker metrics/reversal packs kept in memory by a long-running process, reused until `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._items: Dict[Tuple[str, bool], Tuple[float, Dict[str, Any], Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, ticker: str, use_fmp: bool) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        with self._lock:
+            item = self._items.get((ticker, use_fmp))
+            if item is None:
+                return None
+            if perf_counter() - item[0] > self.ttl_seconds:
+                del self._items[(ticker, use_fmp)]
+                return None
+            return item[1], item[2]
+
+    def put(self, ticker: str, use_fmp: bool, metrics: Dict[str, Any], reversal: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[(ticker, use_fmp)] = (perf_counter(), metrics, reversal)
+
+
+def _raw_tokens(raw_text: str = "", indices: Iterable[str] = ()) -> List[str]:
+    all_raw = [s.strip() for s in re.split(r'[,\n\s]+', raw_text or "") if s.strip()]
+    universe_dir = _resource_path("Ticker universe")
+    for idx_name in indices:
+        csv_path = os.path.join(universe_dir, f"{idx_name}.csv")
+        if os.path.exists(csv_path):
+            with open(csv_path, 'r') as f:
+                all_raw.extend([t.strip() for t in f.read().split(',') if t.strip()])
+    return all_raw
+
+
+def resolve_tickers(raw_text: str = "", indices: Iterable[str] = (),
+                    resolve: Callable[[str], Optional[str]] = resolve_to_ticker) -> List[str]:
+    """Sorted unique tickers from free text (symbols or company names) plus Ticker universe CSVs."""
+    resolved = (resolve(tok) for tok in _raw_tokens(raw_text, indices))
+    return sorted(set(t for t in resolved if t))
+
+
+class _ScreenRun:
+    """State of one screen: collects per-ticker results as they arrive, then filters and reports.
+
+    Shared by the phased run_screen() and the pipelined run_pipeline(); collect() runs on one thread.
+    """
+
+    def __init__(self, rule_mode: str, use_fmp: bool, include_watch: bool, thresholds, progress, out_dir: str,
+                 memo: Optional[ResultMemo], journal: Optional[RunJournal], write_report: bool,
+                 results_path: Optional[str] = None):
+        self.rule_mode, self.use_fmp, self.include_watch = rule_mode, use_fmp, include_watch
+        self.thresholds, self.progress, self.out_dir = thresholds, progress, out_dir
+        self.memo, self.journal, self.write_report = memo, journal, write_report
+        self.results_path = results_path
+        # Only compute what the scored metrics and reversal checks read, and only fetch their inputs.
+        self.plan = metrics_plan(thresholds)
+        self.datasets = self.plan.datasets
+        self.elig_mode = eligibility_mode_setting()
+        self.target_threshold = RULE_THRESHOLDS.get(rule_mode, 60.0)
+
+        self.metrics_map, self.reversal_map, self.scorecards = {}, {}, {}
+        self.elig_tally = {"PASS": 0, "WATCH": 0, "FAIL": 0}
+        # Ranked mode: track the best TOP_N qualifying tickers (the report set) while results stream in.
+        self.top_n = top_n_setting()
+        self.ranker = TopK(self.top_n) if self.top_n > 0 else None
+        self.rank_weights = rank_weights_setting()
+        # Write-only mode (unranked, single workbook): candidate sheets are streamed into the report as results arrive.
+        self.writer = (StreamingReportWriter(_report_path(out_dir, rule_mode), thresholds, self.target_threshold)
+                       if write_report and self.ranker is None and write_only_setting() and not shard_setting()
+                       and not update_mode_setting() and "xlsx" in report_formats_setting() else None)
+
+    def known(self, ticker: str):
+        """(metrics, reversal) already computed for `ticker` by the resumed journal or the memo, else None."""
+        if self.journal is not None and ticker in self.journal.done:
+            return self.journal.done[ticker]
+        return self.memo.get(ticker, self.use_fmp) if self.memo is not None else None
+
+    def restore(self, known: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Score and collect already-computed tickers in one vectorized pass."""
+        cards = build_scorecards(list(known), {t: v[0] for t, v in known.items()},
+                                 {t: v[1] for t, v in known.items()}, self.thresholds, self.target_threshold,
+                                 self.elig_mode)
+        for t_sym, (m_data, r_data) in known.items():
+            self.collect((t_sym, m_data, r_data, cards[t_sym], None), fresh=False)
+
+    def collect(self, result, fresh: bool = True) -> None:
+        t_sym, m_data, r_data, card, err = result
+        if not err:
+            if fresh and self.memo is not None:
+                self.memo.put(t_sym, self.use_fmp, m_data, r_data)
+            if self.journal is not None and t_sym not in self.journal.done:
+                self.journal.record(t_sym, m_data, r_data)  # memo hits are checkpointed too
+            if card.eligibility is not None:
+                self.elig_tally[card.eligibility.status] += 1
+            # Every scored ticker is kept: the stored run, the history and shard merges need all of them.
+            self.metrics_map[t_sym], self.reversal_map[t_sym], self.scorecards[t_sym] = m_data, r_data, card
+            if card.passes(self.include_watch):
+                if self.ranker is not None:
+                    self.ranker.offer(t_sym, composite_score(card, self.rank_weights))
+                elif self.writer is not None:
+                    self.writer.add(t_sym, m_data, card)
+        self.progress.step(sub_text=f"Processed: {t_sym}")
+
+    def discard_report(self) -> None:
+        """Delete the write-only report's temp sheets unless it was saved (no-op then, or without a writer)."""
+        if self.writer is not None:
+            self.writer.discard()
+
+    def __enter__(self) -> "_ScreenRun":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.discard_report()  # an aborted run must not leave streamed sheets behind
+
+    def finish(self, tickers: List[str]) -> ScreenResult:
+        if not tickers and self.results_path is None:  # nothing resolved: do not store an empty run as the latest
+            if self.journal is not None:
+                self.journal.close(finished=True)
+            return ScreenResult(None, [])
+        metrics_map, reversal_map, scorecards = self.metrics_map, self.reversal_map, self.scorecards
+        rule_mode = self.rule_mode
+        # Persist the scalar results so a checklist/rule change can be rescored without refetching.
+        run_ts = datetime.now().isoformat(timespec="seconds")
+        try:
+            save_run_results(metrics_map, reversal_map, path=self.results_path,
+                             meta={"rule_mode": rule_mode, "tickers": tickers, "top_n": self.top_n,
+                                   "include_watch": self.include_watch, "created": run_ts})
+        except Exception as e:
+            if self.results_path is not None:
+                raise  # a shard's partial results are its only output
+            print(f"Could not store the run results (rescore will use an older run): {e}")
+
+        # Append this run to the snapshot history (ticker/date indexed) for time-series queries.
+        # A shard is only part of a run; merge_shards() records the whole run once.
+        if self.results_path is None:
+            try:
+                record_run(scorecards, metrics_map, rule_mode=rule_mode, run_ts=run_ts)
+            except Exception as e:
+                print(f"Could not record the run in the snapshot history: {e}")
+
+        # --- UPDATED TRUNCATION LOGIC ---
+        elig_text = _eligibility_summary(self.elig_tally) if self.elig_mode else ""
+        if elig_text:
+            print(elig_text)
+        _print_not_rated(tickers, scorecards)  # memo/journal results gated under an older checklist
+        self.progress.step(main_text="Filtering results...",
+                           sub_text=elig_text or "Selecting Strong Buy/Watch candidates...")
+        if self.ranker is not None:
+            final_filtered_list = [t for t, _, _ in self.ranker.ranked()]
+        else:
+            scored = [t for t in tickers if t in scorecards]
+            final_filtered_list = select_candidates(scored, scorecards, self.include_watch)
+
+        if not final_filtered_list:
+            print(f"No candidates met the {rule_mode} criteria.")
+            out_file = None
+        elif self.write_report:
+            # Generate filename and report
+            out_file = _write_filtered_report(self.out_dir, rule_mode, final_filtered_list, self.thresholds,
+                                              metrics_map, reversal_map, self.target_threshold, scorecards,
+                                              self.writer)
+        else:
+            out_file = None
+        self.discard_report()  # no report written: drop the streamed sheets
+        if self.journal is not None:
+            self.journal.close(finished=True)  # only reached once the report (if any) is on disk
+        return ScreenResult(out_file, final_filtered_list, scorecards, tickers)
+
+
+def _start_run(rule_mode: str, use_fmp: bool, include_watch: bool, progress, out_dir: Optional[str], thresholds,
+               memo: Optional[ResultMemo], journal: Optional[RunJournal], write_report: bool,
+               results_path: Optional[str], journal_meta: Dict[str, Any]) -> _ScreenRun:
+    if thresholds is None:
+        thresholds = load_thresholds_from_excel(find_checklist_file())
+    if journal is None and journal_setting():
+        journal = RunJournal.create(dict(journal_meta, rule_mode=rule_mode, use_fmp=use_fmp,
+                                         include_watch=include_watch, results_path=results_path,
+                                         created=datetime.now().isoformat(timespec="seconds")),
+                                    path=shard_journal_path(results_path) if results_path else None)
+    return _ScreenRun(rule_mode, use_fmp, include_watch, thresholds,
+                      progress if progress is not None else ConsoleProgress(), out_dir or reports_dir(),
+                      memo, journal, write_report, results_path)
+
+
+def _fetch_and_compute(run: _ScreenRun, executor, pool, to_fetch: List[str], use_fmp: bool,
+                       batch_size: int) -> None:
+    """Process mode: submit fetched packs to `pool` in small batches while the other fetches continue.
+
+    Each batch's price histories go into one shared panel (workers read them zero-copy instead of
+    unpickling them); a panel is unlinked as soon as its last task is collected, so the parent only
+    ever holds the batches still in flight.
+    """
+    pending = {executor.submit(_fetch_one, t, use_fmp, "full", run.datasets) for t in to_fetch}
+    fetching = len(pending)
+    batch, panel_of, remaining = {}, {}, {}
+
+    def _release(panel):
+        del remaining[panel]
+        panel.close()
+        panel.unlink()
+
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                panel = panel_of.pop(fut, None)
+                if panel is None:  # a fetch
+                    fetching -= 1
+                    t_sym, pack, err = fut.result()
+                    if err:
+                        run.progress.step(sub_text=f"Processed: {t_sym}")
+                    else:
+                        batch[t_sym] = pack
+                    continue
+                run.collect(fut.result())
+                remaining[panel] -= 1
+                if not remaining[panel]:
+                    _release(panel)
+            if batch and (len(batch) >= batch_size or not fetching):
+                panel = share_prices(batch)
+                remaining[panel] = len(batch)
+                for t_sym, pack in batch.items():
+                    fut = submit_compute(pool, t_sym, pack, panel.handle)
+                    panel_of[fut] = panel
+                    pending.add(fut)
+                batch.clear()
+    finally:
+        for panel in list(remaining):
+            _release(panel)
+
+
+def run_screen(tickers: List[str], rule_mode: str = "Strict", use_fmp: bool = False, include_watch: bool = False,
+               fetch_workers: Optional[int] = None, compute_processes: Optional[int] = None, progress=None,
+               out_dir: Optional[str] = None, thresholds=None, memo: Optional[ResultMemo] = None,
+               write_report: bool = True, journal: Optional[RunJournal] = None,
+               results_path: Optional[str] = None) -> ScreenResult:
+    """Fetch, score and report `tickers`.
+
+    Tickers already in `journal` (a resumed run) or `memo` are rescored from memory instead of refetched;
+    fresh results are added to both. Without a journal one is started when RUN_JOURNAL is on.
+    The run's results go to `results_path` when given (a shard's partial file), else to .cache/runs.
+    `fetch_workers=None` sizes the fetch pool from the cache warmth of the tickers left to fetch.
+    """
+    with _start_run(rule_mode, use_fmp, include_watch, progress, out_dir, thresholds, memo, journal,
+                    write_report, results_path, {"tickers": tickers}) as run:
+        thresholds, journal = run.thresholds, run.journal
+        run.progress.max_steps = len(tickers) + 2
+        run.progress.current_step = 0
+
+        known = {t: v for t, v in ((t, run.known(t)) for t in tickers) if v is not None}
+        if known and journal is not None and journal.done:
+            print(f"Resuming: {len(known)} of {len(tickers)} tickers restored from {os.path.basename(journal.path)}")
+        if known:
+            run.restore(known)
+        to_fetch = [t for t in tickers if t not in known]
+
+        compute_procs = compute_processes if compute_processes is not None else compute_processes_setting()
+        pool_size = fetch_pool_size(to_fetch, fetch_workers)
+        if to_fetch:
+            print(pool_size.describe())
+        t_fetch = perf_counter()
+        with ThreadPoolExecutor(max_workers=pool_size.workers) as executor:
+            if not to_fetch:
+                pass
+            elif compute_procs > 0:
+                # Threads fetch; the CPU-bound compute/scoring runs in worker processes on packed arrays.
+                with make_compute_pool(compute_procs, thresholds, run.target_threshold, run.elig_mode) as pool:
+                    _fetch_and_compute(run, executor, pool, to_fetch, use_fmp, batch_size=2 * compute_procs)
+            else:
+                futures = {executor.submit(_analyze_one, t, use_fmp, "full", thresholds, run.target_threshold,
+                                           run.plan, run.elig_mode): t
+                           for t in to_fetch}
+                for fut in as_completed(futures):
+                    run.collect(fut.result())
+        if to_fetch:
+            print(f"Fetched and scored {len(to_fetch)} tickers in {perf_counter() - t_fetch:.1f}s "
+                  f"with {pool_size.workers} fetch workers")
+
+        return run.finish(tickers)
+
+
+def run_pipeline(raw_text: str = "", indices: Iterable[str] = (), rule_mode: str = "Strict", use_fmp: bool = False,
+                 include_watch: bool = False, fetch_workers: Optional[int] = None,
+                 compute_processes: Optional[int] = None,
+                 progress=None, out_dir: Optional[str] = None, thresholds=None,
+                 memo: Optional[ResultMemo] = None, write_report: bool = True,
+                 journal: Optional[RunJournal] = None, results_path: Optional[str] = None,
+                 resolve: Callable[[str], Optional[str]] = resolve_to_ticker) -> ScreenResult:
+    """Streaming variant of resolve_tickers() + run_screen(): resolve -> fetch -> compute -> collect.
+
+    Stages run concurrently on their own threads (RESOLVE_WORKERS, `fetch_workers` or auto, one per compute
+    process or COMPUTE_THREADS) with bounded queues in between, so symbol lookups, downloads and
+    pandas work overlap; results are collected (and, in write-only mode, written) as they arrive.
+    Compute processes receive prices with each pack instead of a shared panel, since the universe is
+    not known up front.
+    """
+    with _start_run(rule_mode, use_fmp, include_watch, progress, out_dir, thresholds, memo, journal,
+                    write_report, results_path, {"raw_text": raw_text, "indices": list(indices)}) as run:
+        thresholds = run.thresholds
+        if run.journal is not None and run.journal.done:
+            print(f"Resuming: {len(run.journal.done)} tickers restored from {os.path.basename(run.journal.path)}")
+        seen, seen_lock = set(), threading.Lock()
+
+        def _resolve(tok):
+            t_sym = resolve(tok)
+            with seen_lock:
+                if not t_sym or t_sym in seen:
+                    return None
+                seen.add(t_sym)
+            return t_sym
+
+        def _fetch(t_sym):
+            known = run.known(t_sym)
+            return (t_sym, known, None, None) if known is not None else (t_sym, None) + _fetch_one(
+                t_sym, use_fmp, "full", run.datasets)[1:]
+
+        def _compute(item):
+            t_sym, known, pack, err = item
+            if known is not None:
+                m_data, r_data = known
+                card = build_scorecards([t_sym], {t_sym: m_data}, {t_sym: r_data}, thresholds,
+                                        run.target_threshold, run.elig_mode)[t_sym]
+                return (t_sym, m_data, r_data, card, None), False
+            if err:
+                return (t_sym, None, None, None, err), True
+            if pool is not None:
+                return submit_compute(pool, t_sym, pack).result(), True
+            return analyze_pack(t_sym, pack, thresholds, run.target_threshold, run.elig_mode, run.plan), True
+
+        tokens = _raw_tokens(raw_text, indices)
+        # Sized before resolving: universe entries are tickers already, company names count as cache misses.
+        pool_size = fetch_pool_size([t.upper() for t in tokens if run.known(t.upper()) is None], fetch_workers)
+        if tokens:
+            print(pool_size.describe())
+        compute_procs = compute_processes if compute_processes is not None else compute_processes_setting()
+        pool = (make_compute_pool(compute_procs, thresholds, run.target_threshold, run.elig_mode)
+                if compute_procs > 0 else None)
+        try:
+            run_stages(tokens,
+                       [Stage("resolve", _resolve, resolve_workers_setting()),
+                        Stage("fetch", _fetch, pool_size.workers),
+                        Stage("compute", _compute, compute_procs if compute_procs > 0 else compute_threads_setting())],
+                       lambda out: run.collect(*out))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return run.finish(sorted(seen))
+
+
+def screen_inputs(raw_text: str = "", indices: Iterable[str] = (), rule_mode: str = "Strict",
+                  use_fmp: bool = False, include_watch: bool = False,
+                  resolve: Callable[[str], Optional[str]] = resolve_to_ticker, **kwargs) -> ScreenResult:
+    """Resolve the inputs and screen them: pipelined when PIPELINE=1, else phase by phase."""
+    if pipeline_setting():
+        result = run_pipeline(raw_text, indices, rule_mode, use_fmp, include_watch, resolve=resolve, **kwargs)
+    else:
+        tickers = resolve_tickers(raw_text, indices, resolve)
+        # a shard with nothing to do still writes its (empty) results file for the merge
+        result = (run_screen(tickers, rule_mode, use_fmp, include_watch, **kwargs)
+                  if tickers or kwargs.get("results_path") else ScreenResult(None, []))
+    if not result.tickers:
+        print("No tickers resolved.")
+    return result
+
+
+def resume_run(journal_path: Optional[str] = None, **kwargs) -> ScreenResult:
+    """Finish an interrupted run from its journal: journaled tickers are restored, the rest fetched."""
+    journal = RunJournal.load(journal_path)
+    meta = journal.meta
+    if meta.get("results_path"):  # an interrupted shard: finish its partial results, no report
+        kwargs.update(results_path=meta["results_path"], write_report=False)
+    args = (meta.get("rule_mode") or "Strict", bool(meta.get("use_fmp")), bool(meta.get("include_watch")))
+    resolve = kwargs.pop("resolve", resolve_to_ticker)  # only the pipeline still has inputs to resolve
+    if meta.get("tickers") is None and "raw_text" in meta:
+        return run_pipeline(meta.get("raw_text") or "", meta.get("indices") or [], *args, journal=journal,
+                            resolve=resolve, **kwargs)
+    return run_screen(meta.get("tickers") or sorted(journal.done), *args, journal=journal, **kwargs)
+
+
+def _print_not_rated(tickers, scorecards) -> None:
+    skipped = not_rated(tickers, scorecards)
+    if skipped:
+        print(f"{len(skipped)} tickers were stopped by the eligibility gate before their reversal was computed "
+              f"and are not rated now; rerun the screen to rate them ({', '.join(skipped[:10])}"
+              f"{', ...' if len(skipped) > 10 else ''})")
+
+
+def _report_from_scores(rule_mode: str, include_watch: bool, tickers, thresholds, metrics_map, reversal_map,
+                        target_threshold: float, scorecards, out_dir: Optional[str] = None):
+    if eligibility_mode_setting():
+        print(_eligibility_summary(eligibility_counts(scorecards)))
+    _print_not_rated(tickers, scorecards)
+    final_filtered_list = select_candidates(tickers, scorecards, include_watch)
+    top_n = top_n_setting()
+    if top_n > 0:
+        final_filtered_list = rank_candidates(final_filtered_list, scorecards, top_n, rank_weights_setting())
+    if not final_filtered_list:
+        print(f"No candidates met the {rule_mode} criteria.")
+        return None
+
+    out_file = _write_filtered_report(out_dir or reports_dir(), rule_mode, final_filtered_list, thresholds,
+                                      metrics_map, reversal_map, target_threshold, scorecards)
+    print(f"Report saved: {out_file}")
+    return out_file
+
+
+def rescore(rule_mode: str = "Strict", include_watch: bool = False, store_path: str = None):
+    """Re-apply the checklist and rule set to the stored results of a previous run (no provider calls)."""
+    thresholds = load_thresholds_from_excel(find_checklist_file())
+    metrics_map, reversal_map, meta = load_run_results(store_path)
+    target_threshold = RULE_THRESHOLDS.get(rule_mode, 60.0)
+
+    tickers = [t for t in (meta.get("tickers") or sorted(metrics_map)) if t in metrics_map]
+    scorecards = build_scorecards(tickers, metrics_map, reversal_map, thresholds, target_threshold,
+                                  eligibility_mode_setting())
+    return _report_from_scores(rule_mode, include_watch, tickers, thresholds, metrics_map, reversal_map,
+                               target_threshold, scorecards)
+
+
+def follow_checklist(rule_mode: str = "Strict", include_watch: bool = False, store_path: str = None):
+    """Keep the stored run in memory and write a fresh report each time the checklist changes (Ctrl+C stops)."""
+    checklist_path = find_checklist_file()
+    metrics_map, reversal_map, meta = load_run_results(store_path)
+    tickers = [t for t in (meta.get("tickers") or sorted(metrics_map)) if t in metrics_map]
+    target_threshold = RULE_THRESHOLDS.get(rule_mode, 60.0)
+
+    watcher = ChecklistWatcher(checklist_path)
+    live = LiveScores(watcher.thresholds, target_threshold, eligibility_mode_setting())
+    live.load({t: metrics_map[t] for t in tickers}, reversal_map)
+
+    def _on_reload(thresholds):
+        cards = live.rescore(thresholds)
+        _report_from_scores(rule_mode, include_watch, tickers, thresholds, live.metrics, live.reversal,
+                            target_threshold, cards)
+
+    _report_from_scores(rule_mode, include_watch, tickers, live.thresholds, live.metrics, live.reversal,
+                        target_threshold, live.scorecards)
+    watcher.subscribe(_on_reload)
+    print(f"Watching {checklist_path} for changes (Ctrl+C to stop)...")
+    with watcher:
+        try:
+            while True:
+                sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,158 @@
+"""Small in-memory stand-in for an openpyxl worksheet, flushed to a write-only sheet.
+
+openpyxl write-only worksheets only accept whole rows, in order, and column
+widths must be set before the first row. The report renders cells by
+coordinate (`ws.cell(r, c, v)`, `ws["A1"] = v`, `ws.merge_cells(...)`), so a
+sheet is rendered into a SheetBuffer first (one sheet's worth of cells) and
+then streamed out with `flush()`.
+
+Column widths are tracked as values are written (ColumnWidths), so neither
+mode needs a second pass over the cells to size columns. `flush()` also
+accepts a regular worksheet, which lets both report modes share one
+rendering path.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.formatting import ConditionalFormattingList
+from openpyxl.utils import coordinate_to_tuple, get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+
+class ColumnWidths:
+    """Longest str(value) per column, updated as cells are written: width = longest + 3, clamped to [10, 70]."""
+
+    PAD, MIN_WIDTH, MAX_WIDTH = 3, 10, 70
+
+    def __init__(self):
+        self._longest: Dict[int, int] = {}
+
+    def observe(self, column: int, value: Any) -> None:
+        if value:
+            n = len(str(value))
+            if n > self._longest.get(column, 0):
+                self._longest[column] = n
+
+    def widths(self, max_column: int) -> Dict[int, float]:
+        return {col: max(min(self._longest.get(col, 0) + self.PAD, self.MAX_WIDTH), self.MIN_WIDTH)
+                for col in range(1, max_column + 1)}
+
+    def apply(self, ws, max_column: int) -> None:
+        for col, w in self.widths(max_column).items():
+            ws.column_dimensions[get_column_letter(col)].width = w
+
+
+class BufferedCell:
+    __slots__ = ("row", "column", "_value", "_widths", "style", "fill", "font", "alignment", "number_format",
+                 "hyperlink")
+
+    def __init__(self, row: int, column: int, widths: ColumnWidths):
+        self.row, self.column, self._value, self._widths = row, column, None, widths
+        self.style = self.fill = self.font = self.alignment = self.number_format = self.hyperlink = None
+
+    @property
+    def styled(self) -> bool:
+        return not (self.style is None and self.fill is None and self.font is None and self.alignment is None
+                    and self.number_format is None and self.hyperlink is None)
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @value.setter
+    def value(self, v: Any) -> None:
+        self._value = v
+        self._widths.observe(self.column, v)
+
+
+class SheetBuffer:
+    """Collects one sheet's cells; supports the subset of the Worksheet API the report uses."""
+
+    def __init__(self, title: str = ""):
+        self.title = title
+        self._cells: Dict[Tuple[int, int], BufferedCell] = {}
+        self._merged: List[str] = []
+        self.conditional_formatting = ConditionalFormattingList()
+        self._widths = ColumnWidths()
+        self._next_row = 1
+        self.max_row = 0
+        self.max_column = 0
+
+    def cell(self, row: int, column: int, value: Any = None) -> BufferedCell:
+        c = self._cells.get((row, column))
+        if c is None:
+            c = self._cells[(row, column)] = BufferedCell(row, column, self._widths)
+            self.max_row = max(self.max_row, row)
+            self.max_column = max(self.max_column, column)
+        if value is not None:
+            c.value = value
+        return c
+
+    def __getitem__(self, coord: str) -> BufferedCell:
+        row, col = coordinate_to_tuple(coord)
+        return self.cell(row, col)
+
+    def __setitem__(self, coord: str, value: Any) -> None:
+        self[coord].value = value
+
+    def append(self, values) -> None:
+        row = max(self._next_row, self.max_row + 1)
+        for col, v in enumerate(values, 1):
+            self.cell(row, col, v)
+        self._next_row = row + 1
+
+    def merge_cells(self, range_string: Optional[str] = None, start_row: Optional[int] = None,
+                    start_column: Optional[int] = None, end_row: Optional[int] = None,
+                    end_column: Optional[int] = None) -> None:
+        if range_string is None:
+            range_string = (f"{get_column_letter(start_column)}{start_row}:"
+                            f"{get_column_letter(end_column)}{end_row}")
+        self._merged.append(range_string)
+
+    def column_widths(self) -> Dict[int, float]:
+        return self._widths.widths(self.max_column)
+
+    def flush(self, ws, widths: Optional[Dict[int, float]] = None) -> None:
+        """Write the buffered cells, merges and column widths into `ws`.
+
+        Write-only sheets need widths and merges before the rows, which are appended in order;
+        regular sheets get the cells first so merging does not clobber them.
+        """
+        for col, w in (widths if widths is not None else self.column_widths()).items():
+            ws.column_dimensions[get_column_letter(col)].width = w
+        for cf in self.conditional_formatting:
+            for rule in cf.rules:
+                ws.conditional_formatting.add(str(cf.sqref), rule)
+        if not isinstance(ws, WriteOnlyWorksheet):
+            for c in self._cells.values():
+                out = ws.cell(c.row, c.column, c.value)
+                self._style(out, c)
+            for rng in self._merged:
+                ws.merge_cells(rng)
+            return
+        for rng in self._merged:
+            ws.merged_cells.add(rng)
+        for r in range(1, self.max_row + 1):
+            row = []
+            for col in range(1, self.max_column + 1):
+                c = self._cells.get((r, col))
+                if c is None or not c.styled:
+                    row.append(c.value if c is not None else None)
+                    continue
+                out = WriteOnlyCell(ws, value=c.value)
+                out.row, out.column = r, col  # hyperlink refs use the cell coordinate
+                self._style(out, c)
+                row.append(out)
+            ws.append(row)
+
+    @staticmethod
+    def _style(out, c: BufferedCell) -> None:
+        if c.style is not None: out.style = c.style  # named style first; explicit attributes override it
+        if c.fill is not None: out.fill = c.fill
+        if c.font is not None: out.font = c.font
+        if c.alignment is not None: out.alignment = c.alignment
+        if c.number_format is not None: out.number_format = c.number_format
+        if c.hyperlink is not None: out.hyperlink = c.hyperlink
@@ -0,0 +1,192 @@
+"""Canonical financial-statement layer.
+
+yfinance statement frames use several spellings for the same row
+("Operating Cash Flow" / "Total Cash From Operating Activities" / "OperatingCashFlow").
+Instead of every module scanning the DataFrame index with its own alias list,
+`StatementSet.from_frames` runs once per ticker: it resolves each raw row to a
+canonical line-item key, converts the frame to floats in one pass and keeps
+compact arrays ordered oldest -> newest together with their period dates.
+
+Statement names used throughout the app:
+  annual_income, annual_bs, annual_cf, q_income, q_cf
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Canonical key -> raw yfinance row labels, in priority order.
+LINE_ITEMS: Dict[str, Tuple[str, ...]] = {
+    # Income statement
+    "total_revenue": ("Total Revenue", "TotalRevenue"),
+    "gross_profit": ("Gross Profit", "GrossProfit"),
+    "operating_income": ("Operating Income", "OperatingIncome"),
+    "ebit": ("EBIT", "Ebit"),
+    "net_income": ("Net Income", "NetIncome"),
+    "interest_expense": ("Interest Expense", "InterestExpense"),
+    # Balance sheet
+    "total_assets": ("Total Assets", "TotalAssets"),
+    "current_liabilities": ("Current Liabilities", "CurrentLiabilities", "Total Current Liabilities"),
+    "cash": ("Cash And Cash Equivalents", "CashAndCashEquivalents"),
+    "total_debt": ("Total Debt", "TotalDebt"),
+    "long_term_debt": ("Long Term Debt",),
+    "shares_outstanding": (
+        "Ordinary Shares Number",
+        "OrdinarySharesNumber",
+        "Share Issued",
+        "ShareIssued",
+        "Common Stock Shares Outstanding",
+        "CommonStockSharesOutstanding",
+        "IssuedCommonStock",
+    ),
+    # Cash flow
+    "operating_cash_flow": ("Operating Cash Flow", "Total Cash From Operating Activities", "OperatingCashFlow"),
+    "capital_expenditure": ("Capital Expenditure", "CapitalExpenditure"),
+    "repurchase_of_stock": (
+        "Repurchase Of Capital Stock", "RepurchaseOfCapitalStock", "Common Stock Repurchased", "CommonStockRepurchased",
+    ),
+    "issuance_of_stock": (
+        "Issuance Of Capital Stock", "IssuanceOfCapitalStock", "Common Stock Issued", "CommonStockIssued",
+    ),
+    "stock_based_compensation": ("Stock Based Compensation", "StockBasedCompensation"),
+}
+
+# raw label -> (canonical key, priority); built once at import.
+_ALIAS_INDEX: Dict[str, Tuple[str, int]] = {
+    alias: (key, prio) for key, aliases in LINE_ITEMS.items() for prio, alias in enumerate(aliases)
+}
+
+STATEMENT_NAMES = ("annual_income", "annual_bs", "annual_cf", "q_income", "q_cf")
+
+Keys = Union[str, Sequence[str]]
+
+
+@dataclass(frozen=True)
+class LineItem:
+    """One statement row as float64 values ordered oldest -> newest (NaN = missing)."""
+    values: np.ndarray
+    dates: np.ndarray   # datetime64[ns], same order as values (NaT if the column was not a date)
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+
+def _frame_to_array(df: pd.DataFrame) -> np.ndarray:
+    # One to_numeric pass over the whole frame instead of one per looked-up row.
+    flat = pd.to_numeric(pd.Series(df.to_numpy().ravel()), errors="coerce")
+    return np.asarray(flat, dtype=float).reshape(df.shape)
+
+
+def _column_dates(df: pd.DataFrame) -> np.ndarray:
+    try:
+        return np.asarray(pd.to_datetime(pd.Index(df.columns), errors="coerce"), dtype="datetime64[ns]")
+    except Exception:
+        return np.full(len(df.columns), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+
+def normalize_frame(df: Optional[pd.DataFrame]) -> Dict[str, LineItem]:
+    """Map a yfinance statement frame (rows x periods, newest first) to canonical LineItems."""
+    if df is None or getattr(df, "empty", True):
+        return {}
+
+    best: Dict[str, Tuple[int, int]] = {}
+    for pos, label in enumerate(df.index):
+        hit = _ALIAS_INDEX.get(label) if isinstance(label, str) else None
+        if hit is None:
+            continue
+        key, prio = hit
+        # Lowest alias priority wins; for duplicated labels the first row wins.
+        if key not in best or prio < best[key][0]:
+            best[key] = (prio, pos)
+    if not best:
+        return {}
+
+    data = _frame_to_array(df)[:, ::-1]
+    dates = _column_dates(df)[::-1]
+    return {key: LineItem(values=np.ascontiguousarray(data[pos]), dates=dates) for key, (_, pos) in best.items()}
+
+
+def _as_keys(keys: Keys) -> Tuple[str, ...]:
+    return (keys,) if isinstance(keys, str) else tuple(keys)
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if (v is None or math.isnan(v) or math.isinf(v)) else float(v)
+
+
+class StatementSet:
+    """Canonical line items for one ticker, keyed by statement name then canonical key."""
+
+    def __init__(self, items: Optional[Dict[str, Dict[str, LineItem]]] = None,
+                 present: Optional[Iterable[str]] = None):
+        self._items: Dict[str, Dict[str, LineItem]] = items or {}
+        # Statements that had a non-empty frame (even if no row matched a canonical key).
+        self._present = set(present if present is not None else self._items)
+
+    @classmethod
+    def from_frames(cls, **frames: Optional[pd.DataFrame]) -> "StatementSet":
+        items, present = {}, []
+        for name, df in frames.items():
+            if df is None or getattr(df, "empty", True):
+                continue
+            present.append(name)
+            items[name] = normalize_frame(df)
+        return cls(items, present)
+
+    def __getstate__(self):
+        return {"items": self._items, "present": sorted(self._present)}
+
+    def __setstate__(self, state):
+        self._items = state["items"]
+        self._present = set(state["present"])
+
+    def has(self, stmt: str) -> bool:
+        return stmt in self._present
+
+    def item(self, stmt: str, keys: Keys) -> Optional[LineItem]:
+        """First available canonical key (in the given order) for a statement."""
+        rows = self._items.get(stmt) or {}
+        for k in _as_keys(keys):
+            it = rows.get(k)
+            if it is not None:
+                return it
+        return None
+
+    def annual(self, stmt: str, keys: Keys, n: int) -> List[Optional[float]]:
+        """Last n periods, oldest -> newest, None for missing values."""
+        it = self.item(stmt, keys)
+        if it is None or n <= 0:
+            return []
+        return [_opt(v) for v in it.values[-n:].tolist()]
+
+    def latest(self, stmt: str, keys: Keys) -> Optional[float]:
+        """Most recent period's value (None if missing)."""
+        it = self.item(stmt, keys)
+        if it is None or not len(it):
+            return None
+        return _opt(float(it.values[-1]))
+
+    def recent(self, stmt: str, keys: Keys, n: int) -> Optional[np.ndarray]:
+        """Up to n most recent values, newest first (NaN kept)."""
+        it = self.item(stmt, keys)
+        if it is None:
+            return None
+        return it.values[::-1][:n]
+
+    def ttm(self, stmt: str, keys: Keys, n: int = 4, all_nan: Optional[float] = None) -> Optional[float]:
+        """Sum of the n most recent periods, skipping NaN; None if the line item is missing.
+
+        A line item whose n periods are all NaN gives `all_nan`: the core TTM metrics pass 0.0, which is
+        what their pandas `.sum()` used to return for such rows (a RED 0 rather than NA).
+        """
+        vals = self.recent(stmt, keys, n)
+        if vals is None:
+            return None
+        if not np.isfinite(vals).any():
+            return all_nan
+        return float(np.nansum(vals))
@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live flat in the repository root.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHECKLIST = os.path.join(ROOT, "Checklist", "Fundamental_Checklist_v3_value_matrix_fixed.xlsx")
+
+_SETTINGS = ("CHECKLIST_CACHE", "COMPUTE_PROCESSES", "ELIGIBILITY_MODE", "EXTRA_METRICS", "FETCH_WORKERS",
+             "HISTORY_DB", "PIPELINE", "REPORT_FORMATS", "REPORT_SHARDS", "REPORT_UPDATE", "REPORT_WRITE_ONLY",
+             "RUN_JOURNAL", "TOP_N")
+
+
+@pytest.fixture(autouse=True)
+def scratch_cwd(tmp_path, monkeypatch):
+    """Caches, stored runs, journals and the history live under the cwd: give every test its own."""
+    monkeypatch.chdir(tmp_path)
+    for name in _SETTINGS:
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def thresholds():
+    from checklist_loader import _parse_thresholds_workbook
+
+    return _parse_thresholds_workbook(CHECKLIST)
+
+
+BUCKETS = ("Default (All)", "Software/Tech", "Industrials", "REITs", "Energy/Materials")
+
+
+def threshold_edges(thresholds):
+    """Every bound that appears in a compiled rule (values right on an edge are where ratings can differ)."""
+    edges = set()
+    for by_metric in thresholds.values():
+        for by_sector in by_metric.values():
+            for th in by_sector.values():
+                rule = th.get("rule")
+                for interval in (rule.green, rule.yellow, rule.red) if rule else ():
+                    if interval is not None:
+                        edges.update(b for b in (interval.lo, interval.hi) if b is not None)
+    return sorted(edges)
+
+
+def _inside(interval, rnd):
+    lo, hi = interval.lo, interval.hi
+    if lo is None:
+        return hi - rnd.uniform(0.01, 5.0)
+    if hi is None:
+        return lo + rnd.uniform(0.01, 5.0)
+    return rnd.uniform(lo, hi)
+
+
+def synthetic_universe(thresholds, n, seed=1, green_share=0.4):
+    """(metrics, reversal) for n fake tickers.
+
+    Checklist metrics are drawn from the rule edges and random values; for about `green_share` of the
+    tickers they lie inside the GREEN band of their sector's rule, so some tickers pass the filter.
+    """
+    from checklist_loader import get_threshold_set
+
+    rnd = random.Random(seed)
+    edges = threshold_edges(thresholds)
+    names = sorted({(cat, m) for cat, by_metric in thresholds.items() for m in by_metric})
+
+    def value(cat, metric, bucket, green):
+        rule = (get_threshold_set(thresholds, cat, metric, bucket) or {}).get("rule")
+        if green and rule is not None and rule.green is not None:
+            return _inside(rule.green, rnd)
+        r = rnd.random()
+        if r < 0.1:
+            return None
+        if r < 0.5:
+            return rnd.choice(edges) + rnd.choice((0.0, 0.0, -1e-9, 1e-9))
+        return rnd.uniform(-50.0, 150.0)
+
+    metrics, reversal = {}, {}
+    for i in range(n):
+        t = f"T{i:04d}"
+        bucket, green = rnd.choice(BUCKETS), rnd.random() < green_share
+        metrics[t] = {"Ticker": t, "Sector Bucket": bucket}
+        for cat, m in names:
+            metrics[t].setdefault(m, value(cat, m, bucket, green))
+        fs, ts = rnd.uniform(0, 100), rnd.uniform(0, 100)
+        reversal[t] = {"fund_score_pct": fs, "tech_score_pct": ts, "total_score_pct": 0.6 * fs + 0.4 * ts}
+    return metrics, reversal
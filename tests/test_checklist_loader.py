@@ -0,0 +1,40 @@
+"""MetricIndex finds exactly the metrics a brute-force _metric_matches scan finds (user-043)."""
+
+import random
+
+import pytest
+from openpyxl import load_workbook
+
+from checklist_loader import MetricIndex, _metric_matches
+from conftest import CHECKLIST
+
+
+@pytest.fixture(scope="module")
+def names(thresholds):
+    metrics = [m for cat in thresholds for m in thresholds[cat]]
+    ws = load_workbook(CHECKLIST, read_only=True, data_only=True)["Sector Adjustments"]
+    adjustments = [str(r[0]) for r in ws.iter_rows(min_row=2, values_only=True) if r and r[0]]
+    rnd = random.Random(3)
+    words = sorted({w for n in metrics + adjustments for w in n.split()}) + ["(TTM)", "%", "SBC", "Market Cap",
+                                                                              "P/E", "ROIC"]
+    synthetic = [" ".join(rnd.sample(words, rnd.randint(1, 5))) for _ in range(600)]
+    return metrics, adjustments, synthetic
+
+
+def test_index_matches_brute_force(names):
+    metrics, adjustments, synthetic = names
+    pool = metrics + adjustments + synthetic + ["", "(x)", "roic", "p/e"]
+    items = [(f"c{i % 3}", n) for i, n in enumerate(pool)]
+    index = MetricIndex(items)
+    queries = adjustments + synthetic[:200] + ["", "(x)", "P/E", "ROIC %", "Market Cap"]
+    hits = 0
+    for q in queries:
+        expected = [item for item in items if _metric_matches(q, item[1])]
+        assert index.matches(q) == expected, q
+        hits += bool(expected)
+    assert hits > len(adjustments)  # the sample exercises the matching rules, not just misses
+
+
+def test_market_cap_does_not_match_sbc_share_of_market_cap():
+    index = MetricIndex([("Valuation", "Market Cap"), ("Risk", "SBC % of Market Cap (TTM)")])
+    assert index.matches("Market Cap") == [("Valuation", "Market Cap")]
@@ -0,0 +1,62 @@
+"""One ScoreCard per ticker gives the numbers the old filter and writer loops computed (user-027)."""
+
+from checklist_loader import get_threshold_set
+from conftest import synthetic_universe
+from scorecard import (CATEGORY_MAPS, _normalize_reversal_pack, build_scorecard, build_scorecards,
+                       final_recommendation_banner, select_candidates)
+from scoring import (WHITELIST, _metric_weight, adjusted_from_raw_and_coverage, compute_category_score_and_coverage,
+                     score_with_threshold_txt)
+
+TARGET = 60.0
+
+
+def _legacy_categories(metrics, thresholds):
+    """The per-ticker loop main.py and report_writer.py each ran before ScoreCard."""
+    bucket = metrics.get("Sector Bucket", "Default (All)")
+    scores, coverages = {}, {}
+    for cat_sheet, display in CATEGORY_MAPS.items():
+        ratings, weights = {}, {}
+        for metric in thresholds.get(cat_sheet, {}):
+            if metric not in WHITELIST:
+                continue
+            val = metrics.get(metric)
+            th = get_threshold_set(thresholds, cat_sheet, metric, bucket)
+            rating = "NA"
+            if th and val is not None:
+                rating, _ = score_with_threshold_txt(val, th.get("green_txt"), th.get("yellow_txt"), th.get("red_txt"))
+            ratings[metric], weights[metric] = rating, _metric_weight(metric)
+        raw, cov = compute_category_score_and_coverage(ratings, weights)
+        scores[display], coverages[display] = adjusted_from_raw_and_coverage(raw, cov), cov
+    return scores, coverages
+
+
+def _legacy_selected(cat_scores, reversal, include_watch):
+    r_score = _normalize_reversal_pack(reversal).get("total_score_pct") or 0.0
+    valid = [s for s in cat_scores.values() if s is not None]
+    all_cats_pass = len(valid) == 5 and all(s >= TARGET for s in valid)
+    return all_cats_pass and (r_score >= TARGET or include_watch)
+
+
+def test_scorecards_match_the_legacy_loop(thresholds):
+    metrics, reversal = synthetic_universe(thresholds, 300, seed=7)
+    tickers = list(metrics)
+    cards = build_scorecards(tickers, metrics, reversal, thresholds, TARGET)
+    for t in tickers:
+        scores, coverages = _legacy_categories(metrics[t], thresholds)
+        card = cards[t]
+        assert card.cat_scores == scores, t
+        assert card.avg_coverage == sum(coverages.values()) / len(coverages), t
+        rev_total = _normalize_reversal_pack(reversal[t]).get("total_score_pct")
+        assert card.recommendation == final_recommendation_banner(scores, rev_total, TARGET)[0], t
+    for include_watch in (False, True):
+        expected = [t for t in tickers if _legacy_selected(_legacy_categories(metrics[t], thresholds)[0],
+                                                           reversal[t], include_watch)]
+        assert expected  # the universe must exercise the filter
+        assert select_candidates(tickers, cards, include_watch) == expected
+
+
+def test_batch_and_single_scoring_agree(thresholds):
+    metrics, reversal = synthetic_universe(thresholds, 100, seed=3)
+    cards = build_scorecards(list(metrics), metrics, reversal, thresholds, TARGET)
+    for t in metrics:
+        assert build_scorecard(t, metrics[t], reversal[t], thresholds, TARGET) == cards[t], t
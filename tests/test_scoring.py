@@ -0,0 +1,86 @@
+"""Compiled threshold rules rate exactly like the original text parser (user-026)."""
+
+import math
+
+import numpy as np
+import pytest
+
+from checklist_loader import parse_range_cell
+from conftest import synthetic_universe, threshold_edges
+from scoring import rate_column, rate_universe, rate_value, score_threshold_set, score_with_threshold_txt
+
+
+def _text_rating(value, green_txt, yellow_txt, red_txt):
+    """The pre-compilation rating: parse the rule text on every call."""
+    if value is None or (isinstance(value, float) and (math.isnan(value) or math.isinf(value))):
+        return "NA"
+    for rating, txt in (("GREEN", green_txt), ("YELLOW", yellow_txt), ("RED", red_txt)):
+        rng = parse_range_cell(str(txt)) if txt is not None else None
+        if rng is None:
+            continue
+        lo, hi = rng
+        if lo is None and hi is not None and value < hi:
+            return rating
+        if lo is not None and hi is None and value > lo:
+            return rating
+        if lo is not None and hi is not None and lo <= value <= hi:
+            return rating
+    return "NA"
+
+
+def _threshold_sets(thresholds):
+    for cat, by_metric in thresholds.items():
+        for metric, by_sector in by_metric.items():
+            for sector, th in by_sector.items():
+                yield (cat, metric, sector), th
+
+
+@pytest.fixture(scope="module")
+def probe_values(thresholds):
+    edges = threshold_edges(thresholds)
+    values = [None, float("nan"), float("inf"), -float("inf"), 0.0, -1e12, 1e12]
+    for e in edges:
+        values += [e, e - 1e-9, e + 1e-9, e - 0.5, e + 0.5]
+    return values
+
+
+def test_every_threshold_set_is_compiled(thresholds):
+    assert all(th.get("rule") is not None for _, th in _threshold_sets(thresholds))
+
+
+def test_compiled_rules_match_the_text_parser(thresholds, probe_values):
+    checked = 0
+    for key, th in _threshold_sets(thresholds):
+        txt = (th.get("green_txt"), th.get("yellow_txt"), th.get("red_txt"))
+        for v in probe_values:
+            expected = _text_rating(v, *txt)
+            assert rate_value(v, th["rule"])[0] == expected, (key, v)
+            assert score_threshold_set(v, th)[0] == expected, (key, v)
+            assert score_with_threshold_txt(v, *txt)[0] == expected, (key, v)
+            checked += 1
+    assert checked > 1000
+
+
+def test_rate_column_matches_rate_value(thresholds, probe_values):
+    for key, th in _threshold_sets(thresholds):
+        column = rate_column(probe_values, th["rule"])
+        assert column.tolist() == [rate_value(v, th["rule"])[0] for v in probe_values], key
+
+
+def test_rate_column_of_float_array(thresholds):
+    _, th = next(_threshold_sets(thresholds))
+    arr = np.array([np.nan, 0.0, 10.0, 1e9])
+    assert rate_column(arr, th["rule"]).tolist() == [rate_value(v, th["rule"])[0] for v in arr.tolist()]
+
+
+def test_rate_universe_matches_per_ticker_rating(thresholds):
+    from checklist_loader import get_threshold_set
+
+    metrics, _ = synthetic_universe(thresholds, 150)
+    rated = rate_universe(list(metrics), metrics, thresholds)
+    for t, m in metrics.items():
+        bucket = m["Sector Bucket"]
+        for cat, by_metric in thresholds.items():
+            for metric in by_metric:
+                expected, _ = score_threshold_set(m.get(metric), get_threshold_set(thresholds, cat, metric, bucket))
+                assert rated[t][cat][metric] == expected, (t, cat, metric, m.get(metric))
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+import metrics  # noqa: F401  (registers the metric nodes)
+from metric_registry import MetricContext
+from statements import StatementSet
+
+QUARTERS = pd.to_datetime(["2024-12-31", "2024-09-30", "2024-06-30", "2024-03-31", "2023-12-31"])
+
+
+def _q_cf(ocf, capex):
+    return pd.DataFrame([ocf, capex], index=["Operating Cash Flow", "Capital Expenditure"], columns=QUARTERS)
+
+
+def test_ttm_sums_the_four_most_recent_quarters_skipping_nan():
+    stmts = StatementSet.from_frames(q_cf=_q_cf([10, np.nan, 30, 40, 1000], [-1, -1, -1, -1, -1]))
+    assert stmts.ttm("q_cf", "operating_cash_flow") == 80.0
+    assert stmts.ttm("q_cf", "capital_expenditure") == -4.0
+
+
+def test_ttm_of_missing_item_is_none():
+    stmts = StatementSet.from_frames(q_cf=_q_cf([1, 2, 3, 4, 5], [-1, -1, -1, -1, -1]))
+    assert stmts.ttm("q_cf", "stock_based_compensation") is None
+    assert stmts.ttm("q_income", "total_revenue") is None
+
+
+def test_ttm_of_all_nan_item_defaults_to_none_or_all_nan():
+    stmts = StatementSet.from_frames(q_cf=_q_cf([np.nan] * 4 + [5], [-1, -1, -1, -1, -1]))
+    assert stmts.ttm("q_cf", "operating_cash_flow") is None
+    assert stmts.ttm("q_cf", "operating_cash_flow", all_nan=0.0) == 0.0
+
+
+def test_ttm_fcf_of_all_nan_cash_flow_is_zero_like_the_pandas_sum():
+    q_cf = _q_cf([np.nan] * 5, [-5, -5, -5, -5, -5])
+    legacy = float(pd.to_numeric(q_cf.loc["Operating Cash Flow", list(q_cf.columns)[:4]]).sum())
+    ctx = MetricContext({"statements": StatementSet.from_frames(q_cf=q_cf)})
+    assert legacy == 0.0
+    assert ctx.get("_ttm_fcf") == -20.0
@@ -1,8 +1,10 @@
 import math
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 import numpy as np
-import pandas as pd
+
+from metric_registry import MetricContext, metric
+from statements import StatementSet
 
 _NUM = r"[+-]?\d*\.?\d+"
 
@@ -53,37 +55,6 @@ def _to_float(x: Any) -> Optional[float]:
     return None
 
 
-def _annual_series(df: pd.DataFrame, row_names: List[str], n: int = 6) -> List[Optional[float]]:
-    """Oldest->newest series of up to n periods for the first matching row."""
-    if df is None or getattr(df, "empty", True):
-        return []
-    for rn in row_names:
-        if rn in df.index:
-            s = df.loc[rn]
-            vals = pd.to_numeric(s.iloc[:n][::-1], errors="coerce")
-            out: List[Optional[float]] = []
-            for v in vals.values:
-                if pd.isna(v):
-                    out.append(None)
-                else:
-                    out.append(float(v))
-            return out
-    return []
-
-
-def _quarterly_ttm(df: pd.DataFrame, row_names: List[str], n: int = 4) -> Optional[float]:
-    if df is None or getattr(df, "empty", True):
-        return None
-    cols = list(df.columns)[:n]
-    for rn in row_names:
-        if rn in df.index:
-            s = pd.to_numeric(df.loc[rn, cols], errors="coerce")
-            if s.isna().all():
-                return None
-            return float(s.sum())
-    return None
-
-
 def _winsorize(xs: List[float], p_lo: float = 0.10, p_hi: float = 0.90) -> List[float]:
     ys = [float(v) for v in xs if v is not None and not (isinstance(v, float) and (math.isnan(v) or math.isinf(v)))]
     if len(ys) < 3:
@@ -135,38 +106,35 @@ def _normalize_div_yield(div_yield_raw: Any) -> Optional[float]:
     return pct
 
 
-def compute_value_matrix_extras(
-    *,
-    info: Dict[str, Any],
-    fmp_bundle: Optional[Dict[str, Any]],
-    price: Optional[float],
-    market_cap: Optional[float],
-    enterprise_value: Optional[float],
-    annual_income: pd.DataFrame,
-    annual_cashflow: pd.DataFrame,
-    annual_balance_sheet: pd.DataFrame,
-    quarterly_cashflow: pd.DataFrame,
-) -> Tuple[Dict[str, Any], Dict[str, str]]:
-    """Compute additional value-investing decision-matrix metrics.
-
-    Returns (extra_metrics, extra_notes). Metrics keys are designed to match checklist names.
-    """
-    out: Dict[str, Any] = {}
-    notes: Dict[str, str] = {}
+# ----------------------------------------------------
+# Opt-in metric nodes (enable with EXTRA_METRICS, see metric_registry)
+# ----------------------------------------------------
+def _stmts(ctx: MetricContext) -> StatementSet:
+    return ctx.data("statements") or StatementSet()
 
-    # ---------- Dividend yield ----------
-    div_y = _normalize_div_yield(info.get("dividendYield"))
+
+@metric("dividend_yield", ["Dividend Yield %"], inputs=["info", "fmp"], extra=True)
+def _x_dividend_yield(ctx):
+    div_y = _normalize_div_yield((ctx.data("info") or {}).get("dividendYield"))
+    fmp_bundle = ctx.data("fmp")
     if div_y is None and fmp_bundle:
         # FMP profile often returns 'lastDiv' and 'mktCap', not a yield; quote may have 'price'.
         # We keep this conservative: only use it if 'dividendYield' exists.
         prof = (fmp_bundle.get("profile") or [{}])
         if isinstance(prof, list) and prof and isinstance(prof[0], dict):
             div_y = _normalize_div_yield(prof[0].get("dividendYield"))
-    out["Dividend Yield %"] = div_y
+    return {"Dividend Yield %": div_y}
+
 
-    # ---------- Annual FCF series (for normalized ratios) ----------
-    ocf = _annual_series(annual_cashflow, ["Operating Cash Flow", "Total Cash From Operating Activities", "OperatingCashFlow"], 8)
-    cap = _annual_series(annual_cashflow, ["Capital Expenditure", "CapitalExpenditure"], 8)
+@metric("normalized_fcf", ["EV/FCF (Normalized 5Y Median)", "FCF Yield (Normalized 5Y Median)"],
+        inputs=["statements"], deps=["_ev", "Market Cap"], extra=True)
+def _x_normalized_fcf(ctx):
+    statements = _stmts(ctx)
+    enterprise_value, market_cap = ctx.get("_ev"), ctx.get("Market Cap")
+
+    # Annual FCF series (for normalized ratios)
+    ocf = statements.annual("annual_cf", "operating_cash_flow", 8)
+    cap = statements.annual("annual_cf", "capital_expenditure", 8)
 
     fcf_series: List[Optional[float]] = []
     if ocf and cap:
@@ -178,9 +146,10 @@ def compute_value_matrix_extras(
     fcf_norm = _median_pos(_winsorize(fcf_5y)) if len(fcf_5y) >= 3 else None
 
     if fcf_norm is None:
-        notes["EV/FCF (Normalized 5Y Median)"] = "Normalized FCF unavailable (need >=3 annual FCF points, positive)."
-        notes["FCF Yield (Normalized 5Y Median)"] = "Normalized FCF unavailable (need >=3 annual FCF points, positive)."
+        ctx.note("EV/FCF (Normalized 5Y Median)", "Normalized FCF unavailable (need >=3 annual FCF points, positive).")
+        ctx.note("FCF Yield (Normalized 5Y Median)", "Normalized FCF unavailable (need >=3 annual FCF points, positive).")
 
+    out: Dict[str, Any] = {}
     if enterprise_value not in (None, 0) and fcf_norm not in (None, 0):
         out["EV/FCF (Normalized 5Y Median)"] = float(enterprise_value) / float(fcf_norm)
     else:
@@ -190,40 +159,27 @@ def compute_value_matrix_extras(
         out["FCF Yield (Normalized 5Y Median)"] = float(fcf_norm) / float(market_cap) * 100.0
     else:
         out["FCF Yield (Normalized 5Y Median)"] = None
+    return out
+
 
-    # ---------- Share count trend (3Y) ----------
-    shares_series = _annual_series(
-        annual_balance_sheet,
-        [
-            "Ordinary Shares Number",
-            "OrdinarySharesNumber",
-            "Share Issued",
-            "ShareIssued",
-            "Common Stock Shares Outstanding",
-            "CommonStockSharesOutstanding",
-            "IssuedCommonStock",
-        ],
-        6,
-    )
+@metric("share_count_trend", ["Share Count CAGR (3Y)"], inputs=["statements"], extra=True)
+def _x_share_count_trend(ctx):
+    shares_series = _stmts(ctx).annual("annual_bs", "shares_outstanding", 6)
     share_cagr_3y = None
     if len([v for v in shares_series if v is not None]) >= 4:
         share_cagr_3y = _cagr(shares_series[-4:])
-    out["Share Count CAGR (3Y)"] = share_cagr_3y
     if share_cagr_3y is None:
-        notes["Share Count CAGR (3Y)"] = "Share count series not available in balance sheet (needs >=4 annual points)."
+        ctx.note("Share Count CAGR (3Y)", "Share count series not available in balance sheet (needs >=4 annual points).")
+    return {"Share Count CAGR (3Y)": share_cagr_3y}
 
-    # ---------- Net buyback yield (3Y avg) ----------
+
+@metric("buyback_yield", ["Net Buyback Yield (3Y avg)"], inputs=["statements"], deps=["Market Cap"], extra=True)
+def _x_buyback_yield(ctx):
     # Uses annual cash flow net repurchase outflow (repurchases + issuance).
-    rep = _annual_series(
-        annual_cashflow,
-        ["Repurchase Of Capital Stock", "RepurchaseOfCapitalStock", "Common Stock Repurchased", "CommonStockRepurchased"],
-        6,
-    )
-    iss = _annual_series(
-        annual_cashflow,
-        ["Issuance Of Capital Stock", "IssuanceOfCapitalStock", "Common Stock Issued", "CommonStockIssued"],
-        6,
-    )
+    statements = _stmts(ctx)
+    market_cap = ctx.get("Market Cap")
+    rep = statements.annual("annual_cf", "repurchase_of_stock", 6)
+    iss = statements.annual("annual_cf", "issuance_of_stock", 6)
     net_outflows: List[Optional[float]] = []
     if rep and iss:
         for r, i in zip(rep, iss):
@@ -239,51 +195,54 @@ def compute_value_matrix_extras(
     usable = [v for v in net_outflows[-3:] if v is not None] if net_outflows else []
     if market_cap not in (None, 0) and usable:
         buyback_yield_3y = float(np.mean(usable)) / float(market_cap) * 100.0
-    out["Net Buyback Yield (3Y avg)"] = buyback_yield_3y
     if buyback_yield_3y is None:
-        notes["Net Buyback Yield (3Y avg)"] = "Buyback yield unavailable (need repurchase/issuance cashflow + market cap)."
+        ctx.note("Net Buyback Yield (3Y avg)", "Buyback yield unavailable (need repurchase/issuance cashflow + market cap).")
+    return {"Net Buyback Yield (3Y avg)": buyback_yield_3y}
+
 
-    # Shareholder yield (existing checklist metric)
+@metric("shareholder_yield", ["Shareholder Yield (Dividend + Buyback yield)"],
+        deps=["Dividend Yield %", "Net Buyback Yield (3Y avg)"], extra=True)
+def _x_shareholder_yield(ctx):
+    div_y, buyback_yield_3y = ctx.get("Dividend Yield %"), ctx.get("Net Buyback Yield (3Y avg)")
     sh_yield = None
     if div_y is not None and buyback_yield_3y is not None:
         sh_yield = float(div_y) + float(buyback_yield_3y)
-        notes["Shareholder Yield (Dividend + Buyback yield)"] = "Dividend yield (current) + net buyback yield (3Y avg)."
-    out["Shareholder Yield (Dividend + Buyback yield)"] = sh_yield
-
-    # ---------- Stock-based compensation burden ----------
-    sbc_ttm = _quarterly_ttm(
-        quarterly_cashflow,
-        ["Stock Based Compensation", "StockBasedCompensation"],
-        4,
-    )
+        ctx.note("Shareholder Yield (Dividend + Buyback yield)", "Dividend yield (current) + net buyback yield (3Y avg).")
+    return {"Shareholder Yield (Dividend + Buyback yield)": sh_yield}
+
+
+@metric("sbc_burden", ["SBC % of Market Cap (TTM)", "SBC % of FCF (TTM)"], inputs=["statements"],
+        deps=["Market Cap"], extra=True)
+def _x_sbc_burden(ctx):
+    statements = _stmts(ctx)
+    market_cap = ctx.get("Market Cap")
+    sbc_ttm = statements.ttm("q_cf", "stock_based_compensation", 4)
     sbc_pct_mcap = None
     sbc_pct_fcf = None
     if sbc_ttm is not None and market_cap not in (None, 0):
         sbc_pct_mcap = float(sbc_ttm) / float(market_cap) * 100.0
     if sbc_ttm is not None:
         # try to infer TTM FCF from quarterly cashflow as OCF + CapEx
-        ocf_ttm = _quarterly_ttm(quarterly_cashflow, ["Operating Cash Flow", "Total Cash From Operating Activities"], 4)
-        cap_ttm = _quarterly_ttm(quarterly_cashflow, ["Capital Expenditure", "CapitalExpenditure"], 4)
+        ocf_ttm = statements.ttm("q_cf", "operating_cash_flow", 4)
+        cap_ttm = statements.ttm("q_cf", "capital_expenditure", 4)
         fcf_ttm = (ocf_ttm + cap_ttm) if (ocf_ttm is not None and cap_ttm is not None) else None
         if fcf_ttm not in (None, 0):
             sbc_pct_fcf = float(sbc_ttm) / float(fcf_ttm) * 100.0
 
-    out["SBC % of Market Cap (TTM)"] = sbc_pct_mcap
-    out["SBC % of FCF (TTM)"] = sbc_pct_fcf
     if sbc_pct_mcap is None:
-        notes["SBC % of Market Cap (TTM)"] = "SBC unavailable (missing quarterly cashflow row or market cap)."
+        ctx.note("SBC % of Market Cap (TTM)", "SBC unavailable (missing quarterly cashflow row or market cap).")
     if sbc_pct_fcf is None:
-        notes["SBC % of FCF (TTM)"] = "SBC/FCF unavailable (needs SBC + positive TTM FCF)."
+        ctx.note("SBC % of FCF (TTM)", "SBC/FCF unavailable (needs SBC + positive TTM FCF).")
+    return {"SBC % of Market Cap (TTM)": sbc_pct_mcap, "SBC % of FCF (TTM)": sbc_pct_fcf}
+
 
-    # ---------- ROIC trend (3Y, pp) ----------
+@metric("roic_trend", ["ROIC Δ (3Y, pp)"], inputs=["statements"], extra=True)
+def _x_roic_trend(ctx):
     # Recompute ROIC proxy by year: NOPAT / (Assets - Current Liabilities)
-    ebit_series = _annual_series(annual_income, ["EBIT", "Ebit", "Operating Income", "OperatingIncome"], 6)
-    assets_series = _annual_series(annual_balance_sheet, ["Total Assets", "TotalAssets"], 6)
-    cl_series = _annual_series(
-        annual_balance_sheet,
-        ["Current Liabilities", "CurrentLiabilities", "Total Current Liabilities"],
-        6,
-    )
+    statements = _stmts(ctx)
+    ebit_series = statements.annual("annual_income", ("ebit", "operating_income"), 6)
+    assets_series = statements.annual("annual_bs", "total_assets", 6)
+    cl_series = statements.annual("annual_bs", "current_liabilities", 6)
 
     roic_series: List[Optional[float]] = []
     if ebit_series and assets_series and cl_series:
@@ -304,16 +263,18 @@ def compute_value_matrix_extras(
             roic_series.append((nopat / invested) * 100.0)
 
     roic_delta = None
-    usable_roic = [v for v in roic_series if v is not None] if roic_series else []
-    if roic_series and len([v for v in roic_series[-4:] if v is not None]) >= 2 and roic_series[-1] is not None and roic_series[-4] is not None:
+    if len(roic_series) >= 4 and roic_series[-1] is not None and roic_series[-4] is not None:
         roic_delta = float(roic_series[-1]) - float(roic_series[-4])
-    out["ROIC Δ (3Y, pp)"] = roic_delta
     if roic_delta is None:
-        notes["ROIC Δ (3Y, pp)"] = "ROIC trend unavailable (needs >=4 annual points for EBIT, Assets, Current Liabilities)."
+        ctx.note("ROIC Δ (3Y, pp)", "ROIC trend unavailable (needs >=4 annual points for EBIT, Assets, Current Liabilities).")
+    return {"ROIC Δ (3Y, pp)": roic_delta}
 
-    # ---------- Margin trend (3–5Y) ----------
-    rev_series = _annual_series(annual_income, ["Total Revenue", "TotalRevenue"], 6)
-    opinc_series = _annual_series(annual_income, ["Operating Income", "OperatingIncome", "EBIT", "Ebit"], 6)
+
+@metric("margin_trend", ["Margin Trend (3–5Y)"], inputs=["statements"], extra=True)
+def _x_margin_trend(ctx):
+    statements = _stmts(ctx)
+    rev_series = statements.annual("annual_income", "total_revenue", 6)
+    opinc_series = statements.annual("annual_income", ("operating_income", "ebit"), 6)
 
     margin_series: List[Optional[float]] = []
     if rev_series and opinc_series:
@@ -328,15 +289,12 @@ def compute_value_matrix_extras(
 
     margin_trend = None
     # use 5y if we have 5, else 3y if we have 3+
-    series_clean = [v for v in margin_series if v is not None] if margin_series else []
     if margin_series and margin_series[-1] is not None:
         if len([v for v in margin_series[-6:] if v is not None]) >= 5 and margin_series[-5] is not None:
             margin_trend = float(margin_series[-1]) - float(margin_series[-5])
         elif len([v for v in margin_series[-4:] if v is not None]) >= 3 and margin_series[-3] is not None:
             margin_trend = float(margin_series[-1]) - float(margin_series[-3])
 
-    out["Margin Trend (3–5Y)"] = margin_trend
     if margin_trend is None:
-        notes["Margin Trend (3–5Y)"] = "Margin trend unavailable (needs multi-year revenue + operating income)."
-
-    return out, notes
+        ctx.note("Margin Trend (3–5Y)", "Margin trend unavailable (needs multi-year revenue + operating income).")
+    return {"Margin Trend (3–5Y)": margin_trend}